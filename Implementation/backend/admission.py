@@ -0,0 +1,242 @@
+# admission.py
+"""
+Admission control for the API: a concurrency limit per endpoint, a short
+bounded wait queue behind it, and a fast 503 for everything else.
+
+Without it, an intake-day spike queues every /predict in the thread pool
+and every request gets slow together. Here at most `limit` requests of an
+endpoint run at once, at most `max_queue` wait (for up to queue_timeout)
+for a slot, and the rest are rejected right away with Retry-After, so the
+requests that are admitted keep their normal latency.
+
+The limit adapts to latency (the gradient scheme from Netflix's
+concurrency-limits): the latency measured at low concurrency is the
+baseline, and each window of requests compares its own average with it.
+When requests get slower than the baseline, work is queueing somewhere
+(thread pool, inference worker, CPU shared with a training job) and the
+limit shrinks in proportion; while latency stays at the baseline it grows
+by about sqrt(limit) per window.
+
+Tuned with environment variables:
+
+    PATHFINDER_ADMISSION=0                   turn admission control off
+    PATHFINDER_ADMISSION_MAX_QUEUE=32        waiting requests per endpoint
+    PATHFINDER_ADMISSION_QUEUE_TIMEOUT_MS=500
+"""
+import asyncio
+import json
+import math
+import os
+import time
+from collections import deque
+
+import metrics
+
+ENABLED = os.getenv("PATHFINDER_ADMISSION", "1") == "1"
+MAX_QUEUE = int(os.getenv("PATHFINDER_ADMISSION_MAX_QUEUE", "32"))
+QUEUE_TIMEOUT = float(os.getenv("PATHFINDER_ADMISSION_QUEUE_TIMEOUT_MS", "500")) / 1000
+
+IN_FLIGHT = metrics.Gauge(
+    "pathfinder_admission_in_flight", "Admitted requests running now", ("endpoint",))
+QUEUE_DEPTH = metrics.Gauge(
+    "pathfinder_admission_queue_depth", "Requests waiting for a concurrency slot", ("endpoint",))
+LIMIT = metrics.Gauge(
+    "pathfinder_admission_limit", "Current adaptive concurrency limit", ("endpoint",))
+REJECTED = metrics.Counter(
+    "pathfinder_admission_rejected_total", "Requests shed with a 503",
+    ("endpoint", "reason"))
+QUEUE_WAIT = metrics.Histogram(
+    "pathfinder_admission_queue_wait_seconds", "Time admitted requests waited for a slot", ("endpoint",))
+
+
+class AdaptiveLimit:
+    """
+    Concurrency limit that follows observed latency.
+
+    The baseline is the lowest window average seen. While the server is
+    saturated every request is slow, however many run at once, so every
+    probe_interval seconds the limit drops to probe_fraction of itself for
+    one short window and the baseline is measured again there; that also
+    lets it rise when the work itself got slower (e.g. a bigger jobs
+    table). The probe stays a fraction of the limit rather than min_limit
+    so an endpoint whose throughput comes from batching (/predict) keeps
+    most of a batch during it.
+    """
+
+    def __init__(self, initial=16, min_limit=2, max_limit=128, min_window=5,
+                 tolerance=1.5, smoothing=0.5, probe_interval=30.0, probe_window=10, probe_fraction=0.5):
+        self.limit = float(initial)
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.min_window = min_window
+        self.tolerance = tolerance
+        self.smoothing = smoothing
+        self.probe_interval = probe_interval
+        self.probe_window = probe_window
+        self.probe_fraction = probe_fraction
+        self.baseline = None
+        self._samples = []
+        self._probed_at = None
+        # Start with a probe: the first requests may already arrive in a spike
+        self._probe_started = time.monotonic()
+
+    def current(self):
+        if self._probe_started is not None:
+            return max(self.min_limit, int(self.limit * self.probe_fraction))
+        return int(self.limit)
+
+    def observe(self, seconds, admitted_at, in_flight):
+        now = time.monotonic()
+        if self._probe_started is not None:
+            # Requests admitted before the probe ran at the old concurrency
+            if admitted_at < self._probe_started:
+                return
+            self._samples.append(seconds)
+            if len(self._samples) >= self.probe_window:
+                self.baseline = sum(self._samples) / len(self._samples)
+                self._samples = []
+                self._probe_started = None
+                self._probed_at = now
+            return
+
+        # One window is about one round of the requests in flight
+        self._samples.append(seconds)
+        if len(self._samples) < max(self.min_window, int(self.limit)):
+            return
+        short = sum(self._samples) / len(self._samples)
+        self._samples = []
+        self.baseline = min(self.baseline, short)
+
+        if now - self._probed_at >= self.probe_interval:
+            self._probe_started = now
+            return
+        # Don't grow a limit the traffic isn't even using
+        if in_flight < self.limit / 2:
+            return
+        gradient = max(0.5, min(1.0, self.tolerance * self.baseline / short))
+        target = self.limit * gradient + math.sqrt(self.limit)
+        limit = self.limit * (1 - self.smoothing) + target * self.smoothing
+        self.limit = max(self.min_limit, min(self.max_limit, limit))
+
+
+class EndpointGate:
+    """Slots and wait queue of one endpoint; used from the event loop only"""
+
+    def __init__(self, name, limit, max_queue=MAX_QUEUE, queue_timeout=QUEUE_TIMEOUT):
+        self.name = name
+        self.limit = limit
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self.in_flight = 0
+        self._waiters = deque()
+        LIMIT.set(limit.current(), endpoint=name)
+        IN_FLIGHT.set(0, endpoint=name)
+        QUEUE_DEPTH.set(0, endpoint=name)
+
+    def _update_gauges(self):
+        IN_FLIGHT.set(self.in_flight, endpoint=self.name)
+        QUEUE_DEPTH.set(len(self._waiters), endpoint=self.name)
+
+    async def acquire(self):
+        """None when admitted, otherwise the reason for rejecting"""
+        if self.in_flight < self.limit.current() and not self._waiters:
+            self.in_flight += 1
+            self._update_gauges()
+            QUEUE_WAIT.observe(0.0, endpoint=self.name)
+            return None
+        if len(self._waiters) >= self.max_queue:
+            return "queue_full"
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        self._update_gauges()
+        started = time.perf_counter()
+        try:
+            # release() hands the slot over by resolving the future
+            await asyncio.wait_for(asyncio.shield(waiter), self.queue_timeout)
+        except asyncio.TimeoutError:
+            pass
+        except asyncio.CancelledError:
+            self._abandon(waiter)
+            raise
+        if not (waiter.done() and not waiter.cancelled()):
+            self._abandon(waiter)
+            return "queue_timeout"
+        QUEUE_WAIT.observe(time.perf_counter() - started, endpoint=self.name)
+        return None
+
+    def _abandon(self, waiter):
+        if waiter.done() and not waiter.cancelled():
+            # The slot was handed over just as we gave up: pass it on
+            self.release(None)
+        else:
+            waiter.cancel()
+            try:
+                self._waiters.remove(waiter)
+            except ValueError:
+                pass
+        self._update_gauges()
+
+    def release(self, admitted_at):
+        """admitted_at: time.monotonic() of admission, None to skip the latency sample"""
+        self.in_flight -= 1
+        if admitted_at is not None:
+            self.limit.observe(time.monotonic() - admitted_at, admitted_at, self.in_flight + 1)
+            LIMIT.set(self.limit.current(), endpoint=self.name)
+        while self._waiters and self.in_flight < self.limit.current():
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                self.in_flight += 1
+                waiter.set_result(None)
+        self._update_gauges()
+
+    def retry_after(self):
+        """Seconds until a slot is likely free, for the Retry-After header"""
+        latency = self.limit.baseline or 1.0
+        waves = (len(self._waiters) + self.in_flight) / max(1, self.limit.current())
+        return max(1, math.ceil(latency * waves))
+
+
+class AdmissionMiddleware:
+    """Plain ASGI middleware; paths without a gate go straight through"""
+
+    def __init__(self, app, gates):
+        self.app = app
+        # path -> EndpointGate
+        self.gates = gates
+
+    async def __call__(self, scope, receive, send):
+        gate = self.gates.get(scope["path"]) if scope["type"] == "http" else None
+        # CORS preflights are cheap and must not be shed
+        if gate is None or scope["method"] == "OPTIONS":
+            await self.app(scope, receive, send)
+            return
+
+        reason = await gate.acquire()
+        if reason is not None:
+            REJECTED.inc(endpoint=gate.name, reason=reason)
+            await self._reject(send, gate)
+            return
+
+        admitted_at = time.monotonic()
+        completed = False
+        try:
+            await self.app(scope, receive, send)
+            completed = True
+        finally:
+            # Failed requests free their slot but say nothing about latency
+            gate.release(admitted_at if completed else None)
+
+    async def _reject(self, send, gate):
+        body = json.dumps({"detail": f"Server busy, retry /{gate.name} later"}).encode()
+        await send({
+            "type": "http.response.start",
+            "status": 503,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(body)).encode()),
+                (b"retry-after", str(gate.retry_after()).encode()),
+            ],
+        })
+        await send({"type": "http.response.body", "body": body})
+
@@ -0,0 +1,298 @@
+"""
+End-to-end API load benchmark.
+
+Builds synthetic workspaces (benchmarks/synthetic.py), serves the FastAPI
+app from them in-process with uvicorn, and drives /predict and /personality
+with a pool of concurrent keep-alive clients. Server workers are separate
+processes sharing one port (SO_REUSEPORT), like `uvicorn --workers N`; the
+load generator runs in this process so it does not compete with the
+server for the GIL.
+
+Run from Implementation/backend:
+
+    python -m benchmarks.api_load run --jobs 1500 6000 --server-workers 1 4 \\
+        --concurrency 1 8 32 --duration 10 --label baseline
+
+    # compare labels side by side
+    python -m benchmarks.api_load report --labels baseline my-change
+
+Requests shed with a 503 by admission control (admission.py) are counted
+in the "shed" column and left out of the latency percentiles. Shed clients
+wait for the Retry-After the server sent before their next request; set
+PATHFINDER_ADMISSION=0 to measure the server without it.
+
+Every cell (dataset x server workers x endpoint x concurrency) is appended
+as one JSON line to benchmarks/results/api_load.jsonl.
+"""
+import argparse
+import http.client
+import json
+import math
+import multiprocessing
+import os
+import queue
+import socket
+import subprocess
+import sys
+import threading
+import time
+
+from benchmarks.synthetic import build_workspace, skill_vocabulary, synthetic_profiles, synthetic_ocean
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+RESULTS_FILE = os.path.join(os.path.dirname(__file__), "results", "api_load.jsonl")
+HOST = "127.0.0.1"
+ENDPOINTS = ("/predict", "/personality")
+# Seconds a shed client waits when the 503 has no Retry-After
+SHED_BACKOFF = 1.0
+
+
+def _free_port():
+    with socket.socket() as sock:
+        sock.bind((HOST, 0))
+        return sock.getsockname()[1]
+
+
+def _git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=BACKEND_DIR,
+                              capture_output=True, text=True, timeout=5).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+def _serve(workspace, port, ready):
+    """Server worker process: import the app from the workspace and serve it"""
+    sys.path.insert(0, BACKEND_DIR)
+    os.chdir(workspace)
+    import uvicorn
+    import main
+
+    # proto must be IPPROTO_TCP: asyncio only sets TCP_NODELAY on accepted sockets then, and
+    # without it every keep-alive response waits ~40 ms on Nagle + delayed ACK
+    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM, socket.IPPROTO_TCP)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    if hasattr(socket, "SO_REUSEPORT"):
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
+    sock.bind((HOST, port))
+    sock.listen(2048)
+
+    server = uvicorn.Server(uvicorn.Config(main.app, log_level="warning", access_log=False))
+
+    def report_ready():
+        while not server.started:
+            time.sleep(0.05)
+        ready.put(os.getpid())
+
+    threading.Thread(target=report_ready, daemon=True).start()
+    server.run(sockets=[sock])
+
+
+class ServerGroup:
+    def __init__(self, workspace, workers):
+        if workers > 1 and not hasattr(socket, "SO_REUSEPORT"):
+            raise RuntimeError("More than one server worker needs SO_REUSEPORT")
+        self.workspace = workspace
+        self.workers = workers
+        self.port = _free_port()
+        self.processes = []
+
+    def __enter__(self):
+        context = multiprocessing.get_context("spawn")
+        ready = context.Queue()
+        for _ in range(self.workers):
+            # Not daemonic: the app starts its own inference worker process
+            process = context.Process(target=_serve, args=(self.workspace, self.port, ready))
+            process.start()
+            self.processes.append(process)
+
+        waiting, deadline = self.workers, time.monotonic() + 300
+        while waiting:
+            try:
+                ready.get(timeout=1)
+                waiting -= 1
+            except queue.Empty:
+                if any(not process.is_alive() for process in self.processes) or time.monotonic() > deadline:
+                    self.__exit__()
+                    raise RuntimeError("API server failed to start")
+        return self
+
+    def __exit__(self, *exc):
+        # SIGTERM lets uvicorn run the app's shutdown, which stops its inference worker
+        for process in self.processes:
+            process.terminate()
+        for process in self.processes:
+            process.join(15)
+            if process.is_alive():
+                process.kill()
+
+
+def _client(port, path, bodies, offset, stop_at, latencies, errors):
+    connection = http.client.HTTPConnection(HOST, port, timeout=120)
+    headers = {"Content-Type": "application/json"}
+    i = offset
+    while time.perf_counter() < stop_at:
+        body = bodies[i % len(bodies)]
+        i += 1
+        started = time.perf_counter()
+        try:
+            connection.request("POST", path, body=body, headers=headers)
+            response = connection.getresponse()
+            response.read()
+            status = response.status
+            retry_after = response.getheader("Retry-After")
+        except (OSError, http.client.HTTPException):
+            status = None
+            connection.close()
+            connection = http.client.HTTPConnection(HOST, port, timeout=120)
+        if status == 200:
+            latencies.append(time.perf_counter() - started)
+        else:
+            errors.append(status)
+            if status == 503:
+                # Shed by admission control: back off as told, like a well-behaved client
+                # (reconnecting afterwards; the server drops idle keep-alive connections)
+                connection.close()
+                time.sleep(min(float(retry_after or SHED_BACKOFF), max(0.0, stop_at - time.perf_counter())))
+    connection.close()
+
+
+def _percentile(ordered, q):
+    if not ordered:
+        return None
+    # Nearest-rank percentile
+    return ordered[max(0, math.ceil(q / 100 * len(ordered)) - 1)]
+
+
+def drive(port, path, bodies, concurrency, duration, warmup=2.0):
+    """Closed-loop load: `concurrency` clients, each sending back-to-back requests"""
+    if warmup > 0:
+        drive(port, path, bodies, concurrency, warmup, warmup=0)
+
+    per_client = [([], []) for _ in range(concurrency)]
+    stop_at = time.perf_counter() + duration
+    threads = [
+        threading.Thread(target=_client, args=(port, path, bodies, n * 97, stop_at, latencies, errors))
+        for n, (latencies, errors) in enumerate(per_client)
+    ]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+
+    ordered = sorted(latency for latencies, _ in per_client for latency in latencies)
+    statuses = [status for _, errors in per_client for status in errors]
+    shed = statuses.count(503)
+    ms = lambda value: round(value * 1000, 3) if value is not None else None
+    return {
+        "requests": len(ordered),
+        "errors": len(statuses) - shed,
+        "shed": shed,
+        "elapsed_s": round(elapsed, 3),
+        "throughput_rps": round(len(ordered) / elapsed, 2),
+        "latency_ms": {
+            "mean": ms(sum(ordered) / len(ordered)) if ordered else None,
+            "p50": ms(_percentile(ordered, 50)),
+            "p95": ms(_percentile(ordered, 95)),
+            "p99": ms(_percentile(ordered, 99)),
+            "max": ms(ordered[-1]) if ordered else None,
+        },
+    }
+
+
+def run(job_sizes, titles, courses, skills, server_workers, concurrency, endpoints, duration, warmup, label):
+    commit = _git_commit()
+    label = label or commit
+    results = []
+    for jobs in job_sizes:
+        print(f"Preparing workspace: {jobs} jobs, {titles} titles, {courses} courses")
+        workspace = build_workspace(jobs=jobs, titles=titles, courses=courses, skills=skills)
+        vocabulary = skill_vocabulary(skills)
+        bodies = {
+            "/predict": [json.dumps(body) for body in synthetic_profiles(500, vocabulary)],
+            "/personality": [json.dumps(body) for body in synthetic_ocean(500)],
+        }
+
+        for workers in server_workers:
+            with ServerGroup(workspace, workers) as servers:
+                for path in endpoints:
+                    for clients in concurrency:
+                        result = {
+                            "timestamp": time.strftime("%Y-%m-%d %H:%M:%S"),
+                            "label": label,
+                            "commit": commit,
+                            "dataset": {"jobs": jobs, "titles": titles, "courses": courses, "skills": skills},
+                            "server_workers": workers,
+                            "concurrency": clients,
+                            "endpoint": path,
+                            "duration_s": duration,
+                            **drive(servers.port, path, bodies[path], clients, duration, warmup),
+                        }
+                        results.append(result)
+                        print(_format_row(result))
+
+                        os.makedirs(os.path.dirname(RESULTS_FILE), exist_ok=True)
+                        with open(RESULTS_FILE, "a") as f:
+                            f.write(json.dumps(result) + "\n")
+    return results
+
+
+def _format_row(result):
+    latency = result["latency_ms"]
+    return (f"{str(result['label']):<16} {result['dataset']['jobs']:>7} {result['server_workers']:>3} "
+            f"{result['concurrency']:>5} {result['endpoint']:<13} {result['throughput_rps']:>9} "
+            f"{str(latency['p50']):>9} {str(latency['p95']):>9} {str(latency['p99']):>9} {result['errors']:>6} {result.get('shed', 0):>6}")
+
+
+def report(labels=None, last=None):
+    if not os.path.exists(RESULTS_FILE):
+        print(f"No results in {RESULTS_FILE}")
+        return
+    with open(RESULTS_FILE) as f:
+        results = [json.loads(line) for line in f if line.strip()]
+    if labels:
+        results = [r for r in results if r["label"] in labels]
+    if last:
+        results = results[-last:]
+
+    # Same cell for different labels next to each other
+    results.sort(key=lambda r: (r["dataset"]["jobs"], r["server_workers"], r["endpoint"], r["concurrency"],
+                                labels.index(r["label"]) if labels else 0))
+    print(f"{'label':<16} {'jobs':>7} {'srv':>3} {'conc':>5} {'endpoint':<13} {'rps':>9} "
+          f"{'p50_ms':>9} {'p95_ms':>9} {'p99_ms':>9} {'errors':>6} {'shed':>6}")
+    for result in results:
+        print(_format_row(result))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="End-to-end API load benchmark")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    bench = sub.add_parser("run", help="build workspaces, serve the API and measure it")
+    bench.add_argument("--jobs", nargs="+", type=int, default=[1500], help="job rows per dataset")
+    bench.add_argument("--titles", type=int, default=100)
+    bench.add_argument("--courses", type=int, default=800)
+    bench.add_argument("--skills", type=int, default=200)
+    bench.add_argument("--server-workers", nargs="+", type=int, default=[1])
+    bench.add_argument("--concurrency", nargs="+", type=int, default=[1, 8])
+    bench.add_argument("--endpoints", nargs="+", default=list(ENDPOINTS), choices=ENDPOINTS)
+    bench.add_argument("--duration", type=float, default=10.0, help="seconds measured per cell")
+    bench.add_argument("--warmup", type=float, default=2.0)
+    bench.add_argument("--label", default=None, help="name for this run in the results file")
+
+    rep = sub.add_parser("report", help="print stored results")
+    rep.add_argument("--labels", nargs="+")
+    rep.add_argument("--last", type=int)
+
+    args = parser.parse_args()
+    if args.command == "run":
+        run(args.jobs, args.titles, args.courses, args.skills, args.server_workers, args.concurrency,
+            args.endpoints, args.duration, args.warmup, args.label)
+    else:
+        report(args.labels, args.last)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,153 @@
+"""
+Parity check and latency benchmark for the cached profile vectorizer.
+
+Compares ProfileVectorizer (ml_models/feature_cache.py) with
+tfidf.transform on the joined profile text. Parity is exact: every row
+must have the same columns and bit-identical values, otherwise the exit
+code is 1. Besides the usual synthetic profiles, the check uses profiles
+cut out of multi-word vocabulary entries, so n-grams cross term and field
+boundaries.
+
+Run from Implementation/backend:
+
+    # against a synthetic workspace (built on first use)
+    python -m benchmarks.feature_cache --jobs 3000 --titles 300
+
+    # against real artifacts: any directory with trained ml_models/ artifacts
+    python -m benchmarks.feature_cache --workspace /path/to/backend-copy
+
+Results are appended to benchmarks/results/feature_cache.jsonl.
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import time
+
+import numpy as np
+
+from benchmarks.synthetic import build_workspace, skill_vocabulary, synthetic_profiles, working_directory
+from ml_models.artifacts import load_artifacts
+from ml_models.feature_cache import ProfileVectorizer
+from ml_models.preprocess import profile_text
+
+RESULTS_FILE = os.path.join(os.path.dirname(__file__), "results", "feature_cache.jsonl")
+
+
+def boundary_profiles(tfidf, count, seed=0):
+    """Profiles whose terms are pieces of vocabulary n-grams, cut at random word boundaries"""
+    rng = random.Random(seed)
+    phrases = [feature.split(" ") for feature in tfidf.vocabulary_ if " " in feature]
+    profiles = []
+    for _ in range(count):
+        words = list(rng.choice(phrases))
+        # Sometimes run two entries together so n-grams span more than one cut
+        if rng.random() < 0.3:
+            words += rng.choice(phrases)
+        cuts = sorted(rng.sample(range(1, len(words)), min(len(words) - 1, rng.randint(1, 4))))
+        terms = [" ".join(words[a:b]) for a, b in zip([0] + cuts, cuts + [len(words)])]
+        split = rng.randint(0, len(terms))
+        profiles.append((terms[0], terms[1:split], terms[max(1, split):]))
+    return profiles
+
+
+def check_parity(tfidf, profiles):
+    vectorizer = ProfileVectorizer(tfidf)
+    expected = tfidf.transform([profile_text(*profile) for profile in profiles])
+    # Twice: cold, then every term and field from the cache
+    failures = 0
+    for _ in range(2):
+        actual = vectorizer.transform(profiles)
+        for row in range(len(profiles)):
+            a, e = actual[row], expected[row]
+            if not (np.array_equal(a.indices, e.indices) and np.array_equal(a.data, e.data)):
+                failures += 1
+    return {"profiles": len(profiles), "failures": failures, "nonzeros": int(expected.nnz)}
+
+
+def _timings(func, inputs, repeat):
+    samples = []
+    for _ in range(repeat):
+        for item in inputs:
+            started = time.perf_counter()
+            func(item)
+            samples.append(time.perf_counter() - started)
+    samples.sort()
+    us = lambda value: round(value * 1e6, 2)
+    return {
+        "mean_us": us(sum(samples) / len(samples)),
+        "p50_us": us(samples[len(samples) // 2]),
+        "p99_us": us(samples[min(len(samples) - 1, int(len(samples) * 0.99))]),
+    }
+
+
+def benchmark(tfidf, profiles, batch_size, repeat):
+    vectorizer = ProfileVectorizer(tfidf)
+    started = time.perf_counter()
+    vectorizer.transform(profiles)
+    warmup = time.perf_counter() - started
+
+    singles = [[profile] for profile in profiles]
+    batches = [profiles[i:i + batch_size] for i in range(0, len(profiles), batch_size)]
+    results = {"cold_fill_ms": round(warmup * 1000, 2), "cache": vectorizer.cache_size()}
+    for name, inputs in (("single", singles), (f"batch{batch_size}", batches)):
+        results[name] = {
+            "tfidf": _timings(lambda batch: tfidf.transform([profile_text(*p) for p in batch]), inputs, repeat),
+            "cached": _timings(vectorizer.transform, inputs, repeat),
+        }
+        results[name]["speedup_p50"] = round(
+            results[name]["tfidf"]["p50_us"] / results[name]["cached"]["p50_us"], 2)
+    return results
+
+
+def run(workspace, count, skills, batch_size, repeat):
+    with working_directory(workspace):
+        tfidf = load_artifacts()[2]
+
+    profiles = [(p["education"], p["interests"], p["skills"])
+                for p in synthetic_profiles(count, skill_vocabulary(skills))]
+    started = time.perf_counter()
+    ProfileVectorizer(tfidf)
+    build_ms = (time.perf_counter() - started) * 1000
+
+    result = {
+        "timestamp": time.strftime("%Y-%m-%d %H:%M:%S"),
+        "workspace": workspace,
+        "features": len(tfidf.vocabulary_),
+        "ngram_range": list(tfidf.ngram_range),
+        "build_ms": round(build_ms, 2),
+        "parity": check_parity(tfidf, profiles),
+        "boundary_parity": check_parity(tfidf, boundary_profiles(tfidf, count)),
+        "latency": benchmark(tfidf, profiles, batch_size, repeat),
+    }
+    print(json.dumps(result, indent=2))
+
+    os.makedirs(os.path.dirname(RESULTS_FILE), exist_ok=True)
+    with open(RESULTS_FILE, "a") as f:
+        f.write(json.dumps(result) + "\n")
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Cached profile vectorizer parity and latency")
+    parser.add_argument("--workspace", help="directory with trained ml_models/ artifacts (default: synthetic)")
+    parser.add_argument("--jobs", type=int, default=1500)
+    parser.add_argument("--titles", type=int, default=100)
+    parser.add_argument("--skills", type=int, default=200)
+    parser.add_argument("--profiles", type=int, default=500)
+    parser.add_argument("--batch-size", type=int, default=32)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    workspace = args.workspace or build_workspace(jobs=args.jobs, titles=args.titles, skills=args.skills)
+    result = run(os.path.abspath(workspace), args.profiles, args.skills, args.batch_size, args.repeat)
+    failures = result["parity"]["failures"] + result["boundary_parity"]["failures"]
+    if failures:
+        print(f"Parity FAILED for {failures} profiles")
+        sys.exit(1)
+    print("Parity OK")
+
+
+if __name__ == "__main__":
+    main()
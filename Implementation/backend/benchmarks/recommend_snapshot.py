@@ -0,0 +1,220 @@
+"""
+Parity, latency and memory of the memory-mapped recommendation snapshot.
+
+The reference is the per-process pandas implementation the snapshot
+replaced (jobs and courses frames, a Python set per course, a regex scan
+per request), with the job lookup by canonical title. Every
+category is checked with several skill sets; parity fails (exit code 1)
+on any difference in missing skills or recommended courses. The batch
+path /predict uses (recommend_courses_for_jobs, all top-k categories in
+one sparse product) is checked the same way on random groups of five
+categories, and timed against five single calls.
+
+Memory is what each API worker used to hold on its heap (the frames and
+sets, measured with tracemalloc) next to the snapshot file, which all
+workers share through the page cache, and the per-worker lookup tables.
+
+Run from Implementation/backend:
+
+    python -m benchmarks.recommend_snapshot --workspace /path/to/backend-copy
+    python -m benchmarks.recommend_snapshot --jobs 6000 --courses 3000
+
+Results are appended to benchmarks/results/recommend_snapshot.jsonl.
+"""
+import argparse
+import json
+import os
+import random
+import re
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import pandas as pd
+
+from benchmarks.synthetic import build_workspace, working_directory
+from database.database import PathfinderDatabase
+from ml_models.recommend_snapshot import SnapshotStore, extract_skills, publish_snapshot
+import ml_models.recommend as recommend
+from database.title_canonicalizer import OTHER_TITLE
+
+RESULTS_FILE = os.path.join(os.path.dirname(__file__), "results", "recommend_snapshot.jsonl")
+
+
+class PandasReference:
+    """The old recommend.py: everything in per-process pandas frames and sets"""
+
+    def __init__(self, connection):
+        self.jobs_df = pd.read_sql_query(
+            "SELECT id, canonical_title, description FROM jobs "
+            "WHERE description IS NOT NULL AND canonical_title IS NOT NULL AND canonical_title != ? ORDER BY id",
+            connection, params=(OTHER_TITLE,))
+        self.courses_df = pd.read_sql_query(
+            "SELECT course_title, organization, skills, url, rating, course_students_enrolled "
+            "FROM courses WHERE course_title IS NOT NULL", connection)
+        self.courses_df["skills_set"] = self.courses_df["skills"].apply(extract_skills)
+        self.all_course_skills = set().union(*self.courses_df["skills_set"])
+
+    def job_skills(self, text):
+        text = text.lower()
+        return {skill for skill in self.all_course_skills
+                if re.search(r"\b" + re.escape(skill.lower()) + r"\b", text)}
+
+    def recommend(self, job_title, user_skills):
+        user_skills = {s.lower() for s in user_skills}
+        job_row = self.jobs_df[self.jobs_df["canonical_title"] == job_title]
+        if job_row.empty:
+            return {"error": "Job not found"}
+        missing_skills = self.job_skills(job_row.iloc[0]["description"]) - user_skills
+        if not missing_skills:
+            return {"message": "User already has all job-required skills!"}
+
+        optional = lambda value: None if pd.isna(value) else value
+        course_recommendations = []
+        for _, row in self.courses_df.iterrows():
+            matched = missing_skills.intersection(row["skills_set"])
+            if matched:
+                course_recommendations.append({
+                    "course_title": row["course_title"],
+                    "organization": optional(row["organization"]),
+                    "url": optional(row["url"]),
+                    "rating": optional(row["rating"]),
+                    "coverage_score": len(matched) / len(missing_skills),
+                })
+        ranked = sorted(course_recommendations, key=lambda x: (x["coverage_score"], x["rating"] or 0), reverse=True)
+        return {"job_title": job_title, "missing_skills": list(missing_skills), "recommended_courses": ranked[:5]}
+
+
+def _comparable(result):
+    result = dict(result)
+    if "missing_skills" in result:
+        result["missing_skills"] = sorted(result["missing_skills"])
+    return json.loads(json.dumps(result))
+
+
+def skill_sets(reference, category, rng, count):
+    """Empty, some of the category's own skills, random catalog skills"""
+    skills = sorted(reference.all_course_skills)
+    required = sorted(reference.job_skills(
+        reference.jobs_df[reference.jobs_df["canonical_title"] == category].iloc[0]["description"]))
+    sets = [[]]
+    for _ in range(count):
+        own = rng.sample(required, min(len(required), rng.randint(0, 6)))
+        sets.append(own + rng.sample(skills, min(len(skills), rng.randint(0, 4))))
+    if required:
+        sets.append([skill.upper() for skill in required])
+    return sets
+
+
+def _timed(func, calls):
+    samples = []
+    for args in calls:
+        started = time.perf_counter()
+        func(*args)
+        samples.append(time.perf_counter() - started)
+    samples.sort()
+    return {
+        "mean_ms": round(sum(samples) / len(samples) * 1000, 3),
+        "p50_ms": round(samples[len(samples) // 2] * 1000, 3),
+        "p99_ms": round(samples[min(len(samples) - 1, int(len(samples) * 0.99))] * 1000, 3),
+    }
+
+
+def run(workspace, sets_per_category, seed):
+    rng = random.Random(seed)
+    with working_directory(workspace):
+        db = PathfinderDatabase()
+        db.connect()
+
+        tracemalloc.start()
+        reference = PandasReference(db.connection)
+        pandas_heap = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+
+        path = os.path.join(tempfile.mkdtemp(), "recommendations.snapshot")
+        started = time.perf_counter()
+        publish_snapshot(db.connection, path)
+        build_s = time.perf_counter() - started
+        db.connection.close()
+
+    categories = list(dict.fromkeys(reference.jobs_df["canonical_title"]))
+    calls = [(category, skills) for category in categories
+             for skills in skill_sets(reference, category, rng, sets_per_category)]
+    calls.append(("No Such Category", []))
+
+    tracemalloc.start()
+    # The API's module-level store, pointed at the snapshot just built
+    recommend.snapshots = SnapshotStore(path)
+    snapshot = recommend.snapshots.get()
+
+    failures = []
+    for category, skills in calls:
+        expected = _comparable(reference.recommend(category, skills))
+        actual = _comparable(recommend.recommend_courses_for_job(category, skills))
+        if expected != actual:
+            failures.append({"category": category, "skills": skills})
+    # /predict asks for its top-k categories together
+    groups = [(rng.sample(categories, min(5, len(categories))) + ["No Such Category"][:rng.randint(0, 1)], skills)
+              for _, skills in calls]
+    for titles, skills in groups:
+        expected = [_comparable(reference.recommend(title, skills)) for title in titles]
+        actual = [_comparable(result) for result in recommend.recommend_courses_for_jobs(titles, skills)]
+        if expected != actual:
+            failures.append({"categories": titles, "skills": skills})
+
+    # Lookup tables are built on first use; measure them after the parity pass
+    snapshot_heap = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    result = {
+        "timestamp": time.strftime("%Y-%m-%d %H:%M:%S"),
+        "workspace": workspace,
+        "categories": len(categories),
+        "courses": snapshot.course_count,
+        "skills": snapshot.skill_count,
+        "build_s": round(build_s, 3),
+        "parity": {"calls": len(calls) + len(groups), "failures": len(failures), "examples": failures[:5]},
+        "memory": {
+            "pandas_heap_per_worker_mb": round(pandas_heap / 2 ** 20, 2),
+            "snapshot_file_mb": round(os.path.getsize(path) / 2 ** 20, 2),
+            "snapshot_heap_per_worker_mb": round(snapshot_heap / 2 ** 20, 2),
+        },
+        "latency": {
+            "pandas": _timed(reference.recommend, calls),
+            "snapshot": _timed(recommend.recommend_courses_for_job, calls),
+            "top5_single_calls": _timed(
+                lambda titles, skills: [recommend.recommend_courses_for_job(title, skills) for title in titles], groups),
+            "top5_batch": _timed(recommend.recommend_courses_for_jobs, groups),
+        },
+    }
+    print(json.dumps(result, indent=2))
+
+    os.makedirs(os.path.dirname(RESULTS_FILE), exist_ok=True)
+    with open(RESULTS_FILE, "a") as f:
+        f.write(json.dumps(result) + "\n")
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Recommendation snapshot parity, latency and memory")
+    parser.add_argument("--workspace", help="directory with database/pathfinder_db.sqlite (default: synthetic)")
+    parser.add_argument("--jobs", type=int, default=1500)
+    parser.add_argument("--titles", type=int, default=100)
+    parser.add_argument("--courses", type=int, default=800)
+    parser.add_argument("--skills", type=int, default=200)
+    parser.add_argument("--sets", type=int, default=5, help="random skill sets per category")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    workspace = args.workspace or build_workspace(jobs=args.jobs, titles=args.titles, courses=args.courses,
+                                                  skills=args.skills)
+    result = run(os.path.abspath(workspace), args.sets, args.seed)
+    if result["parity"]["failures"]:
+        print(f"Parity FAILED for {result['parity']['failures']} calls")
+        sys.exit(1)
+    print("Parity OK")
+
+
+if __name__ == "__main__":
+    main()
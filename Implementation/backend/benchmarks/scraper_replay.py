@@ -0,0 +1,329 @@
+"""
+Offline scraper replay benchmark.
+
+Record result pages once, then replay them from a local stand-in HTTP server
+and measure IndeedScraper / CourseraScraper without touching the network.
+
+Run from Implementation/backend:
+
+    # capture pages (needs network; --browser saves the JS-rendered DOM)
+    python -m benchmarks.scraper_replay record --titles "Data Scientist" "Welder" --pages 2
+
+    # write golden outputs from the current extractor, after checking them by hand
+    python -m benchmarks.scraper_replay run --update-golden
+
+    # benchmark every backend / extraction mode against the goldens
+    python -m benchmarks.scraper_replay run --modes html selenium-bulk selenium-element
+
+Fixtures live in benchmarks/fixtures/scraper: manifest.json maps each request
+path to a saved page (file paths are relative to that directory), golden/
+holds the expected records per site and title. The committed manifest
+serves the saved Indeed and Coursera pages of the parse_html tests
+(tests/fixtures), so `run` works offline without recording first.
+
+Pages are scraped through the public scrape_jobs / scrape_courses, one
+call per recorded site and title with max_pages set to its recorded pages.
+"""
+import argparse
+import json
+import os
+import re
+import threading
+import time
+from contextlib import contextmanager
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from urllib.parse import urlsplit
+
+from scraper.indeed_scraper import IndeedScraper, INDEED_BASE_URL
+from scraper.coursera_scraper import CourseraScraper, COURSERA_BASE_URL
+from scraper.html_backend import fetch_html
+from scraper.pacing import Pacer
+
+FIXTURE_DIR = os.path.join(os.path.dirname(__file__), "fixtures", "scraper")
+MANIFEST_FILE = os.path.join(FIXTURE_DIR, "manifest.json")
+GOLDEN_DIR = os.path.join(FIXTURE_DIR, "golden")
+RESULTS_FILE = os.path.join(os.path.dirname(__file__), "results", "scraper_replay.jsonl")
+
+# Fields compared against the golden records
+COMPARED_FIELDS = {
+    "indeed": ["title", "company", "location", "salary", "job_type", "link", "description"],
+    "coursera": ["course_title", "organization", "skills", "rating", "url"],
+}
+BASE_URLS = {"indeed": INDEED_BASE_URL, "coursera": COURSERA_BASE_URL}
+
+
+def _slug(text):
+    return re.sub(r"[^a-z0-9]+", "-", text.lower()).strip("-")
+
+
+def load_manifest():
+    if not os.path.exists(MANIFEST_FILE):
+        return {"pages": []}
+    with open(MANIFEST_FILE) as f:
+        return json.load(f)
+
+
+def save_manifest(manifest):
+    os.makedirs(FIXTURE_DIR, exist_ok=True)
+    with open(MANIFEST_FILE, "w") as f:
+        json.dump(manifest, f, indent=2)
+
+
+# Recording
+
+def _page_urls(site, title, pages):
+    if site == "indeed":
+        url = f"{INDEED_BASE_URL}/jobs?q={title.replace(' ', '+')}&l=Canada"
+        return [url if p == 0 else f"{url}&start={p * 10}" for p in range(pages)]
+    url = f"{COURSERA_BASE_URL}/search?query={title.replace(' ', '%20')}"
+    return [url if p == 0 else f"{url}&page={p + 1}" for p in range(pages)]
+
+
+def record(titles, pages=1, sites=("indeed", "coursera"), browser=False):
+    manifest = load_manifest()
+    known = {page["path"] for page in manifest["pages"]}
+
+    pool = None
+    if browser:
+        from scraper.driver_pool import DriverPool
+        pool = DriverPool(size=1, headless=True)
+
+    try:
+        for site in sites:
+            for title in titles:
+                for n, url in enumerate(_page_urls(site, title, pages), start=1):
+                    if pool is not None:
+                        with pool.driver() as driver:
+                            driver.get(url)
+                            time.sleep(5)
+                            html = driver.page_source
+                    else:
+                        html, _ = fetch_html(url)
+                    if not html:
+                        print(f"Skipping {url}: nothing fetched")
+                        continue
+
+                    parts = urlsplit(url)
+                    path = parts.path + "?" + parts.query
+                    file_name = f"{site}/{_slug(title)}_p{n}.html"
+                    os.makedirs(os.path.join(FIXTURE_DIR, site), exist_ok=True)
+                    with open(os.path.join(FIXTURE_DIR, file_name), "w", encoding="utf-8") as f:
+                        f.write(html)
+
+                    if path not in known:
+                        manifest["pages"].append({"site": site, "title": title, "page": n,
+                                                  "path": path, "file": file_name})
+                        known.add(path)
+                    print(f"Recorded {url} -> {file_name}")
+    finally:
+        if pool is not None:
+            pool.close()
+
+    save_manifest(manifest)
+
+
+# Stand-in server
+
+def start_server(manifest, host="127.0.0.1", port=0):
+    """Serve recorded pages by request path; returns (server, base_url)"""
+    routes = {page["path"]: os.path.join(FIXTURE_DIR, page["file"]) for page in manifest["pages"]}
+
+    class ReplayHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            file_path = routes.get(self.path)
+            if file_path is None:
+                self.send_error(404)
+                return
+            with open(file_path, "rb") as f:
+                body = f.read()
+            self.send_response(200)
+            self.send_header("Content-Type", "text/html; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer((host, port), ReplayHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://{host}:{server.server_address[1]}"
+
+
+# Measuring
+
+class CallCounter:
+    """Counts WebDriver protocol commands by wrapping driver.execute"""
+
+    def __init__(self):
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def attach(self, driver):
+        if getattr(driver, "_replay_counter", None) is self:
+            return
+        original = driver.execute
+
+        def counting_execute(*args, **kwargs):
+            with self._lock:
+                self.calls += 1
+            return original(*args, **kwargs)
+
+        driver.execute = counting_execute
+        driver._replay_counter = self
+
+
+class CountingPool:
+    """DriverPool wrapper that attaches a CallCounter to every borrowed driver"""
+
+    def __init__(self, pool, counter):
+        self.pool = pool
+        self.counter = counter
+
+    @contextmanager
+    def driver(self):
+        with self.pool.driver() as driver:
+            self.counter.attach(driver)
+            yield driver
+
+    def page_loaded(self, driver):
+        self.pool.page_loaded(driver)
+
+
+def _normalize(site, record, base_url):
+    out = {}
+    for field in COMPARED_FIELDS[site]:
+        value = record.get(field)
+        if isinstance(value, str):
+            value = value.replace(base_url, BASE_URLS[site])
+        out[field] = value
+    return out
+
+
+def _accuracy(site, records, golden):
+    """Share of golden fields reproduced, matching records by position"""
+    if not golden:
+        return None
+    total = len(golden) * len(COMPARED_FIELDS[site])
+    matched = 0
+    for got, want in zip(records, golden):
+        matched += sum(1 for field in COMPARED_FIELDS[site] if got.get(field) == want.get(field))
+    return matched / total
+
+
+def _golden_path(site, title):
+    return os.path.join(GOLDEN_DIR, site, f"{_slug(title)}.json")
+
+
+def _crawls(manifest):
+    """(site, title, pages recorded) in manifest order"""
+    pages = {}
+    for page in manifest["pages"]:
+        key = (page["site"], page["title"])
+        pages[key] = max(pages.get(key, 0), page["page"])
+    return [(site, title, count) for (site, title), count in pages.items()]
+
+
+def run_mode(mode, manifest, base_url, update_golden=False):
+    """Scrape every recorded site and title with one backend/extraction mode"""
+    backend = "html" if mode == "html" else "selenium"
+    extraction_mode = "element" if mode == "selenium-element" else "bulk"
+
+    counter = CallCounter()
+    pool = None
+    if backend == "selenium":
+        from scraper.driver_pool import DriverPool
+        pool = CountingPool(DriverPool(size=1, headless=True, max_pages=1000), counter)
+
+    totals = {"pages": 0, "cards": 0, "seconds": 0.0, "accuracy": []}
+    try:
+        for site, title, pages in _crawls(manifest):
+            kwargs = dict(pool=pool, base_url=base_url, extraction_mode=extraction_mode,
+                          backend=backend, pacer=Pacer(min_delay=0, max_delay=0))
+            started = time.perf_counter()
+            # No seen-set: every recorded page is requested, as in a first crawl
+            if site == "indeed":
+                records = IndeedScraper(**kwargs).scrape_jobs(title, location="Canada", max_pages=pages)
+            else:
+                records = CourseraScraper(**kwargs).scrape_courses(title, max_pages=pages)
+            totals["seconds"] += time.perf_counter() - started
+            totals["pages"] += pages
+            totals["cards"] += len(records)
+
+            normalized = [_normalize(site, r, base_url) for r in records]
+            golden_file = _golden_path(site, title)
+            if update_golden:
+                os.makedirs(os.path.dirname(golden_file), exist_ok=True)
+                with open(golden_file, "w") as f:
+                    json.dump(normalized, f, indent=2)
+            elif os.path.exists(golden_file):
+                with open(golden_file) as f:
+                    accuracy = _accuracy(site, normalized, json.load(f))
+                if accuracy is not None:
+                    totals["accuracy"].append(accuracy)
+    finally:
+        if pool is not None:
+            pool.pool.close()
+
+    seconds = totals["seconds"] or 1e-9
+    return {
+        "mode": mode,
+        "pages": totals["pages"],
+        "cards": totals["cards"],
+        "pages_per_sec": round(totals["pages"] / seconds, 2),
+        "cards_per_sec": round(totals["cards"] / seconds, 2),
+        "webdriver_calls_per_card": round(counter.calls / totals["cards"], 2) if totals["cards"] else None,
+        "accuracy": round(sum(totals["accuracy"]) / len(totals["accuracy"]), 4) if totals["accuracy"] else None,
+    }
+
+
+def run(modes, update_golden=False):
+    manifest = load_manifest()
+    if not manifest["pages"]:
+        print(f"No recorded pages in {MANIFEST_FILE}; run the 'record' command first.")
+        return []
+
+    server, base_url = start_server(manifest)
+    results = []
+    try:
+        for mode in modes:
+            result = run_mode(mode, manifest, base_url, update_golden=update_golden)
+            result["timestamp"] = time.strftime("%Y-%m-%d %H:%M:%S")
+            results.append(result)
+            print(json.dumps(result))
+            # Goldens come from the first mode only
+            update_golden = False
+    finally:
+        server.shutdown()
+
+    os.makedirs(os.path.dirname(RESULTS_FILE), exist_ok=True)
+    with open(RESULTS_FILE, "a") as f:
+        for result in results:
+            f.write(json.dumps(result) + "\n")
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline scraper replay benchmark")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    rec = sub.add_parser("record", help="capture live result pages as fixtures")
+    rec.add_argument("--titles", nargs="+", required=True)
+    rec.add_argument("--pages", type=int, default=1)
+    rec.add_argument("--sites", nargs="+", default=["indeed", "coursera"])
+    rec.add_argument("--browser", action="store_true", help="save the rendered DOM via Chrome")
+
+    bench = sub.add_parser("run", help="replay fixtures and report throughput/accuracy")
+    bench.add_argument("--modes", nargs="+", default=["html"],
+                       choices=["html", "selenium-bulk", "selenium-element"])
+    bench.add_argument("--update-golden", action="store_true")
+
+    args = parser.parse_args()
+    if args.command == "record":
+        record(args.titles, pages=args.pages, sites=args.sites, browser=args.browser)
+    else:
+        run(args.modes, update_golden=args.update_golden)
+
+
+if __name__ == "__main__":
+    main()
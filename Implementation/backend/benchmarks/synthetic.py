@@ -0,0 +1,174 @@
+"""
+Synthetic workspaces for benchmarks.
+
+A workspace is a directory laid out like Implementation/backend as far as
+the API is concerned (database/pathfinder_db.sqlite and the ml_models/ artifacts),
+so the app can be imported with the workspace as its working directory.
+The job model is trained with the real train_model(); only the personality
+model, whose training data is not in the repo, is a stand-in.
+
+    from benchmarks.synthetic import build_workspace
+    path = build_workspace("/tmp/bench-ws", jobs=3000, titles=100, courses=800)
+"""
+import os
+import random
+from contextlib import contextmanager
+
+import joblib
+import numpy as np
+
+from database.database import PathfinderDatabase
+from database.job_titles import COMMON_JOB_TITLES
+from database.title_canonicalizer import backfill_canonical_titles
+
+WORKSPACE_ROOT = os.path.join(os.path.dirname(__file__), "results", "workspaces")
+
+SKILLS = [
+    "python", "sql", "excel", "tableau", "power bi", "machine learning", "statistics", "java",
+    "javascript", "react", "node.js", "aws", "azure", "docker", "kubernetes", "linux", "git",
+    "project management", "agile", "scrum", "communication", "leadership", "negotiation",
+    "salesforce", "seo", "content marketing", "copywriting", "figma", "user research",
+    "accounting", "financial modeling", "budgeting", "customer service", "supply chain",
+    "logistics", "data analysis", "data visualization", "deep learning", "nlp", "cloud computing",
+    "cybersecurity", "networking", "business development", "public speaking", "recruiting",
+    "training", "quality assurance", "testing", "c++", "go", "rust", "spark", "hadoop",
+    "etl", "product management", "stakeholder management", "risk management", "compliance",
+    "graphic design", "video editing",
+]
+# How scraped titles dress up a taxonomy title; all canonicalize back to it
+TITLE_VARIANTS = ["{}", "Senior {}", "{} II", "{} - Remote", "Junior {} (Contract)"]
+FILLER = (
+    "we are looking for a motivated team member to join our growing company you will work with "
+    "cross functional partners to deliver results for our clients and customers across canada "
+    "responsibilities include planning reporting and improving processes in a fast paced "
+    "environment with opportunities to learn and grow benefits include health dental and "
+    "flexible hours apply today"
+).split()
+ORGANIZATIONS = ["University of Toronto", "Google", "IBM", "Meta", "Duke University",
+                 "University of Michigan", "Coursera Project Network", "DeepLearning.AI"]
+
+
+@contextmanager
+def working_directory(path):
+    previous = os.getcwd()
+    os.chdir(path)
+    try:
+        yield
+    finally:
+        os.chdir(previous)
+
+
+def skill_vocabulary(size):
+    """The real-looking skills first, then numbered tools to reach `size`"""
+    skills = SKILLS[:size]
+    skills += [f"tool{i:04d}" for i in range(size - len(skills))]
+    return skills
+
+
+def job_titles(count):
+    """
+    Raw titles built from the COMMON_JOB_TITLES taxonomy, so every one maps
+    onto a real category instead of OTHER_TITLE: each taxonomy title as
+    written first, then dressed-up variants of it. Past the taxonomy size
+    the extra titles share categories.
+    """
+    titles = [variant.format(title) for variant in TITLE_VARIANTS for title in COMMON_JOB_TITLES]
+    return titles[:count]
+
+
+def synthetic_jobs(count, titles, skills, rng, description_words=60):
+    # Every title has its own core skills, so the classifier has something to learn
+    title_skills = {title: rng.sample(skills, min(8, len(skills))) for title in titles}
+    jobs = []
+    for i in range(count):
+        title = titles[i % len(titles)]
+        words = rng.choices(FILLER, k=description_words)
+        words += rng.sample(title_skills[title], 4) + rng.sample(skills, 2)
+        rng.shuffle(words)
+        jobs.append((title, f"Company {rng.randrange(500)}", " ".join(words),
+                     f"https://ca.indeed.com/viewjob?jk=synthetic{i:08d}"))
+    return jobs
+
+
+def synthetic_courses(count, skills, rng):
+    courses = []
+    for i in range(count):
+        course_skills = rng.sample(skills, rng.randint(2, 8))
+        courses.append((f"Course {i}: {course_skills[0].title()}", rng.choice(ORGANIZATIONS),
+                        ", ".join(course_skills), f"https://www.coursera.org/learn/synthetic-{i}",
+                        round(rng.uniform(3.5, 5.0), 1)))
+    return courses
+
+
+def synthetic_profiles(count, skills, seed=0):
+    """Request bodies for /predict"""
+    rng = random.Random(seed)
+    return [{
+        "education": rng.choice(["High School", "Diploma", "Bachelor", "Master", "PhD"]),
+        "gpa": round(rng.uniform(2.0, 4.0), 2),
+        "interests": rng.sample(skills, 2),
+        "skills": rng.sample(skills, rng.randint(1, 6)),
+    } for _ in range(count)]
+
+
+def synthetic_ocean(count, seed=0):
+    """Request bodies for /personality"""
+    rng = random.Random(seed)
+    return [{trait: round(rng.uniform(1.0, 5.0), 2) for trait in "OCEAN"} for _ in range(count)]
+
+
+def _build_personality_model(trees, seed):
+    from sklearn.ensemble import RandomForestClassifier
+    from sklearn.preprocessing import StandardScaler
+
+    rng = np.random.RandomState(seed)
+    X = rng.uniform(1, 5, (2000, 5))
+    y = np.digitize(X @ rng.uniform(-1, 1, 5), np.quantile(X @ rng.uniform(-1, 1, 5), [0.2, 0.4, 0.6, 0.8]))
+    scaler = StandardScaler().fit(X)
+    model = RandomForestClassifier(n_estimators=trees, random_state=seed).fit(scaler.transform(X), y)
+    joblib.dump(scaler, "./ml_models/ocean_scaler.pkl")
+    joblib.dump(model, "./ml_models/rf_cluster_k5.pkl")
+
+
+def workspace_path(jobs, titles, courses, skills, seed):
+    return os.path.join(WORKSPACE_ROOT, f"jobs{jobs}-titles{titles}-courses{courses}-skills{skills}-seed{seed}")
+
+
+def build_workspace(path=None, jobs=1500, titles=100, courses=800, skills=200, seed=0,
+                    personality_trees=100, train=True):
+    """Create (or reuse) a workspace and return its absolute path"""
+    path = os.path.abspath(path or workspace_path(jobs, titles, courses, skills, seed))
+    marker = os.path.join(path, ".complete")
+    if os.path.exists(marker):
+        return path
+
+    os.makedirs(os.path.join(path, "database"), exist_ok=True)
+    os.makedirs(os.path.join(path, "ml_models"), exist_ok=True)
+    rng = random.Random(seed)
+    vocabulary = skill_vocabulary(skills)
+
+    with working_directory(path):
+        db = PathfinderDatabase()
+        db.connect()
+        db.connection.execute("DELETE FROM jobs")
+        db.connection.execute("DELETE FROM courses")
+        db.connection.executemany(
+            "INSERT INTO jobs (job_title, company, description, link) VALUES (?, ?, ?, ?)",
+            synthetic_jobs(jobs, job_titles(titles), vocabulary, rng)
+        )
+        db.connection.executemany(
+            "INSERT INTO courses (course_title, organization, skills, url, rating) VALUES (?, ?, ?, ?, ?)",
+            synthetic_courses(courses, vocabulary, rng)
+        )
+        db.connection.commit()
+        backfill_canonical_titles(db.connection)
+        db.connection.close()
+
+        _build_personality_model(personality_trees, seed)
+        if train:
+            from ml_models.job_model import train_model
+            train_model()
+
+    with open(marker, "w") as f:
+        f.write("ok\n")
+    return path
@@ -0,0 +1,152 @@
+"""
+Parity check and latency benchmark for the top-k scoring kernel.
+
+Compares TopKScorer (ml_models/topk_kernel.py) with the sklearn path it
+replaces: predict_proba over every class, then a full argsort. Parity
+fails (exit code 1) if a returned probability differs from predict_proba
+or if the kernel misses a category that beats its own k-th pick. The
+same parity on small multinomial, binary and one-vs-rest models is
+covered by tests/test_topk_kernel.py; this script checks it on real or
+synthetic artifacts at scale.
+
+Run from Implementation/backend:
+
+    # against a synthetic workspace (built on first use)
+    python -m benchmarks.topk_kernel --jobs 3000 --titles 300
+
+    # against real artifacts: any directory with trained ml_models/ artifacts
+    python -m benchmarks.topk_kernel --workspace /path/to/backend-copy
+
+Results are appended to benchmarks/results/topk_kernel.jsonl.
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+import numpy as np
+
+from benchmarks.synthetic import build_workspace, skill_vocabulary, synthetic_profiles, working_directory
+from ml_models.artifacts import load_artifacts
+from ml_models.preprocess import profile_text
+from ml_models.topk_kernel import TopKScorer
+
+RESULTS_FILE = os.path.join(os.path.dirname(__file__), "results", "topk_kernel.jsonl")
+RTOL = 1e-4
+ATOL = 1e-6
+
+
+def sklearn_top_k(model, label_encoder, X, k):
+    probs = model.predict_proba(X)
+    top = probs.argsort(axis=1)[:, -k:][:, ::-1]
+    labels = label_encoder.inverse_transform(model.classes_[top.ravel()]).reshape(top.shape)
+    return labels, np.take_along_axis(probs, top, axis=1), probs
+
+
+def check_parity(model, label_encoder, scorer, X, k):
+    reference_labels, reference_probs, all_probs = sklearn_top_k(model, label_encoder, X, k)
+    labels, probs = scorer.top_k(scorer.logits(X), k)
+
+    column = {label: i for i, label in enumerate(label_encoder.inverse_transform(model.classes_))}
+    failures = 0
+    exact_order = 0
+    max_error = 0.0
+    for row in range(X.shape[0]):
+        expected = np.array([all_probs[row, column[label]] for label in labels[row]])
+        max_error = max(max_error, float(np.max(np.abs(expected - probs[row]))))
+        values_match = np.allclose(probs[row], expected, rtol=RTOL, atol=ATOL)
+        # Any other category may only beat the k-th pick by rounding noise
+        kth = probs[row, -1]
+        others = np.delete(all_probs[row], [column[label] for label in labels[row]])
+        none_missed = others.size == 0 or others.max() <= kth * (1 + RTOL) + ATOL
+        if not (values_match and none_missed):
+            failures += 1
+        if list(labels[row]) == list(reference_labels[row]):
+            exact_order += 1
+    return {
+        "rows": X.shape[0],
+        "failures": failures,
+        "same_order_as_argsort": exact_order,
+        "max_abs_prob_error": max_error,
+    }
+
+
+def _timings(func, inputs, repeat):
+    samples = []
+    for _ in range(repeat):
+        for item in inputs:
+            started = time.perf_counter()
+            func(item)
+            samples.append(time.perf_counter() - started)
+    samples.sort()
+    us = lambda value: round(value * 1e6, 2)
+    return {
+        "mean_us": us(sum(samples) / len(samples)),
+        "p50_us": us(samples[len(samples) // 2]),
+        "p99_us": us(samples[min(len(samples) - 1, int(len(samples) * 0.99))]),
+    }
+
+
+def benchmark(model, label_encoder, scorer, X, k, batch_size, repeat):
+    singles = [X[i] for i in range(X.shape[0])]
+    batches = [X[i:i + batch_size] for i in range(0, X.shape[0], batch_size)]
+    results = {}
+    for name, inputs in (("single", singles), (f"batch{batch_size}", batches)):
+        results[name] = {
+            "sklearn": _timings(lambda x: sklearn_top_k(model, label_encoder, x, k), inputs, repeat),
+            "kernel": _timings(lambda x: scorer.top_k(scorer.logits(x), k), inputs, repeat),
+        }
+        results[name]["speedup_p50"] = round(
+            results[name]["sklearn"]["p50_us"] / results[name]["kernel"]["p50_us"], 2)
+    return results
+
+
+def run(workspace, profiles, skills, k, batch_size, repeat):
+    with working_directory(workspace):
+        _, model, tfidf, label_encoder = load_artifacts()
+    scorer = TopKScorer.from_model(model, label_encoder)
+
+    texts = [profile_text(p["education"], p["interests"], p["skills"])
+             for p in synthetic_profiles(profiles, skill_vocabulary(skills))]
+    X = tfidf.transform(texts)
+
+    result = {
+        "timestamp": time.strftime("%Y-%m-%d %H:%M:%S"),
+        "workspace": workspace,
+        "classes": int(len(model.classes_)),
+        "features": int(model.coef_.shape[1]),
+        "k": k,
+        "parity": check_parity(model, label_encoder, scorer, X, k),
+        "latency": benchmark(model, label_encoder, scorer, X, k, batch_size, repeat),
+    }
+    print(json.dumps(result, indent=2))
+
+    os.makedirs(os.path.dirname(RESULTS_FILE), exist_ok=True)
+    with open(RESULTS_FILE, "a") as f:
+        f.write(json.dumps(result) + "\n")
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Top-k kernel parity and latency")
+    parser.add_argument("--workspace", help="directory with trained ml_models/ artifacts (default: synthetic)")
+    parser.add_argument("--jobs", type=int, default=1500)
+    parser.add_argument("--titles", type=int, default=100)
+    parser.add_argument("--skills", type=int, default=200)
+    parser.add_argument("--profiles", type=int, default=500)
+    parser.add_argument("--k", type=int, default=5)
+    parser.add_argument("--batch-size", type=int, default=32)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    workspace = args.workspace or build_workspace(jobs=args.jobs, titles=args.titles, skills=args.skills)
+    result = run(os.path.abspath(workspace), args.profiles, args.skills, args.k, args.batch_size, args.repeat)
+    if result["parity"]["failures"]:
+        print(f"Parity FAILED for {result['parity']['failures']} profiles")
+        sys.exit(1)
+    print("Parity OK")
+
+
+if __name__ == "__main__":
+    main()
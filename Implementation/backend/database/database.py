@@ -1,6 +1,24 @@
 import sqlite3
+import math
 import pandas as pd
 import os
+from database.seen_set import SeenSet
+from database.title_canonicalizer import canonical_title, backfill_canonical_titles, OTHER_TITLE
+
+def _sample_key(seed, job_id, age_days, half_life_days):
+    """
+    Weighted-reservoir key (exponential race): the rows with the smallest
+    keys are a weighted sample without replacement. A posting's weight
+    halves every half_life_days, so recent postings are drawn more often.
+    Kept as log(-log(u)) + log(1/weight) so old rows don't overflow.
+    """
+    # splitmix64 of (seed, id): the same sample for the same table and seed
+    x = (seed * 0x9E3779B97F4A7C15 + job_id) & 0xFFFFFFFFFFFFFFFF
+    x = ((x ^ (x >> 30)) * 0xBF58476D1CE4E5B9) & 0xFFFFFFFFFFFFFFFF
+    x = ((x ^ (x >> 27)) * 0x94D049BB133111EB) & 0xFFFFFFFFFFFFFFFF
+    u = ((x ^ (x >> 31)) >> 11) / float(1 << 53)
+    return math.log(-math.log(max(u, 1e-300))) + max(age_days or 0.0, 0.0) * math.log(2) / half_life_days
+
 
 class PathfinderDatabase:
     def __init__(self, db_path="pathfinder_db.sqlite"):
@@ -25,9 +43,14 @@ class PathfinderDatabase:
         CREATE TABLE IF NOT EXISTS jobs (
             id INTEGER PRIMARY KEY AUTOINCREMENT,
             job_title TEXT NOT NULL,
+            canonical_title TEXT,
             company TEXT,
             description TEXT,
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            link TEXT,
+            location TEXT,
+            salary TEXT,
+            job_type TEXT
         );
         """
 
@@ -46,48 +69,82 @@ class PathfinderDatabase:
 
         cursor.execute(create_jobs_table)
         cursor.execute(create_courses_table)
+        self._migrate_jobs_table(cursor)
+
+        # Seen-set lookups for incremental crawling
+        cursor.execute("CREATE UNIQUE INDEX IF NOT EXISTS idx_jobs_link ON jobs(link)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_courses_url ON courses(url)")
+        # Training labels and recommendation lookups go by canonical title
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_jobs_canonical_title ON jobs(canonical_title)")
         self.connection.commit()
         cursor.close()
         print("Tables ready")
 
+    def _migrate_jobs_table(self, cursor):
+        """Add posting columns to databases created before they existed"""
+        existing = {row[1] for row in cursor.execute("PRAGMA table_info(jobs)")}
+        for column in ("link", "location", "salary", "job_type"):
+            if column not in existing:
+                cursor.execute(f"ALTER TABLE jobs ADD COLUMN {column} TEXT")
+        if "canonical_title" not in existing:
+            cursor.execute("ALTER TABLE jobs ADD COLUMN canonical_title TEXT")
+            backfill_canonical_titles(self.connection)
+
+    # Compact seen-set of stored links/URLs, e.g. seen_set("jobs", "link")
+    def seen_set(self, table, column):
+        return SeenSet(self.db_path, table, column)
+
     # Save Jobs
-    def save_jobs(self, jobs):
+    def save_jobs(self, jobs, commit=True):
         if not jobs:
             print("No jobs to save.")
             return 0
 
         cursor = self.connection.cursor()
+        # Postings already stored under the same link are skipped
         insert_sql = """
-            INSERT INTO jobs (job_title, company, description)
-            VALUES (?, ?, ?)
+            INSERT OR IGNORE INTO jobs (job_title, canonical_title, company, description, link, location, salary, job_type)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
         """
         saved_count = 0
 
         for job in jobs:
+            link = job.get('link')
+            if not link or not link.startswith('http'):
+                link = None
             try:
                 cursor.execute(insert_sql, (
                     job.get('title'),
+                    job.get('canonical_title') or canonical_title(job.get('title')),
                     job.get('company'),
-                    job.get('description')
+                    job.get('description'),
+                    link,
+                    job.get('location'),
+                    job.get('salary'),
+                    job.get('job_type')
                 ))
-                saved_count += 1
+                saved_count += cursor.rowcount
             except Exception as e:
                 print(f"Insert error: {e}")
 
-        self.connection.commit()
+        # Batch writers pass commit=False and commit once per batch
+        if commit:
+            self.connection.commit()
         cursor.close()
         return saved_count
 
     # Save Courses
-    def save_courses(self, courses):
+    def save_courses(self, courses, commit=True):
         if not courses:
             print("No courses to save.")
             return 0
 
         cursor = self.connection.cursor()
+        # Courses already stored under the same URL are skipped
         insert_sql = """
             INSERT INTO courses (course_title, organization, skills, url, rating)
-            VALUES (?, ?, ?, ?, ?)
+            SELECT ?, ?, ?, ?, ?
+            WHERE ? IS NULL OR NOT EXISTS (SELECT 1 FROM courses WHERE url = ?)
         """
         saved_count = 0
 
@@ -98,13 +155,17 @@ class PathfinderDatabase:
                     course.get('organization'),
                     course.get('skills'),
                     course.get('url'),
-                    course.get('rating')
+                    course.get('rating'),
+                    course.get('url'),
+                    course.get('url')
                 ))
-                saved_count += 1
+                saved_count += cursor.rowcount
             except Exception as e:
                 print(f"Insert error: {e}")
 
-        self.connection.commit()
+        # Batch writers pass commit=False and commit once per batch
+        if commit:
+            self.connection.commit()
         cursor.close()
         return saved_count
 
@@ -128,7 +189,9 @@ class PathfinderDatabase:
 
         query = """
             SELECT 
+                id,
                 job_title,
+                canonical_title,
                 description
             FROM jobs
             WHERE description IS NOT NULL 
@@ -142,6 +205,62 @@ class PathfinderDatabase:
             print(f"Error loading jobs for training: {e}")
             return pd.DataFrame()
         
+        # Stratified, recency-weighted training sample: at most per_class rows per canonical title.
+        # Postings that match no taxonomy title (OTHER_TITLE) are not a job category and are left out
+    def fetch_training_sample(self, per_class, half_life_days=180.0, seed=42):
+        self.connection.create_function(
+            "sample_key", 2, lambda job_id, age: _sample_key(seed, job_id, age, half_life_days),
+            deterministic=True)
+        # Rank ids only, so the sort doesn't carry descriptions; then fetch the winners
+        query = """
+            SELECT j.id, j.job_title, j.canonical_title, j.description
+            FROM jobs j JOIN (
+                SELECT id FROM (
+                    SELECT id, ROW_NUMBER() OVER (
+                        PARTITION BY canonical_title
+                        ORDER BY sample_key(id, julianday('now') - julianday(created_at))
+                    ) AS rank
+                    FROM jobs
+                    WHERE description IS NOT NULL AND canonical_title IS NOT NULL AND canonical_title != ?
+                ) WHERE rank <= ?
+            ) sample ON sample.id = j.id
+            ORDER BY j.id
+        """
+
+        try:
+            df = pd.read_sql_query(query, self.connection, params=(OTHER_TITLE, per_class))
+            return df
+        except Exception as e:
+            print(f"Error sampling jobs for training: {e}")
+            return pd.DataFrame()
+
+        # Stream (id, description) of every posting in chunks, e.g. for the posting index
+    def iter_job_descriptions(self, chunk_size=2000):
+        cursor = self.connection.execute("""
+            SELECT id, description FROM jobs
+            WHERE description IS NOT NULL AND job_title IS NOT NULL
+            ORDER BY id
+        """)
+        while True:
+            rows = cursor.fetchmany(chunk_size)
+            if not rows:
+                break
+            yield rows
+        cursor.close()
+
+        # Fetch postings by id, e.g. for the /similar results
+    def fetch_jobs_by_ids(self, ids):
+        if not ids:
+            return []
+        placeholders = ", ".join("?" for _ in ids)
+        cursor = self.connection.execute(f"""
+            SELECT id, job_title, company, location, salary, job_type, link
+            FROM jobs WHERE id IN ({placeholders})
+        """, list(ids))
+        columns = [column[0] for column in cursor.description]
+        rows = {row[0]: dict(zip(columns, row)) for row in cursor.fetchall()}
+        return [rows[job_id] for job_id in ids if job_id in rows]
+
         # Fetch courses for model training or recommendation
     def fetch_courses(self):
         cursor = self.connection.cursor()
@@ -0,0 +1,25 @@
+# Job title taxonomy: what the scraper searches for and what postings are canonicalized to
+COMMON_JOB_TITLES = [ 
+    # Technology & IT 
+    "Software Engineer", "Data Scientist", "Frontend Developer", "Backend Developer", "Full Stack Developer", "DevOps Engineer", "Mobile App Developer", "Web Developer", "Cloud Engineer", "Machine Learning Engineer", "IT Support Specialist", "Network Administrator", "Database Administrator", "Cybersecurity Analyst", "Systems Analyst", "Data Analyst", "Business Intelligence Analyst", "UI UX Designer", "Game Developer", "Product Manager", 
+    
+    # Business, Management & Finance 
+    "Project Manager", "Business Analyst", "Operations Manager", "Account Manager", "Financial Analyst", "Accountant", "Bookkeeper", "Auditor", "Payroll Specialist", "Risk Analyst", "Investment Analyst", "Budget Analyst", "Compliance Officer", "Business Development Manager", "Procurement Specialist", "Office Administrator", "Administrative Assistant", "Executive Assistant", "Human Resources Manager", "Recruiter", 
+    
+    # Healthcare & Medical 
+    "Registered Nurse", "Licensed Practical Nurse", "Medical Assistant", "Pharmacy Technician", "Dental Assistant", "Dental Hygienist", "Physiotherapist", "Occupational Therapist", "Pharmacist", "Medical Receptionist", "Healthcare Administrator", "Medical Laboratory Technician", "Caregiver", "Personal Support Worker", "Medical Office Assistant", "Home Health Aide", "Dietitian", "Mental Health Counselor", "Psychologist", "Medical Billing Specialist", 
+    
+    # Skilled Trades & Construction 
+    "Electrician", "Plumber", "Carpenter", "Welder", "HVAC Technician", "Construction Laborer", "Construction Manager", "Painter", "Mechanic", "Maintenance Technician", "Millwright", "Heavy Equipment Operator", "Roofer", "Sheet Metal Worker", "General Labourer", "Assembler", "Fabricator", "Forklift Operator", "Quality Inspector", "Machinist", 
+    
+    # Logistics, Retail & Customer Service 
+    "Truck Driver", "Delivery Driver", "Warehouse Associate", "Inventory Clerk", "Forklift Driver", "Logistics Coordinator", "Dispatcher", "Supply Chain Analyst", "Customer Service Representative", "Sales Associate", "Store Manager", "Retail Supervisor", "Merchandiser", "Cashier", "Order Picker", "Package Handler", "Shipping Coordinator", "Stock Clerk", "E-commerce Specialist", "Call Center Agent", 
+    
+    # Education & Training 
+    "Teacher", "Teaching Assistant", "Substitute Teacher", "Professor", "Tutor", "Academic Advisor", "School Administrator", "Education Coordinator", "Instructional Designer", "Librarian", 
+    
+    # Hospitality, Tourism & Services 
+    "Chef", "Cook", "Server", "Bartender", "Barista", "Dishwasher", "Hotel Front Desk Agent", "Housekeeper", "Event Coordinator", "Travel Consultant", "Flight Attendant", "Tour Guide", "Concierge", "Host Hostess", 
+    
+    # Creative, Media & Marketing 
+    "Marketing Specialist", "Digital Marketing Manager", "Content Writer", "Copywriter", "Graphic Designer", "Video Editor", "Photographer", "Social Media Manager", "Public Relations Specialist", "Brand Manager" ]
@@ -0,0 +1,75 @@
+import hashlib
+import math
+import sqlite3
+import threading
+
+
+class BloomFilter:
+    """Fixed-size Bloom filter over strings (double hashing on one blake2b digest)"""
+
+    def __init__(self, capacity=100000, error_rate=0.01):
+        capacity = max(1, capacity)
+        self.size = max(8, int(-capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        self.hash_count = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, value):
+        digest = hashlib.blake2b(value.encode("utf-8"), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        return [(h1 + i * h2) % self.size for i in range(self.hash_count)]
+
+    def add(self, value):
+        for pos in self._positions(value):
+            self.bits[pos >> 3] |= 1 << (pos & 7)
+
+    def __contains__(self, value):
+        return all(self.bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(value))
+
+
+class SeenSet:
+    """
+    Set of already-stored values (posting links, course URLs).
+
+    Membership is answered by an in-memory Bloom filter; the rare positive
+    is confirmed against the indexed column, so there are no false positives.
+    Safe to share between scraper threads.
+    """
+
+    def __init__(self, db_path, table, column, error_rate=0.01):
+        self.table = table
+        self.column = column
+        self._lock = threading.Lock()
+        self._pending = set()   # added during this run, not stored yet
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+
+        count = self._conn.execute(
+            f"SELECT COUNT(*) FROM {table} WHERE {column} IS NOT NULL"
+        ).fetchone()[0]
+        # Leave room for growth before the false positive rate degrades
+        self._bloom = BloomFilter(capacity=max(10000, count * 2), error_rate=error_rate)
+
+        cursor = self._conn.execute(f"SELECT {column} FROM {table} WHERE {column} IS NOT NULL")
+        for (value,) in cursor:
+            self._bloom.add(value)
+
+    def add(self, value):
+        with self._lock:
+            self._bloom.add(value)
+            self._pending.add(value)
+
+    def __contains__(self, value):
+        if not value:
+            return False
+        with self._lock:
+            if value not in self._bloom:
+                return False
+            if value in self._pending:
+                return True
+            row = self._conn.execute(
+                f"SELECT 1 FROM {self.table} WHERE {self.column} = ? LIMIT 1", (value,)
+            ).fetchone()
+            return row is not None
+
+    def close(self):
+        self._conn.close()
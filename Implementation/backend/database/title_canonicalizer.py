@@ -0,0 +1,206 @@
+import re
+import unicodedata
+from database.job_titles import COMMON_JOB_TITLES
+
+# Label for postings that match no taxonomy title well enough
+OTHER_TITLE = "Other"
+# Lowest match score that still maps a posting onto a taxonomy title
+MIN_SCORE = 0.55
+
+# Seniority, contract and filler words that don't change what the job is
+NOISE_WORDS = {
+    "senior", "sr", "junior", "jr", "intermediate", "mid", "level", "lead", "staff", "principal",
+    "i", "ii", "iii", "iv", "1", "2", "3", "4", "remote", "hybrid", "onsite", "contract", "temporary",
+    "temp", "permanent", "full", "part", "time", "fulltime", "parttime", "co", "op", "coop", "new",
+    "and", "of", "the", "for", "in", "with", "to", "at", "a", "an",
+    "de", "du", "des", "la", "le", "les", "et", "en", "e",
+}
+# Spellings mapped onto one token, applied to taxonomy and postings alike
+SYNONYMS = {
+    "developer": "engineer", "programmer": "engineer", "dev": "engineer",
+    "laborer": "labourer", "fullstack": "full stack", "hr": "human resources",
+    "ml": "machine learning", "rn": "registered nurse", "lpn": "licensed practical nurse",
+    "psw": "personal support worker", "csr": "customer service representative",
+    "admin": "administrator", "mgr": "manager", "assoc": "associate",
+    # French postings (Montreal, Quebec)
+    "developpeur": "engineer", "developpeuse": "engineer", "programmeur": "engineer",
+    "ingenieur": "engineer", "ingenieure": "engineer", "infirmier": "nurse", "infirmiere": "nurse",
+    "analyste": "analyst", "gestionnaire": "manager", "administrateur": "administrator",
+    "administratrice": "administrator", "chauffeur": "driver", "commis": "clerk",
+    "adjoint": "assistant", "adjointe": "assistant", "concepteur": "designer", "conceptrice": "designer",
+    "logiciel": "software", "logiciels": "software", "donnees": "data", "camion": "truck",
+    # Inflections of the job word: "Software Engineering", "Program Management"
+    "engineering": "engineer", "management": "manager", "administration": "administrator",
+}
+# Languages and frameworks; "Java Developer" is a software developer. Only
+# used when a title matched nothing as written, so "Java Full Stack
+# Developer" still goes to Full Stack Developer
+TECH_WORDS = {
+    "java", "javascript", "typescript", "python", "golang", "go", "ruby", "rails", "php", "cplusplus",
+    "csharp", "dotnet", "sql", "plsql", "angular", "react", "vue", "node", "nodejs", "embedded", "api",
+}
+# IT roles that are the same job under another name: "Network Engineer" is
+# a Network Administrator, "Software Architect" a Software Engineer. Like
+# TECH_WORDS, only used when a title matched nothing otherwise
+ROLE_FAMILY = {"administrator": "engineer", "architect": "engineer"}
+# A title that is nothing but a job word ("Nurse", "Développeur"), after
+# normalization, and the taxonomy title it stands for
+BARE_TITLES = {
+    "nurse": "Registered Nurse", "engineer": "Software Engineer", "driver": "Truck Driver",
+    "designer": "Graphic Designer", "labourer": "General Labourer", "assistant": "Administrative Assistant",
+}
+# Multi-word spellings, replaced before tokenizing
+PHRASES = [
+    (r"front[\s-]+end", "frontend"), (r"back[\s-]+end", "backend"), (r"full[\s-]+stack", "full stack"),
+    (r"dev[\s-]*ops", "devops"), (r"e[\s-]+commerce", "ecommerce"), (r"co[\s-]+op", "coop"),
+    (r"ui\s*/\s*ux", "ui ux"), (r"c\+\+", "cplusplus"), (r"c#", "csharp"), (r"\.net", "dotnet"),
+]
+# Where a raw title is split into alternatives, e.g. "Developer / Développeur", "Engineer - Canada",
+# "Engineer- Canada"; a dash with no space on either side ("Full-Stack") is part of a word
+PART_SEPARATORS = r"\s+[-–—|/:]\s*|\s*[-–—|/:]\s+|,"
+
+
+def _strip_accents(text):
+    return "".join(c for c in unicodedata.normalize("NFKD", text) if not unicodedata.combining(c))
+
+
+def title_tokens(title, tech=False, family=False):
+    """Lowercase, accent-free content tokens of a title, synonyms applied"""
+    text = _strip_accents(title).lower().replace("&", " and ")
+    # Drop parentheticals and bracketed codes: "(Contract)", "[EAG250619]"
+    text = re.sub(r"\([^)]*\)|\[[^\]]*\]", " ", text)
+    for pattern, replacement in PHRASES:
+        text = re.sub(pattern, replacement, text)
+    tokens = []
+    for token in re.findall(r"[a-z0-9]+", text):
+        if token in NOISE_WORDS:
+            continue
+        if tech and token in TECH_WORDS:
+            token = "software"
+        for token in SYNONYMS.get(token, token).split():
+            if family:
+                token = ROLE_FAMILY.get(token, token)
+            if not tokens or tokens[-1] != token:
+                tokens.append(token)
+    return tokens
+
+
+def _same_token(a, b):
+    # Singular and plural: "Operations Manager" / "Operation"
+    return a == b or a + "s" == b or b + "s" == a
+
+
+class TitleCanonicalizer:
+    """
+    Maps raw scraped job titles onto the COMMON_JOB_TITLES taxonomy.
+
+    Titles are split into alternatives at separators ("Senior C++ Developer
+    - Permanent", "Full Stack Developer / Développeur Full Stack"); each one
+    is normalized to content tokens and scored against every taxonomy
+    title by token coverage and Dice overlap. A taxonomy title's last token
+    is the job itself (engineer, nurse, driver): it counts double in the
+    coverage, and a title that doesn't contain it scores half. Word order
+    and trailing qualifiers don't matter, so "Développeur Full Stack" and
+    "Truck Driver AZ" match. The job word alone is not a match ("Mechanical
+    Engineer" is not a Software Engineer, "SQL Server Developer" not a
+    Server), except for a one-word taxonomy title that is also the title's
+    own job word ("Line Cook"); bare job words go through BARE_TITLES.
+
+    Titles that match nothing as written are retried with languages read
+    as "software" (TECH_WORDS), then with related IT roles merged
+    (ROLE_FAMILY). The best title at or above min_score wins; anything else
+    goes to OTHER_TITLE, which training and recommendations leave out.
+    """
+
+    # (tech, family) normalization passes, in order
+    PASSES = ((False, False), (True, False), (True, True))
+
+    def __init__(self, taxonomy=COMMON_JOB_TITLES, min_score=MIN_SCORE):
+        self.min_score = min_score
+        self.taxonomy = {
+            flags: [(title, title_tokens(title, *flags)) for title in taxonomy] for flags in self.PASSES
+        }
+        self._cache = {}
+
+    def _score(self, tokens, target):
+        if not tokens or not target:
+            return 0.0
+        found = [any(_same_token(t, token) for token in tokens) for t in target]
+        matched = sum(found)
+        if matched == 1 and found[-1] and (len(target) > 1 or not _same_token(tokens[-1], target[-1])):
+            return 0.0
+        coverage = (matched + found[-1]) / (len(target) + 1)
+        dice = 2 * matched / (len(tokens) + len(target))
+        score = 0.6 * coverage + 0.4 * dice
+        if not found[-1]:
+            score *= 0.5
+        return score
+
+    def _best(self, parts, flags):
+        best, best_score = OTHER_TITLE, 0.0
+        for part in parts:
+            tokens = title_tokens(part, *flags)
+            if len(tokens) == 1 and tokens[0] in BARE_TITLES:
+                return BARE_TITLES[tokens[0]], 1.0
+            for title, target in self.taxonomy[flags]:
+                score = self._score(tokens, target)
+                # Ties keep the earlier (more general) taxonomy title
+                if score > best_score:
+                    best, best_score = title, score
+        return best, best_score
+
+    def match(self, raw_title):
+        """(canonical title, score)"""
+        if not raw_title:
+            return OTHER_TITLE, 0.0
+        parts = [raw_title] + re.split(PART_SEPARATORS, raw_title)
+        best_score = 0.0
+        for flags in self.PASSES:
+            best, score = self._best(parts, flags)
+            if score >= self.min_score:
+                return best, score
+            best_score = max(best_score, score)
+        return OTHER_TITLE, best_score
+
+    def canonical(self, raw_title):
+        result = self._cache.get(raw_title)
+        if result is None:
+            result = self.match(raw_title)[0]
+            if len(self._cache) < 100000:
+                self._cache[raw_title] = result
+        return result
+
+
+_default = None
+
+
+def canonical_title(raw_title):
+    """Canonical title with the default taxonomy"""
+    global _default
+    if _default is None:
+        _default = TitleCanonicalizer()
+    return _default.canonical(raw_title)
+
+
+def backfill_canonical_titles(connection, recompute=False):
+    """
+    Fill jobs.canonical_title for rows stored without one; with recompute,
+    re-match every title (after the matcher or taxonomy changed) and
+    rewrite only the rows whose canonical title changes. Returns how many
+    rows were updated.
+    """
+    if recompute:
+        rows = connection.execute("SELECT DISTINCT job_title FROM jobs").fetchall()
+        sql = "UPDATE jobs SET canonical_title = ? WHERE job_title IS ? AND canonical_title IS NOT ?"
+        params = [(canonical_title(title), title, canonical_title(title)) for (title,) in rows]
+    else:
+        rows = connection.execute("SELECT DISTINCT job_title FROM jobs WHERE canonical_title IS NULL").fetchall()
+        sql = "UPDATE jobs SET canonical_title = ? WHERE job_title IS ? AND canonical_title IS NULL"
+        params = [(canonical_title(title), title) for (title,) in rows]
+    if not rows:
+        return 0
+    cursor = connection.executemany(sql, params)
+    connection.commit()
+    if cursor.rowcount:
+        print(f"Canonicalized job titles for {cursor.rowcount} postings")
+    return cursor.rowcount
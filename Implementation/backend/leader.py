@@ -0,0 +1,80 @@
+# leader.py
+import os
+import socket
+import sqlite3
+import time
+
+
+class LeaderLease:
+    """
+    Leader election through a lease row in SQLite.
+
+    Whoever holds an unexpired lease is the leader and must renew() it more
+    often than `ttl`; if the leader dies or hangs, the lease expires and the
+    next acquire() from a standby process takes over (failover).
+    """
+
+    def __init__(self, name, db_path, owner=None, ttl=30.0):
+        self.name = name
+        self.db_path = db_path
+        self.owner = owner or f"{socket.gethostname()}:{os.getpid()}"
+        self.ttl = ttl
+        self.connection = sqlite3.connect(db_path, timeout=10, check_same_thread=False)
+        self.connection.execute("""
+            CREATE TABLE IF NOT EXISTS leader_leases (
+                name TEXT PRIMARY KEY,
+                owner TEXT NOT NULL,
+                acquired_at REAL NOT NULL,
+                expires_at REAL NOT NULL
+            );
+        """)
+        self.connection.commit()
+
+    def acquire(self):
+        """Become leader if the lease is free, expired or already ours"""
+        now = time.time()
+        try:
+            cursor = self.connection.execute("""
+                INSERT INTO leader_leases (name, owner, acquired_at, expires_at) VALUES (?, ?, ?, ?)
+                ON CONFLICT(name) DO UPDATE SET
+                    owner = excluded.owner,
+                    acquired_at = CASE WHEN leader_leases.owner = excluded.owner
+                                       THEN leader_leases.acquired_at ELSE excluded.acquired_at END,
+                    expires_at = excluded.expires_at
+                WHERE leader_leases.expires_at < ? OR leader_leases.owner = excluded.owner
+            """, (self.name, self.owner, now, now + self.ttl, now))
+            self.connection.commit()
+            return cursor.rowcount == 1
+        except sqlite3.OperationalError as e:
+            # Database busy/locked: try again on the next heartbeat
+            print(f"Lease acquire failed: {e}")
+            return False
+
+    def renew(self):
+        """Heartbeat; False means the lease was lost and leadership must stop"""
+        now = time.time()
+        try:
+            cursor = self.connection.execute(
+                "UPDATE leader_leases SET expires_at = ? WHERE name = ? AND owner = ? AND expires_at >= ?",
+                (now + self.ttl, self.name, self.owner, now)
+            )
+            self.connection.commit()
+            return cursor.rowcount == 1
+        except sqlite3.OperationalError as e:
+            print(f"Lease renew failed: {e}")
+            return False
+
+    def release(self):
+        try:
+            self.connection.execute(
+                "DELETE FROM leader_leases WHERE name = ? AND owner = ?", (self.name, self.owner)
+            )
+            self.connection.commit()
+        except sqlite3.Error as e:
+            print(f"Lease release failed: {e}")
+
+    def current_leader(self):
+        row = self.connection.execute(
+            "SELECT owner FROM leader_leases WHERE name = ? AND expires_at >= ?", (self.name, time.time())
+        ).fetchone()
+        return row[0] if row else None
@@ -1,120 +1,92 @@
 # main.py
-import schedule
-import time
+# Serves requests only; scraping and training run in scheduler.py
+import os
 import threading
-from database.database import PathfinderDatabase
-from scraper.indeed_scraper import IndeedScraper
-from scraper.coursera_scraper import CourseraScraper
-from itertools import cycle
-from ml_models.job_model import train_model
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Query
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import PlainTextResponse
 from pydantic import BaseModel, Field
-import joblib
-from ml_models.preprocess import preprocess_input
+from ml_models.dispatcher import InferenceDispatcher, InferenceUnavailable
+from ml_models.preprocess import profile_text
 from ml_models.personality_model import *
-from ml_models.recommend import recommend_courses_for_job
+from ml_models.recommend import recommend_courses_for_jobs, ensure_snapshot
 from fastapi.middleware.cors import CORSMiddleware
-
-COMMON_JOB_TITLES = [ 
-    # Technology & IT 
-    "Software Engineer", "Data Scientist", "Frontend Developer", "Backend Developer", "Full Stack Developer", "DevOps Engineer", "Mobile App Developer", "Web Developer", "Cloud Engineer", "Machine Learning Engineer", "IT Support Specialist", "Network Administrator", "Database Administrator", "Cybersecurity Analyst", "Systems Analyst", "Data Analyst", "Business Intelligence Analyst", "UI UX Designer", "Game Developer", "Product Manager", 
-    
-    # Business, Management & Finance 
-    "Project Manager", "Business Analyst", "Operations Manager", "Account Manager", "Financial Analyst", "Accountant", "Bookkeeper", "Auditor", "Payroll Specialist", "Risk Analyst", "Investment Analyst", "Budget Analyst", "Compliance Officer", "Business Development Manager", "Procurement Specialist", "Office Administrator", "Administrative Assistant", "Executive Assistant", "Human Resources Manager", "Recruiter", 
-    
-    # Healthcare & Medical 
-    "Registered Nurse", "Licensed Practical Nurse", "Medical Assistant", "Pharmacy Technician", "Dental Assistant", "Dental Hygienist", "Physiotherapist", "Occupational Therapist", "Pharmacist", "Medical Receptionist", "Healthcare Administrator", "Medical Laboratory Technician", "Caregiver", "Personal Support Worker", "Medical Office Assistant", "Home Health Aide", "Dietitian", "Mental Health Counselor", "Psychologist", "Medical Billing Specialist", 
-    
-    # Skilled Trades & Construction 
-    "Electrician", "Plumber", "Carpenter", "Welder", "HVAC Technician", "Construction Laborer", "Construction Manager", "Painter", "Mechanic", "Maintenance Technician", "Millwright", "Heavy Equipment Operator", "Roofer", "Sheet Metal Worker", "General Labourer", "Assembler", "Fabricator", "Forklift Operator", "Quality Inspector", "Machinist", 
-    
-    # Logistics, Retail & Customer Service 
-    "Truck Driver", "Delivery Driver", "Warehouse Associate", "Inventory Clerk", "Forklift Driver", "Logistics Coordinator", "Dispatcher", "Supply Chain Analyst", "Customer Service Representative", "Sales Associate", "Store Manager", "Retail Supervisor", "Merchandiser", "Cashier", "Order Picker", "Package Handler", "Shipping Coordinator", "Stock Clerk", "E-commerce Specialist", "Call Center Agent", 
-    
-    # Education & Training 
-    "Teacher", "Teaching Assistant", "Substitute Teacher", "Professor", "Tutor", "Academic Advisor", "School Administrator", "Education Coordinator", "Instructional Designer", "Librarian", 
-    
-    # Hospitality, Tourism & Services 
-    "Chef", "Cook", "Server", "Bartender", "Barista", "Dishwasher", "Hotel Front Desk Agent", "Housekeeper", "Event Coordinator", "Travel Consultant", "Flight Attendant", "Tour Guide", "Concierge", "Host Hostess", 
-    
-    # Creative, Media & Marketing 
-    "Marketing Specialist", "Digital Marketing Manager", "Content Writer", "Copywriter", "Graphic Designer", "Video Editor", "Photographer", "Social Media Manager", "Public Relations Specialist", "Brand Manager" ]
-
-job_cycle = cycle(COMMON_JOB_TITLES)
-
-# Main hourly scraping job
-def run_hourly_scraper():
-    db = PathfinderDatabase("pathfinder_db.sqlite")
-    db.connect()
-
-    scraper = IndeedScraper(headless=True)
-
-    job_title = next(job_cycle)
-    print(f"Running scraper for: {job_title}")
-
-    jobs = scraper.scrape_jobs(job_title=job_title, location="Canada")
-
-    if jobs:
-        added = db.save_jobs(jobs)
-        print(f"Added {added} new jobs to database.")
-    else:
-        print("No jobs scraped.")
-
-    scraper.driver.quit()
-
-    course_scraper = CourseraScraper(headless=True)
-
-    courses = course_scraper.scrape_courses(query=job_title)
-
-    if courses:
-        added = db.save_courses(courses)
-        print(f"Added {added} new courses to database.")
-    else:
-        print("No courses scraped.")
-
-    course_scraper.driver.quit()
-
-model = None
-tfidf = None
-label_encoder = None
-
-def run_monthly_training():
-    global model, tfidf, label_encoder
-    print("Starting monthly model training...")
-    train_model()
-    print("model training completed successfully.")
-    model = joblib.load("./ml_models/saved_model.pkl")
-    tfidf = joblib.load("./ml_models/tfidf.pkl")
-    label_encoder = joblib.load("./ml_models/label_encoder.pkl")
-
-
-def start_scheduler():
-    import schedule
-    # schedule jobs
-
-    print("scheduler started")
-    schedule.every(1).hours.do(run_hourly_scraper)
-    schedule.every(30).days.do(run_monthly_training)
-
-    # optionally, run once immediately
-    run_hourly_scraper()
-    run_monthly_training()
-
-    while True:
-        schedule.run_pending()
-        time.sleep(10)
+from scheduler import Scheduler, DB_PATH
+import admission
+import metrics
+import profiling
+
+# Optional: every uvicorn worker starts a scheduler, the lease lets only one of them run jobs
+EMBEDDED_SCHEDULER = os.getenv("PATHFINDER_EMBEDDED_SCHEDULER") == "1"
+scheduler = None
+scheduler_thread = None
+
+REQUEST_SECONDS = metrics.Histogram(
+    "pathfinder_request_seconds", "End-to-end handler time", ("endpoint",))
+PREDICT_STAGE_SECONDS = metrics.Histogram(
+    "pathfinder_predict_stage_seconds",
+    "Time per /predict stage; model stages once per micro-batch, 'recommend' once per request",
+    ("stage",))
+PERSONALITY_SECONDS = metrics.Histogram(
+    "pathfinder_personality_inference_seconds", "OCEAN cluster inference time")
+PREDICT_TOP_CONFIDENCE = metrics.Histogram(
+    "pathfinder_predict_top_confidence", "Highest class probability per /predict",
+    buckets=(0.05, 0.1, 0.2, 0.3, 0.4, 0.5, 0.6, 0.7, 0.8, 0.9, 1.0))
+REQUEST_ERRORS = metrics.Counter(
+    "pathfinder_request_errors_total", "Requests that ended in an error response", ("endpoint", "status"))
+PREDICT_BATCH_SIZE = metrics.Histogram(
+    "pathfinder_predict_batch_size", "Profiles per micro-batch sent to the inference worker",
+    buckets=(1, 2, 4, 8, 16, 32, 64))
+PREDICT_QUEUE_WAIT = metrics.Histogram(
+    "pathfinder_predict_queue_wait_seconds", "Time a /predict profile waited for its micro-batch")
+metrics.JobRunCollector(DB_PATH)
+
+
+def observe_batch(size, timings):
+    PREDICT_BATCH_SIZE.observe(size)
+    for stage, seconds in timings.items():
+        PREDICT_STAGE_SECONDS.observe(seconds, stage=stage)
+
+
+# Job model inference runs micro-batched in a worker process, which loads the
+# artifacts and picks up retrained ones; training happens in scheduler.py
+dispatcher = InferenceDispatcher(
+    max_batch_size=int(os.getenv("PATHFINDER_BATCH_SIZE", "32")),
+    max_wait=float(os.getenv("PATHFINDER_BATCH_WAIT_MS", "5")) / 1000,
+    workers=int(os.getenv("PATHFINDER_INFERENCE_WORKERS", "1")),
+    on_batch=observe_batch,
+)
 
 
 app = FastAPI(title="Career Path Prediction API")
 
+# Sheds load with a fast 503 instead of queueing every request; see admission.py.
+# Added first so CORS headers also reach rejected requests.
+if admission.ENABLED:
+    # /predict's throughput comes from full micro-batches: start at one batch per
+    # inference worker and never go below one batch
+    predict_capacity = dispatcher.max_batch_size * dispatcher.workers
+    app.add_middleware(admission.AdmissionMiddleware, gates={
+        "/predict": admission.EndpointGate("predict", admission.AdaptiveLimit(
+            initial=predict_capacity, min_limit=max(2, dispatcher.max_batch_size),
+            max_limit=max(128, 4 * predict_capacity))),
+        "/similar": admission.EndpointGate("similar", admission.AdaptiveLimit(initial=4)),
+        "/personality": admission.EndpointGate("personality", admission.AdaptiveLimit(initial=16)),
+    })
+
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["*"],  
     allow_credentials=True,
     allow_methods=["*"],  
     allow_headers=["*"],
+    expose_headers=["Server-Timing", "X-Profile-File", "Retry-After"],
 )
 
+# Opt-in per-request Server-Timing / profiles; see profiling.py
+if profiling.ENABLED:
+    app.add_middleware(profiling.ProfilingMiddleware)
+
 class UserProfile(BaseModel):
     education: str
     gpa: float
@@ -164,14 +136,30 @@ class PredictResponse(BaseModel):
 
 
 @app.on_event("startup")
-def startup_event():
-    threading.Thread(target=start_scheduler, daemon=True).start()
+async def startup_event():
+    global scheduler, scheduler_thread
+    await dispatcher.start()
+    await run_in_threadpool(ensure_snapshot)
+    if EMBEDDED_SCHEDULER:
+        scheduler = Scheduler()
+        scheduler_thread = threading.Thread(target=scheduler.run_forever, name="scheduler", daemon=True)
+        scheduler_thread.start()
+
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    await dispatcher.close()
+    if scheduler is not None:
+        scheduler.stop()
+        # Let a leader release its lease so a standby takes over without waiting for the TTL
+        await run_in_threadpool(scheduler_thread.join, 15)
 
 
 # API endpoints
 
 
 @app.post("/personality", response_model=PredictResponse)
+@profiling.profiled("personality", REQUEST_SECONDS, endpoint="personality")
 def personality(input_data: OceanInput):
     """
     Endpoint 1: Predict from OCEAN scores.
@@ -188,18 +176,21 @@ def personality(input_data: OceanInput):
     }
     """
     try:
-        pred, proba = predict_cluster_from_ocean(
-            input_data.O,
-            input_data.C,
-            input_data.E,
-            input_data.A,
-            input_data.N,
-        )
+        with profiling.stage("predict_cluster_from_ocean", PERSONALITY_SECONDS):
+            pred, proba = predict_cluster_from_ocean(
+                input_data.O,
+                input_data.C,
+                input_data.E,
+                input_data.A,
+                input_data.N,
+            )
     except ValueError as ve:
         # Validation error on input values (400 Bad Request)
+        REQUEST_ERRORS.inc(endpoint="personality", status="400")
         raise HTTPException(status_code=400, detail=str(ve))
     except Exception as e:
         # Any unexpected error during prediction (500 Internal Server Error)
+        REQUEST_ERRORS.inc(endpoint="personality", status="500")
         raise HTTPException(status_code=500, detail=f"Prediction failed: {e}")
 
     # Convert probability vector to JSON-serializable dict
@@ -213,24 +204,57 @@ def personality(input_data: OceanInput):
     )
 
 @app.post("/predict")
-def predict_jobs(profile: UserProfile):
-    X_vec = preprocess_input(profile.education, profile.gpa, profile.interests, profile.skills)
-    probs = model.predict_proba(X_vec)[0]
+@profiling.profiled("predict_jobs", REQUEST_SECONDS, endpoint="predict")
+async def predict_jobs(profile: UserProfile):
+    try:
+        top, served = await dispatcher.predict(profile.education, profile.interests, profile.skills)
+    except InferenceUnavailable as e:
+        REQUEST_ERRORS.inc(endpoint="predict", status="503")
+        raise HTTPException(status_code=503, detail=f"Prediction temporarily unavailable: {e}")
+
+    PREDICT_QUEUE_WAIT.observe(served["queue_wait"])
+    PREDICT_TOP_CONFIDENCE.observe(top[0][1])
+    for stage in ("queue_wait", "vectorize", "predict_proba", "topk"):
+        profiling.record(stage, served[stage])
 
-    print("Raw prediction probabilities:", probs)
-    print("Top confidence score:", max(probs))
+    # Course matching is pandas work; keep it off the event loop
+    return await run_in_threadpool(build_predictions, top, profile.skills)
 
-    top_indices = probs.argsort()[-5:][::-1]
-    job_categories = label_encoder.inverse_transform(top_indices)
 
+@profiling.profiled("recommendations")
+def build_predictions(top, skills):
+    # All top-k categories in one pass over the course catalog
+    with profiling.stage("recommend_courses_for_jobs", PREDICT_STAGE_SECONDS, stage="recommend"):
+        recs = recommend_courses_for_jobs([category for category, _ in top], skills)
     response = []
-    for category in job_categories:
-        rec = recommend_courses_for_job(category, profile.skills)
+    for (category, confidence), rec in zip(top, recs):
         response.append({
             "job_category": category,
-            "confidence": float(probs[top_indices[list(job_categories).index(category)]]),
+            "confidence": confidence,
             "missing_skills": rec.get("missing_skills", []),  # default to empty list
             "recommended_courses": rec.get("recommended_courses", [])
         })
 
     return {"predictions": response}
+
+
+@app.post("/similar")
+@profiling.profiled("similar_postings", REQUEST_SECONDS, endpoint="similar")
+async def similar_postings(profile: UserProfile, k: int = Query(10, ge=1, le=50)):
+    """Scraped postings closest to the profile, from the ANN posting index"""
+    text = profile_text(profile.education, profile.interests, profile.skills)
+    try:
+        postings = await dispatcher.similar(text, k)
+    except InferenceUnavailable as e:
+        REQUEST_ERRORS.inc(endpoint="similar", status="503")
+        raise HTTPException(status_code=503, detail=f"Search temporarily unavailable: {e}")
+    if postings is None:
+        REQUEST_ERRORS.inc(endpoint="similar", status="503")
+        raise HTTPException(status_code=503, detail="Posting index has not been built yet")
+    return {"postings": postings}
+
+
+@app.get("/metrics", response_class=PlainTextResponse)
+def metrics_endpoint():
+    """Prometheus text format"""
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4")
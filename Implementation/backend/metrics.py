@@ -0,0 +1,234 @@
+# metrics.py
+"""
+Small in-process metrics (counters and histograms) rendered in the
+Prometheus text format by the API's /metrics endpoint.
+
+Observing a value is a lock plus a bisect, cheap enough for the request
+path. Each uvicorn worker keeps its own numbers; scrape every worker (or
+run one) when the API is scaled out. Scraping and training run in the
+scheduler's processes, so their metrics are read from job_runs instead.
+"""
+import bisect
+import json
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+
+# Seconds; covers sub-millisecond vectorizing up to multi-second recommendations
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+def _format_labels(labels):
+    labels = list(labels)
+    if not labels:
+        return ""
+    parts = []
+    for name, value in labels:
+        value = str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+        parts.append(f'{name}="{value}"')
+    return "{" + ",".join(parts) + "}"
+
+
+def _format_value(value):
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Registry:
+    def __init__(self):
+        self._metrics = []
+        self._lock = threading.Lock()
+
+    def register(self, metric):
+        with self._lock:
+            self._metrics.append(metric)
+        return metric
+
+    def render(self):
+        with self._lock:
+            metrics = list(self._metrics)
+        return "".join(metric.render() for metric in metrics)
+
+
+REGISTRY = Registry()
+
+
+class Counter:
+    def __init__(self, name, help, labelnames=(), registry=REGISTRY):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self._values = {}
+        self._lock = threading.Lock()
+        if registry is not None:
+            registry.register(self)
+
+    def inc(self, amount=1, **labels):
+        key = tuple(labels[name] for name in self.labelnames)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            items = sorted(self._values.items())
+        for key, value in items:
+            labels = _format_labels(zip(self.labelnames, key))
+            lines.append(f"{self.name}{labels} {_format_value(value)}")
+        return "\n".join(lines) + "\n"
+
+
+class Gauge(Counter):
+    def set(self, value, **labels):
+        key = tuple(labels[name] for name in self.labelnames)
+        with self._lock:
+            self._values[key] = value
+
+    def render(self):
+        return super().render().replace(f"# TYPE {self.name} counter", f"# TYPE {self.name} gauge", 1)
+
+
+class Histogram:
+    def __init__(self, name, help, labelnames=(), buckets=LATENCY_BUCKETS, registry=REGISTRY):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # label values -> [per-bucket counts (+Inf last), sum]
+        self._series = {}
+        self._lock = threading.Lock()
+        if registry is not None:
+            registry.register(self)
+
+    def observe(self, value, **labels):
+        key = tuple(labels[name] for name in self.labelnames)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = [[0] * (len(self.buckets) + 1), 0.0]
+            series[0][index] += 1
+            series[1] += value
+
+    @contextmanager
+    def time(self, **labels):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started, **labels)
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            items = sorted((key, (list(counts), total)) for key, (counts, total) in self._series.items())
+        for key, (counts, total) in items:
+            base = list(zip(self.labelnames, key))
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += count
+                labels = _format_labels(base + [("le", _format_value(float(bound)))])
+                lines.append(f"{self.name}_bucket{labels} {cumulative}")
+            lines.append(f"{self.name}_sum{_format_labels(base)} {_format_value(total)}")
+            lines.append(f"{self.name}_count{_format_labels(base)} {cumulative}")
+        return "\n".join(lines) + "\n"
+
+
+class JobRunCollector:
+    """
+    Scrape, ingest and training metrics built from the scheduler's job_runs
+    table, so they are the same whichever API worker answers.
+
+    job_runs only grows, so finished runs are folded into running totals
+    once and each render reads just the rows past a cursor. Runs are
+    inserted when they start and updated when they finish, so the cursor
+    stops at the oldest run still in progress and the runs already folded
+    above it are remembered until it moves past them.
+    """
+
+    # A run still marked running after this long belongs to a dead scheduler
+    ABANDONED_AFTER = 24 * 3600
+
+    def __init__(self, db_path, registry=REGISTRY):
+        self.db_path = db_path
+        self._cursor = 0
+        self._folded = set()
+        self._lock = threading.Lock()
+        self.runs = Counter("pathfinder_job_runs_total", "Finished scheduler runs", ("job", "status"), registry=None)
+        self.durations = Histogram("pathfinder_job_duration_seconds", "Scheduler run duration", ("job",),
+                                   buckets=(1, 5, 15, 30, 60, 120, 300, 600, 1200, 1800, 3600, 7200, 10800),
+                                   registry=None)
+        self.cards = Histogram("pathfinder_scrape_cards_per_run", "Cards scraped per hourly run", ("source",),
+                               buckets=(0, 10, 25, 50, 100, 250, 500, 1000, 2500), registry=None)
+        self.inserted = Counter("pathfinder_db_rows_inserted_total", "New rows written by the scraper", ("table",),
+                                registry=None)
+        self.insert_rate = Gauge("pathfinder_db_insert_rows_per_second",
+                                 "Rows written per second in the last scrape run", registry=None)
+        self.accuracy = Gauge("pathfinder_training_test_accuracy", "Test accuracy of the last training run",
+                              registry=None)
+        if registry is not None:
+            registry.register(self)
+
+    def _rows(self):
+        try:
+            connection = sqlite3.connect(self.db_path, timeout=5)
+            try:
+                return connection.execute(
+                    "SELECT id, job, status, started_at, finished_at, duration_seconds, detail "
+                    "FROM job_runs WHERE id > ? ORDER BY id",
+                    (self._cursor,)
+                ).fetchall()
+            finally:
+                connection.close()
+        except sqlite3.Error:
+            # No scheduler has run against this database yet
+            return []
+
+    def _fold(self, job, status, duration, detail):
+        self.runs.inc(job=job, status=status)
+        if status != "succeeded":
+            return
+        self.durations.observe(duration or 0.0, job=job)
+        try:
+            report = json.loads(detail) if detail else {}
+        except ValueError:
+            return
+        if not isinstance(report, dict):
+            return
+
+        if job == "hourly_scraper":
+            self.cards.observe(report.get("jobs", 0), source="jobs")
+            self.cards.observe(report.get("courses", 0), source="courses")
+            for table, added in report.get("inserted", {}).items():
+                self.inserted.inc(added, table=table)
+            elapsed = report.get("elapsed_seconds")
+            if elapsed:
+                self.insert_rate.set(sum(report.get("inserted", {}).values()) / elapsed)
+        elif job == "monthly_training" and "test_accuracy" in report:
+            self.accuracy.set(report["test_accuracy"])
+
+    def collect(self):
+        """Fold the runs that finished since the last call"""
+        with self._lock:
+            abandoned_before = time.time() - self.ABANDONED_AFTER
+            holding = False
+            for run_id, job, status, started_at, finished_at, duration, detail in self._rows():
+                if finished_at is not None and run_id not in self._folded:
+                    self._fold(job, status, duration, detail)
+                    self._folded.add(run_id)
+                if finished_at is None and (started_at or 0) > abandoned_before:
+                    holding = True
+                if not holding:
+                    self._cursor = run_id
+            self._folded = {run_id for run_id in self._folded if run_id > self._cursor}
+
+    def render(self):
+        self.collect()
+        return "".join(metric.render() for metric in (self.runs, self.durations, self.cards, self.inserted,
+                                                       self.insert_rate, self.accuracy))
+
+
+def render():
+    return REGISTRY.render()
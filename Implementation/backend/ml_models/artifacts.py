@@ -0,0 +1,165 @@
+import json
+import os
+import shutil
+import tempfile
+import threading
+import time
+import joblib
+from ml_models.topk_kernel import TopKScorer
+from ml_models.feature_cache import ProfileVectorizer
+
+# Loose pickles shipped with the repo; used until training publishes a bundle
+MODEL_PATH = "./ml_models/saved_model.pkl"
+TFIDF_PATH = "./ml_models/tfidf.pkl"
+LABEL_ENCODER_PATH = "./ml_models/label_encoder.pkl"
+# Each training writes its model, vectorizer and encoder into a new directory
+# under RELEASES_DIR; renaming the manifest over the old one makes all three
+# live at once
+RELEASES_DIR = "./ml_models/releases"
+ARTIFACT_MANIFEST_PATH = "./ml_models/artifacts.json"
+# Releases kept besides the live one, for workers still loading the previous one
+KEEP_PREVIOUS_RELEASES = 1
+BUNDLE_FILES = {"model": "saved_model.pkl", "tfidf": "tfidf.pkl", "label_encoder": "label_encoder.pkl"}
+# ANN index over job postings for /similar (see similar_index.py)
+POSTING_INDEX_PATH = "./ml_models/posting_index.pkl"
+# Postings scraped since the index was built; folded into it by the next training
+POSTING_DELTA_PATH = "./ml_models/posting_index.delta.pkl"
+# Memory-mapped course/skill data for recommendations (see recommend_snapshot.py)
+RECOMMENDATION_SNAPSHOT_PATH = "./ml_models/recommendations.snapshot"
+
+
+def artifact_paths():
+    """
+    (version, (model, tfidf, label encoder paths)) of the live bundle: the
+    release named by the manifest, or the loose pickles (versioned by
+    their mtimes) before the first release. version is None if neither exists.
+    """
+    try:
+        with open(ARTIFACT_MANIFEST_PATH) as f:
+            manifest = json.load(f)
+        directory = os.path.join(RELEASES_DIR, manifest["release"])
+        return manifest["release"], tuple(os.path.join(directory, manifest["files"][name]) for name in BUNDLE_FILES)
+    except FileNotFoundError:
+        pass
+
+    paths = (MODEL_PATH, TFIDF_PATH, LABEL_ENCODER_PATH)
+    try:
+        return tuple(os.stat(p).st_mtime_ns for p in paths), paths
+    except OSError:
+        return None, paths
+
+
+def load_artifacts():
+    """(version, model, tfidf, label_encoder), all from the same training"""
+    version, (model_path, tfidf_path, label_encoder_path) = artifact_paths()
+    return version, joblib.load(model_path), joblib.load(tfidf_path), joblib.load(label_encoder_path)
+
+
+def publish_artifacts(model, tfidf, label_encoder):
+    """Write a new release, make it live with one manifest rename, drop old releases"""
+    os.makedirs(RELEASES_DIR, exist_ok=True)
+    # Sorts by creation time; mkdtemp's suffix keeps it unique
+    now = time.time_ns()
+    prefix = time.strftime("%Y%m%d-%H%M%S", time.localtime(now // 10 ** 9)) + f".{now % 10 ** 9:09d}-"
+    directory = tempfile.mkdtemp(prefix=prefix, dir=RELEASES_DIR)
+    os.chmod(directory, 0o755)
+    release = os.path.basename(directory)
+    for name, obj in (("model", model), ("tfidf", tfidf), ("label_encoder", label_encoder)):
+        joblib.dump(obj, os.path.join(directory, BUNDLE_FILES[name]))
+
+    manifest = {"release": release, "files": BUNDLE_FILES, "created_at": time.time()}
+    write_atomic(ARTIFACT_MANIFEST_PATH, lambda f: f.write(json.dumps(manifest).encode()))
+    _prune_releases(release)
+    return release
+
+
+def _prune_releases(live):
+    # Only releases older than the live one: a newer directory may still be being written
+    older = sorted(name for name in os.listdir(RELEASES_DIR) if name < live)
+    for name in older[:max(0, len(older) - KEEP_PREVIOUS_RELEASES)]:
+        shutil.rmtree(os.path.join(RELEASES_DIR, name), ignore_errors=True)
+
+
+class ArtifactStore:
+    """
+    The job model, TF-IDF vectorizer and label encoder used by the API.
+
+    Training runs in the scheduler process and publishes a new release;
+    reload_if_changed() picks it up without restarting the API. The version
+    is the release named by the manifest, so the three files always come
+    from one training.
+    """
+
+    def __init__(self, check_interval=30.0):
+        self.check_interval = check_interval
+        self.model = None
+        self.tfidf = None
+        self.label_encoder = None
+        # Fast top-k inference built from the model's weights
+        self.scorer = None
+        # Cached per-term/per-field profile vectorization over tfidf
+        self.vectorizer = None
+        self.version = None
+        self._checked_at = 0.0
+        self._lock = threading.Lock()
+
+    def load(self):
+        with self._lock:
+            version, model, tfidf, label_encoder = load_artifacts()
+            scorer = TopKScorer.from_model(model, label_encoder)
+            # A new vectorizer starts with an empty cache; cached counts belong to one vocabulary
+            vectorizer = ProfileVectorizer(tfidf)
+            # Swap everything together so a request never mixes two trainings
+            self.model, self.tfidf, self.label_encoder = model, tfidf, label_encoder
+            self.scorer, self.vectorizer = scorer, vectorizer
+            self.version = version
+            self._checked_at = time.monotonic()
+        print(f"Loaded model artifacts (version {version})")
+
+    def reload_if_changed(self):
+        """Cheap manifest check, at most once per check_interval"""
+        now = time.monotonic()
+        if self.model is not None and now - self._checked_at < self.check_interval:
+            return False
+        self._checked_at = now
+
+        version = artifact_paths()[0]
+        if version is None or (self.model is not None and version == self.version):
+            return False
+        try:
+            self.load()
+            return True
+        except Exception as e:
+            print(f"Artifact reload failed, keeping previous model: {e}")
+            return False
+
+
+def write_atomic(path, write):
+    """
+    Call write(f) on a temp file next to path, then rename it over path, so
+    readers never see a half-written file. The temp name is unique per
+    writer: several workers may publish the same file at once (e.g. every
+    uvicorn worker at first start), and each rename installs a complete one.
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(prefix=os.path.basename(path) + ".", suffix=".tmp", dir=directory)
+    try:
+        with os.fdopen(fd, "wb") as f:
+            write(f)
+        # mkstemp creates the file owner-only; keep the usual permissions
+        os.chmod(tmp_path, 0o644)
+        try:
+            os.replace(tmp_path, path)
+        except FileNotFoundError:
+            # The temp file was cleaned up under us; fine if someone else published
+            if not os.path.exists(path):
+                raise
+            print(f"{path} was published by another writer")
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
+def dump_atomic(obj, path):
+    """joblib.dump to a temp file, then rename so readers never see half a pickle"""
+    write_atomic(path, lambda f: joblib.dump(obj, f))
@@ -0,0 +1,209 @@
+import asyncio
+import multiprocessing
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from ml_models.artifacts import ArtifactStore
+from ml_models.similar_index import PostingIndexStore
+from database.database import PathfinderDatabase
+
+MAX_BATCH_SIZE = 32
+MAX_WAIT_SECONDS = 0.005
+TOP_K = 5
+
+# Artifacts of the inference worker process
+_store = None
+_index_store = None
+_db = None
+
+
+class InferenceUnavailable(Exception):
+    """The inference worker died or could not load the model"""
+
+
+def _init_worker():
+    global _store, _index_store
+    _store = ArtifactStore()
+    _store.load()
+    _index_store = PostingIndexStore()
+
+
+def _artifact_version():
+    return _store.version
+
+
+def _predict_batch(profiles, top_k):
+    """
+    Worker side: one vectorize + predict_proba for the whole batch.
+
+    profiles are (education, interests, skills) tuples. Returns per-row
+    [(category, confidence), ...] best first, and the stage timings of the
+    batch.
+    """
+    # Picks up a retrained model, at most one stat() per check interval
+    _store.reload_if_changed()
+    vectorizer, scorer = _store.vectorizer, _store.scorer
+
+    started = time.perf_counter()
+    X_vec = vectorizer.transform(profiles)
+    vectorized = time.perf_counter()
+    logits = scorer.logits(X_vec)
+    predicted = time.perf_counter()
+
+    labels, probabilities = scorer.top_k(logits, top_k)
+    rows = [
+        [(str(label), float(probability)) for label, probability in zip(row_labels, row_probabilities)]
+        for row_labels, row_probabilities in zip(labels, probabilities)
+    ]
+    finished = time.perf_counter()
+
+    timings = {"vectorize": vectorized - started, "predict_proba": predicted - vectorized, "topk": finished - predicted}
+    return rows, timings
+
+
+def _similar_postings(text, k):
+    """Worker side: ANN lookup, then the posting rows; None if there is no index yet"""
+    global _db
+    index = _index_store.get()
+    if index is None:
+        return None
+    matches = index.query(text, k)
+    if _db is None:
+        _db = PathfinderDatabase()
+        _db.connect()
+    postings = _db.fetch_jobs_by_ids([job_id for job_id, _ in matches])
+    scores = dict(matches)
+    for posting in postings:
+        posting["similarity"] = scores[posting["id"]]
+    return postings
+
+
+class InferenceDispatcher:
+    """
+    Groups concurrent /predict requests into micro-batches for the job model.
+
+    Handlers await predict(education, interests, skills). A batch closes when
+    it holds max_batch_size profiles or max_wait seconds after its first text arrived, and runs as a
+    single transform/predict_proba call in a worker process, so the model
+    work never competes with request handling for the GIL. While every
+    worker is busy, new requests queue up and form the next, larger batch:
+    batches grow with load instead of the latency of each request. After a
+    batch of one there is nobody to wait for, so the next batch goes out
+    with whatever is queued and a lone client doesn't pay max_wait.
+
+    on_batch(size, timings), if given, is called on the event loop after
+    every batch.
+    """
+
+    def __init__(self, max_batch_size=MAX_BATCH_SIZE, max_wait=MAX_WAIT_SECONDS, workers=1,
+                 top_k=TOP_K, on_batch=None):
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait
+        self.workers = workers
+        self.top_k = top_k
+        self.on_batch = on_batch
+        self._pool = None
+        self._queue = None
+        self._slots = None
+        self._task = None
+        self._last_batch_size = 0
+
+    def _new_pool(self):
+        return ProcessPoolExecutor(self.workers, mp_context=multiprocessing.get_context("spawn"),
+                                   initializer=_init_worker)
+
+    async def start(self):
+        loop = asyncio.get_running_loop()
+        self._queue = asyncio.Queue()
+        # One batch in flight per worker; everything else waits for the next batch
+        self._slots = asyncio.Semaphore(self.workers)
+        self._pool = self._new_pool()
+        # Fail at startup, not on the first request, if the model can't be loaded
+        version = await loop.run_in_executor(self._pool, _artifact_version)
+        print(f"Inference worker ready (model version {version})")
+        self._task = loop.create_task(self._batch_loop())
+
+    async def close(self):
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+
+    async def predict(self, education, interests, skills):
+        """Top-k [(category, confidence), ...] plus how the request was served"""
+        future = asyncio.get_running_loop().create_future()
+        profile = (education, tuple(interests), tuple(skills))
+        await self._queue.put((profile, future, time.perf_counter()))
+        return await future
+
+    async def similar(self, text, k):
+        """Closest postings to a profile text; runs unbatched in the worker"""
+        loop = asyncio.get_running_loop()
+        try:
+            return await loop.run_in_executor(self._pool, _similar_postings, text, k)
+        except BrokenProcessPool as e:
+            print(f"Inference worker died, restarting: {e}")
+            self._pool = self._new_pool()
+            raise InferenceUnavailable(str(e))
+
+    async def _next_batch(self):
+        first = await self._queue.get()
+        batch = [first]
+        wait = self.max_wait if self._last_batch_size > 1 else 0.0
+        deadline = time.perf_counter() + wait
+        while len(batch) < self.max_batch_size:
+            if not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+                continue
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self._queue.get(), remaining))
+            except asyncio.TimeoutError:
+                break
+        self._last_batch_size = len(batch)
+        return batch
+
+    async def _batch_loop(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            await self._slots.acquire()
+            try:
+                batch = await self._next_batch()
+            except asyncio.CancelledError:
+                self._slots.release()
+                raise
+            loop.create_task(self._run_batch(batch))
+
+    async def _run_batch(self, batch):
+        loop = asyncio.get_running_loop()
+        profiles = [profile for profile, _, _ in batch]
+        dispatched = time.perf_counter()
+        try:
+            rows, timings = await loop.run_in_executor(self._pool, _predict_batch, profiles, self.top_k)
+        except BrokenProcessPool as e:
+            # The worker crashed (e.g. out of memory); start a fresh one for later batches
+            print(f"Inference worker died, restarting: {e}")
+            self._pool = self._new_pool()
+            self._fail(batch, InferenceUnavailable(str(e)))
+            return
+        except Exception as e:
+            self._fail(batch, InferenceUnavailable(f"{type(e).__name__}: {e}"))
+            return
+        finally:
+            self._slots.release()
+
+        for (_, future, queued), row in zip(batch, rows):
+            if not future.done():
+                future.set_result((row, {"queue_wait": dispatched - queued, "batch_size": len(batch), **timings}))
+        if self.on_batch is not None:
+            self.on_batch(len(batch), timings)
+
+    def _fail(self, batch, error):
+        for _, future, _ in batch:
+            if not future.done():
+                future.set_exception(error)
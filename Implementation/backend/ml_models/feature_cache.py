@@ -0,0 +1,136 @@
+import numpy as np
+import scipy.sparse as sp
+from sklearn.preprocessing import normalize
+
+from ml_models.preprocess import profile_text
+
+MAX_CACHED = 50000
+
+
+class ProfileVectorizer:
+    """
+    tfidf.transform for profiles, assembled from cached pieces.
+
+    A profile text is education, interests and skills joined with spaces,
+    and the same few hundred skill and interest terms come back in almost
+    every request. Each term is tokenized once and cached with the counts
+    of the vocabulary n-grams inside it; a field (the education string, or
+    a list of interests or skills) is cached as the sum of its terms' counts
+    plus the n-grams that cross from one term into the next. A profile is
+    the sum of its three fields plus the n-grams across fields, then the
+    same IDF weighting and normalization as TfidfVectorizer.
+
+    Crossing n-grams are found by extending from each token before the
+    boundary only while the words so far start some vocabulary entry, so
+    with ngram_range up to 200 a boundary still costs a few set lookups.
+    Tokens never join across the separating spaces, so the counts, and the
+    vectors, are exactly those of tfidf.transform on the joined text.
+    """
+
+    def __init__(self, tfidf, max_cached=MAX_CACHED):
+        self.tfidf = tfidf
+        self.max_cached = max_cached
+        # Callable analyzers and char n-grams can't be split at spaces
+        self.exact = tfidf.analyzer == "word" and tfidf.tokenizer is None
+        self.vocabulary = tfidf.vocabulary_
+        self.min_n = tfidf.ngram_range[0]
+        self._preprocess = tfidf.build_preprocessor()
+        self._tokenize = tfidf.build_tokenizer()
+        self._stop_words = tfidf.get_stop_words() or frozenset()
+
+        # Every leading run of words of a vocabulary entry ("a", "a b", "a b c", ...)
+        self.prefixes = set()
+        self.max_n = 1
+        for feature in self.vocabulary:
+            words = feature.split(" ")
+            self.max_n = max(self.max_n, len(words))
+            for n in range(1, len(words) + 1):
+                self.prefixes.add(" ".join(words[:n]))
+
+        # term -> (tokens, counts); tuple of terms -> (tokens, counts)
+        self._terms = {}
+        self._fields = {}
+
+    def _count(self, tokens, starts, min_end, counts):
+        """Add vocabulary n-grams of tokens[start:end] for start in starts, end >= min_end"""
+        vocabulary, prefixes = self.vocabulary, self.prefixes
+        for start in starts:
+            gram = None
+            for end in range(start + 1, len(tokens) + 1):
+                gram = tokens[start] if gram is None else gram + " " + tokens[end - 1]
+                if gram not in prefixes:
+                    break
+                if end >= min_end and end - start >= self.min_n:
+                    index = vocabulary.get(gram)
+                    if index is not None:
+                        counts[index] = counts.get(index, 0) + 1
+        return counts
+
+    def _join(self, pieces):
+        """Sum of the pieces' counts plus the n-grams crossing between them"""
+        tokens = ()
+        counts = {}
+        for piece_tokens, piece_counts in pieces:
+            for index, count in piece_counts.items():
+                counts[index] = counts.get(index, 0) + count
+            if tokens and piece_tokens:
+                boundary = len(tokens)
+                tokens = tokens + piece_tokens
+                starts = range(max(0, boundary - self.max_n + 1), boundary)
+                self._count(tokens, starts, boundary + 1, counts)
+            else:
+                tokens = tokens + piece_tokens
+        return tokens, counts
+
+    def _term(self, term):
+        piece = self._terms.get(term)
+        if piece is None:
+            # The only place text is tokenized: a term seen for the first time
+            tokens = tuple(t for t in self._tokenize(self._preprocess(term)) if t not in self._stop_words)
+            piece = (tokens, self._count(tokens, range(len(tokens)), 0, {}))
+            if len(self._terms) >= self.max_cached:
+                self._terms.clear()
+            self._terms[term] = piece
+        return piece
+
+    def _field(self, terms):
+        key = tuple(terms)
+        piece = self._fields.get(key)
+        if piece is None:
+            piece = self._join([self._term(term) for term in key])
+            if len(self._fields) >= self.max_cached:
+                self._fields.clear()
+            self._fields[key] = piece
+        return piece
+
+    def transform(self, profiles):
+        """TF-IDF rows for [(education, interests, skills), ...]"""
+        if not self.exact:
+            return self.tfidf.transform([profile_text(*profile) for profile in profiles])
+
+        indices, values, indptr = [], [], [0]
+        for education, interests, skills in profiles:
+            _, counts = self._join([self._field([education]), self._field(interests), self._field(skills)])
+            indices.extend(counts.keys())
+            values.extend(counts.values())
+            indptr.append(len(indices))
+
+        # Same steps as CountVectorizer.transform and TfidfTransformer.transform
+        X = sp.csr_matrix(
+            (np.asarray(values, dtype=self.tfidf.dtype), np.asarray(indices, dtype=np.int32), np.asarray(indptr, dtype=np.int32)),
+            shape=(len(profiles), len(self.vocabulary)),
+        )
+        X.sort_indices()
+        if self.tfidf.binary:
+            X.data.fill(1)
+        if self.tfidf.sublinear_tf:
+            np.log(X.data, X.data)
+            X.data += 1.0
+        if self.tfidf.use_idf:
+            X.data *= self.tfidf.idf_[X.indices]
+        if self.tfidf.norm is not None:
+            X = normalize(X, norm=self.tfidf.norm, copy=False)
+        return X
+
+    def cache_size(self):
+        return {"terms": len(self._terms), "fields": len(self._fields)}
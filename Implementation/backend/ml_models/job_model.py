@@ -1,3 +1,4 @@
+import os
 import pandas as pd
 import numpy as np
 from sklearn.feature_extraction.text import TfidfVectorizer
@@ -5,19 +6,33 @@ from sklearn.model_selection import train_test_split
 from sklearn.preprocessing import LabelEncoder
 from sklearn.metrics import accuracy_score, classification_report
 from sklearn.linear_model import LogisticRegression
-from imblearn.over_sampling import RandomOverSampler
-import joblib
+from sklearn.utils.class_weight import compute_sample_weight
 from database.database import PathfinderDatabase
+from ml_models.artifacts import publish_artifacts
+from ml_models.similar_index import build_posting_index
+from database.title_canonicalizer import backfill_canonical_titles
 
-def train_model():
+# Training cost is bounded by PER_CLASS_CAP x classes, however big the jobs table gets
+PER_CLASS_CAP = int(os.getenv("PATHFINDER_TRAIN_PER_CLASS", "2000"))
+# A posting's chance of being sampled halves every this many days
+RECENCY_HALF_LIFE_DAYS = float(os.getenv("PATHFINDER_TRAIN_HALF_LIFE_DAYS", "180"))
+
+def train_model(per_class=PER_CLASS_CAP, half_life_days=RECENCY_HALF_LIFE_DAYS):
     db = PathfinderDatabase("pathfinder_db.sqlite")
     db.connect()
+    # Re-match stored titles too, so labels follow matcher and taxonomy changes
+    backfill_canonical_titles(db.connection, recompute=True)
 
-    df = db.fetch_jobs()
+    # Stratified, recency-weighted sample drawn in SQL; only the sample is loaded.
+    # Postings that match no taxonomy title aren't a category /predict could return
+    df = db.fetch_training_sample(per_class, half_life_days)
+    if df.empty or df["canonical_title"].nunique() < 2:
+        db.connection.close()
+        raise ValueError("Need postings for at least two job titles to train the job model")
 
-    # Text features and labels
+    # Text features and labels; canonical titles keep the label space at the taxonomy size
     X_text = df["description"]
-    y = df["job_title"]
+    y = df["canonical_title"]
 
     # TF-IDF vectorization
     tfidf = TfidfVectorizer(
@@ -34,16 +49,14 @@ def train_model():
     # Split into train/test
     X_train, X_test, y_train, y_test = train_test_split(X_vec, y_enc, test_size=0.2, random_state=42)
 
-    # Data imbalance handling — Oversampling
-    ros = RandomOverSampler(random_state=42)
-    X_train_res, y_train_res = ros.fit_resample(X_train, y_train)
+    # Data imbalance handling — balanced sample weights instead of duplicated rows
+    sample_weight = compute_sample_weight("balanced", y_train)
 
-    print(f"\nBefore Oversampling: {len(y_train)} samples")
-    print(f"After Oversampling: {len(y_train_res)} samples")
+    print(f"\nTraining on {len(y_train)} samples ({len(df)} sampled, at most {per_class} per class)")
 
     # Train model with balanced class weights
-    model = LogisticRegression(max_iter=5000, class_weight='balanced')
-    model.fit(X_train_res, y_train_res)
+    model = LogisticRegression(max_iter=5000)
+    model.fit(X_train, y_train, sample_weight=sample_weight)
 
     # Evaluate
     y_pred = model.predict(X_test)
@@ -56,11 +69,21 @@ def train_model():
                             zero_division=0))
 
 
-    # Save model, TF-IDF, and encoder
-    joblib.dump(model, "./ml_models/saved_model.pkl")
-    joblib.dump(tfidf, "./ml_models/tfidf.pkl")
-    joblib.dump(le, "./ml_models/label_encoder.pkl")
-    print("\nModel, TF-IDF, and LabelEncoder saved successfully!")
+    # Save model, TF-IDF, and encoder as one release; the API switches to all three at once
+    release = publish_artifacts(model, tfidf, le)
+    print(f"\nModel, TF-IDF, and LabelEncoder saved successfully! (release {release})")
+
+    # Postings index for /similar, over the vectors computed above plus every unsampled posting
+    index = build_posting_index(tfidf, df["id"].to_numpy(), X_vec, db.iter_job_descriptions())
+    db.connection.close()
+
+    return {
+        "test_accuracy": float(acc),
+        "train_samples": int(len(y_train)),
+        "classes": int(len(le.classes_)),
+        "release": release,
+        "indexed_postings": len(index),
+    }
 
 if __name__ == "__main__":
     train_model()
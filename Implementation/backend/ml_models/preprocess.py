@@ -1,9 +1,14 @@
 # app/preprocess.py
-import joblib
 
-def preprocess_input(education, gpa, interests, skills):
-    tfidf = joblib.load("./ml_models/tfidf.pkl")
-    label_encoder = joblib.load("./ml_models/label_encoder.pkl")
-    text_input = f"{education} {' '.join(interests)} {' '.join(skills)}"
-    X_vec = tfidf.transform([text_input])
+def profile_text(education, interests, skills):
+    # The text the TF-IDF vectorizer sees for one profile
+    return f"{education} {' '.join(interests)} {' '.join(skills)}"
+
+
+def preprocess_input(education, gpa, interests, skills, tfidf=None):
+    # Callers may pass a loaded vectorizer; loading from disk is the standalone fallback
+    if tfidf is None:
+        from ml_models.artifacts import load_artifacts
+        tfidf = load_artifacts()[2]
+    X_vec = tfidf.transform([profile_text(education, interests, skills)])
     return X_vec
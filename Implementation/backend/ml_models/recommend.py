@@ -1,106 +1,105 @@
-import os
-import pandas as pd
-import re
+import numpy as np
+import scipy.sparse as sp
 from database.database import PathfinderDatabase
+from ml_models.recommend_snapshot import SnapshotStore, publish_snapshot
+from profiling import stage
 
-db = PathfinderDatabase()
-db.connect()
+# Course and skill data comes from a memory-mapped snapshot shared by all
+# API workers; the scraper publishes a new one after every run
+snapshots = SnapshotStore()
 
-jobs_df = db.fetch_jobs()
-courses_df = db.fetch_courses()
 
+def ensure_snapshot():
+    """Build the snapshot once if none has been published yet (fresh deploy)"""
+    if snapshots.get() is not None:
+        return
+    db = PathfinderDatabase()
+    db.connect()
+    try:
+        publish_snapshot(db.connection)
+    finally:
+        db.connection.close()
 
-def extract_skills(text):
-    if pd.isna(text):
-        return set()
-
-    # split by comma
-    skills = [s.strip().lower() for s in text.split(",")]
-    return set(skills)
-
-# Preprocess course skills
-courses_df["skills_set"] = courses_df["skills"].apply(extract_skills)
-
-# --- Build a global dictionary of all known skills (from courses) ---
-all_course_skills = set().union(*courses_df["skills_set"])
-
-
-def extract_job_skills_from_text(text):
-    if pd.isna(text):
-        return set()
-
-    text = text.lower()
-
-    found = set()
-    for skill in all_course_skills:
-        # fuzzy match → word boundaries
-        pattern = r"\b" + re.escape(skill.lower()) + r"\b"
-        if re.search(pattern, text):
-            found.add(skill)
-    return found
 
-def safe_int(value):
-    try:
-        if value is None:
-            return 0
-        value = str(value).replace(",", "").strip()
-        if value == "" or value.lower() == "nan":
-            return 0
-        return int(float(value))   # float() can parse "3.0", "3", "3000", but NOT "nan"
-    except:
-        return 0
+def optional(value):
+    # Missing ratings are stored as NaN, which JSON can't encode
+    return None if np.isnan(value) else float(value)
 
 
 def recommend_courses_for_job(job_title, user_skills):
-    user_skills = {s.lower() for s in user_skills}
-
-    # Find job row
-    job_row = jobs_df[jobs_df["job_title"].str.contains(job_title, case=False, na=False)]
-    if job_row.empty:
-        return {"error": "Job not found"}
-
-    job_row = job_row.iloc[0]
-
-    # Extract job-required skills
-    job_text = job_row["description"]
-    job_required_skills = extract_job_skills_from_text(job_text)
-
-    # Compute missing skills
-    missing_skills = job_required_skills - user_skills
-
-    if not missing_skills:
-        return {"message": "User already has all job-required skills!"}
-
-    # Score each course
-    course_recommendations = []
-
-    for _, row in courses_df.iterrows():
-        course_skills = row["skills_set"]
-
-        matched = missing_skills.intersection(course_skills)
-        if matched:
-            match_score = len(matched) / len(missing_skills)
-
-            course_recommendations.append({
-                "course_title": row["course_title"],
-                "organization": row["organization"],
-                "url": row["url"],
-                "rating": row["rating"],
-                "coverage_score": match_score
-            })
-
-    # Rank courses: highest coverage → highest rating → highest enrollments
-    ranked = sorted(
-                    course_recommendations,
-                    key=lambda x: (
-                        x["coverage_score"],
-                        x["rating"]
-                    ),
-                    reverse=True
-                )
-
-    return {
-        "job_title": job_title,
-        "missing_skills": list(missing_skills),
-        "recommended_courses": ranked[:5]
-    }
\ No newline at end of file
+    return recommend_courses_for_jobs([job_title], user_skills)[0]
+
+
+def recommend_courses_for_jobs(job_titles, user_skills, top_n=5):
+    """
+    Missing skills and top courses for several categories at once, e.g.
+    the top-k of /predict. The categories' missing skills form one small
+    category x skill matrix, and a single sparse product with the skill x
+    course matrix gives every category's matched-skill count per course.
+    Returns one result per title, as recommend_courses_for_job would.
+    """
+    snapshot = snapshots.get()
+    if snapshot is None:
+        return [{"error": "Recommendations are not available yet"} for _ in job_titles]
+
+    # Find job rows
+    with stage("recommend_job_lookup"):
+        categories = [snapshot.category_index(title) for title in job_titles]
+
+    # Job-required skills were extracted when the snapshot was built
+    with stage("recommend_job_skills"):
+        user_ids = snapshot.skill_ids({s.lower() for s in user_skills})
+        missing = [None if category is None
+                   else np.setdiff1d(snapshot.required_skills(category), user_ids, assume_unique=True)
+                   for category in categories]
+
+    results = [None] * len(job_titles)
+    rows = []
+    for position, (category, skills) in enumerate(zip(categories, missing)):
+        if category is None:
+            results[position] = {"error": "Job not found"}
+        elif len(skills) == 0:
+            results[position] = {"message": "User already has all job-required skills!"}
+        else:
+            rows.append(position)
+    if not rows:
+        return results
+
+    with stage("recommend_course_scan"):
+        # Category x skill missing-skill matrix, times skill x course: matched skills per course
+        lengths = np.array([len(missing[position]) for position in rows])
+        indptr = np.concatenate([[0], np.cumsum(lengths)])
+        gaps = sp.csr_matrix((np.ones(indptr[-1], dtype=np.int32),
+                              np.concatenate([missing[position] for position in rows]), indptr),
+                             shape=(len(rows), snapshot.skill_count))
+        matched = (gaps @ snapshot.skill_course_matrix()).tocsr()
+
+        row = np.repeat(np.arange(len(rows)), np.diff(matched.indptr))
+        courses = matched.indices
+        coverage = matched.data / lengths[row]
+
+        # Rank courses per category: highest coverage → highest rating, ties in catalog order.
+        # Within a category coverage orders like the matched count, so one int64 key
+        # (category, -count, rating rank) sorts all categories at once
+        span = snapshot.course_count
+        key = (row * (lengths.max() + 1) + (lengths.max() - matched.data)) * span + snapshot.rating_rank()[courses]
+        order = np.argsort(key)
+        rank = np.arange(len(order)) - matched.indptr[row[order]]
+        top = order[rank < top_n]
+
+    ranked = {}
+    for i in top:
+        ranked.setdefault(row[i], []).append(i)
+    for r, position in enumerate(rows):
+        results[position] = {
+            "job_title": job_titles[position],
+            "missing_skills": [snapshot.string("skill", i) for i in missing[position]],
+            "recommended_courses": [{
+                "course_title": snapshot.string("course_title", courses[i]),
+                "organization": snapshot.string("organization", courses[i]),
+                "url": snapshot.string("url", courses[i]),
+                "rating": optional(snapshot.rating[courses[i]]),
+                "coverage_score": float(coverage[i]),
+            } for i in ranked.get(r, [])]
+        }
+    return results
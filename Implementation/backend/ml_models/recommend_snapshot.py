@@ -0,0 +1,235 @@
+import json
+import os
+import re
+import time
+import numpy as np
+import pandas as pd
+import scipy.sparse as sp
+
+from ml_models.artifacts import RECOMMENDATION_SNAPSHOT_PATH, write_atomic
+from database.title_canonicalizer import OTHER_TITLE
+
+MAGIC = b"PFRECS02"
+ALIGN = 64
+
+
+def extract_skills(text):
+    if pd.isna(text):
+        return set()
+
+    # split by comma
+    skills = [s.strip().lower() for s in text.split(",")]
+    return set(skills)
+
+
+def _pack_strings(values):
+    """offsets (n + 1), utf-8 bytes and a null mask for a column of optional strings"""
+    encoded = [b"" if value is None or pd.isna(value) else str(value).encode("utf-8") for value in values]
+    offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+    offsets[1:] = np.cumsum([len(value) for value in encoded])
+    data = np.frombuffer(b"".join(encoded), dtype=np.uint8)
+    nulls = np.array([value is None or pd.isna(value) for value in values], dtype=np.uint8)
+    return offsets, data, nulls
+
+
+def _csr(rows):
+    """indptr and sorted int32 ids for a list of id lists"""
+    indptr = np.zeros(len(rows) + 1, dtype=np.int64)
+    indptr[1:] = np.cumsum([len(row) for row in rows])
+    ids = np.array([i for row in rows for i in sorted(row)], dtype=np.int32)
+    return indptr, ids
+
+
+def compile_snapshot(jobs, courses):
+    """
+    Arrays of a snapshot from the jobs (canonical_title, description) and
+    courses (course_title, organization, skills, url, rating) frames.
+    """
+    course_skills = [extract_skills(text) for text in courses["skills"]]
+    skills = sorted(set().union(*course_skills))
+    skill_id = {skill: i for i, skill in enumerate(skills)}
+    course_skill_ids = [[skill_id[s] for s in row] for row in course_skills]
+
+    # Categories are the canonical titles (the classifier's labels); a
+    # category's required skills come from its first posting
+    patterns = [(skill, re.compile(r"\b" + re.escape(skill) + r"\b")) for skill in skills]
+    first = jobs.drop_duplicates("canonical_title")
+    titles = list(first["canonical_title"])
+    required = []
+    for text in first["description"]:
+        text = str(text).lower()
+        required.append([skill_id[skill] for skill, pattern in patterns if pattern.search(text)])
+
+    arrays = {}
+    arrays["skill_offsets"], arrays["skill_data"], _ = _pack_strings(skills)
+    for column in ("course_title", "organization", "url"):
+        offsets, data, nulls = _pack_strings(list(courses[column]))
+        arrays[f"{column}_offsets"], arrays[f"{column}_data"], arrays[f"{column}_nulls"] = offsets, data, nulls
+    arrays["rating"] = pd.to_numeric(courses["rating"], errors="coerce").to_numpy(dtype=np.float64)
+    arrays["course_skill_indptr"], arrays["course_skill_ids"] = _csr(course_skill_ids)
+    # The same pairs skill-major, ready to wrap as the skill x course matrix.
+    # int32 index arrays and int8 values are what scipy keeps without copying
+    skill_courses = [[] for _ in skills]
+    for course, row in enumerate(course_skill_ids):
+        for skill in row:
+            skill_courses[skill].append(course)
+    indptr, ids = _csr(skill_courses)
+    arrays["skill_course_indptr"], arrays["skill_course_ids"] = indptr.astype(np.int32), ids
+    arrays["skill_course_data"] = np.ones(len(ids), dtype=np.int8)
+    arrays["category_offsets"], arrays["category_data"], _ = _pack_strings(titles)
+    arrays["category_skill_indptr"], arrays["category_skill_ids"] = _csr(required)
+    return arrays
+
+
+def write_snapshot(arrays, path=RECOMMENDATION_SNAPSHOT_PATH):
+    """Write to a unique temp file, then rename: open memory maps keep the old file"""
+    layout = {}
+    offset = 0
+    for name, array in arrays.items():
+        array = np.ascontiguousarray(array)
+        arrays[name] = array
+        layout[name] = {"dtype": array.dtype.str, "offset": offset, "length": int(array.size)}
+        offset += -(-array.nbytes // ALIGN) * ALIGN
+    header = json.dumps({"created_at": time.time(), "arrays": layout}).encode()
+    data_start = -(-(len(MAGIC) + 8 + len(header)) // ALIGN) * ALIGN
+
+    def write(f):
+        f.write(MAGIC)
+        f.write(len(header).to_bytes(8, "little"))
+        f.write(header)
+        for name, array in arrays.items():
+            f.seek(data_start + layout[name]["offset"])
+            f.write(array.tobytes())
+        f.truncate(data_start + offset)
+
+    write_atomic(path, write)
+
+
+def publish_snapshot(connection, path=RECOMMENDATION_SNAPSHOT_PATH):
+    """Rebuild the snapshot from the database; returns what it holds"""
+    # Categories are what /predict can return, so OTHER_TITLE is not one
+    jobs = pd.read_sql_query("""
+        SELECT canonical_title, description FROM jobs
+        WHERE description IS NOT NULL AND canonical_title IS NOT NULL AND canonical_title != ?
+        ORDER BY id
+    """, connection, params=(OTHER_TITLE,))
+    courses = pd.read_sql_query("""
+        SELECT course_title, organization, skills, url, rating FROM courses
+        WHERE course_title IS NOT NULL
+    """, connection)
+    arrays = compile_snapshot(jobs, courses)
+    write_snapshot(arrays, path)
+    categories = len(arrays["category_offsets"]) - 1
+    print(f"Recommendation snapshot written: {categories} categories, {len(courses)} courses")
+    return {"categories": categories, "courses": int(len(courses))}
+
+
+class RecommendationSnapshot:
+    """
+    Read-only view of a snapshot file.
+
+    The file is memory-mapped and every array is a view into the map, so
+    all API workers share one copy of the data through the page cache.
+    Only the category and skill name lookups are built per process.
+    """
+
+    def __init__(self, path=RECOMMENDATION_SNAPSHOT_PATH):
+        self.path = path
+        self._map = np.memmap(path, dtype=np.uint8, mode="r")
+        if bytes(self._map[:len(MAGIC)]) != MAGIC:
+            raise ValueError(f"{path} is not a recommendation snapshot")
+        header_length = int.from_bytes(bytes(self._map[len(MAGIC):len(MAGIC) + 8]), "little")
+        header_start = len(MAGIC) + 8
+        header = json.loads(bytes(self._map[header_start:header_start + header_length]))
+        data_start = -(-(header_start + header_length) // ALIGN) * ALIGN
+
+        self.created_at = header["created_at"]
+        for name, spec in header["arrays"].items():
+            dtype = np.dtype(spec["dtype"])
+            start = data_start + spec["offset"]
+            view = self._map[start:start + spec["length"] * dtype.itemsize].view(dtype)
+            setattr(self, name, view)
+
+        self.course_count = len(self.rating)
+        self.skill_count = len(self.skill_offsets) - 1
+        self._categories = None
+        self._skills = None
+        self._skill_courses = None
+        self._rating_rank = None
+
+    def _strings(self, column):
+        offsets, data = getattr(self, f"{column}_offsets"), getattr(self, f"{column}_data")
+        return [bytes(data[offsets[i]:offsets[i + 1]]).decode("utf-8") for i in range(len(offsets) - 1)]
+
+    def string(self, column, i):
+        nulls = getattr(self, f"{column}_nulls", None)
+        if nulls is not None and nulls[i]:
+            return None
+        offsets, data = getattr(self, f"{column}_offsets"), getattr(self, f"{column}_data")
+        return bytes(data[offsets[i]:offsets[i + 1]]).decode("utf-8")
+
+    def category_index(self, title):
+        if self._categories is None:
+            self._categories = {name: i for i, name in enumerate(self._strings("category"))}
+        return self._categories.get(title)
+
+    def skill_ids(self, names):
+        if self._skills is None:
+            self._skills = {name: i for i, name in enumerate(self._strings("skill"))}
+        return np.array(sorted({self._skills[name] for name in names if name in self._skills}), dtype=np.int32)
+
+    def skill_course_matrix(self):
+        """
+        Sparse skill x course 0/1 matrix (CSR) over the mapped skill-major
+        arrays, so workers share it too; a product only reads the rows of
+        the skills asked for, not the whole catalog.
+        """
+        if self._skill_courses is None:
+            self._skill_courses = sp.csr_matrix(
+                (self.skill_course_data, self.skill_course_ids, self.skill_course_indptr),
+                shape=(self.skill_count, self.course_count), copy=False
+            )
+            # Written sorted; don't let scipy try to sort the read-only map
+            self._skill_courses.has_sorted_indices = True
+        return self._skill_courses
+
+    def rating_rank(self):
+        """Each course's position in (highest rating, catalog order); missing ratings rank as 0"""
+        if self._rating_rank is None:
+            rating = np.nan_to_num(self.rating, nan=0.0)
+            order = np.lexsort((np.arange(self.course_count), -rating))
+            self._rating_rank = np.empty(self.course_count, dtype=np.int64)
+            self._rating_rank[order] = np.arange(self.course_count)
+        return self._rating_rank
+
+    def required_skills(self, category):
+        return self.category_skill_ids[self.category_skill_indptr[category]:self.category_skill_indptr[category + 1]]
+
+
+class SnapshotStore:
+    """Maps the snapshot on first use and remaps it when the file is replaced"""
+
+    def __init__(self, path=RECOMMENDATION_SNAPSHOT_PATH, check_interval=30.0):
+        self.path = path
+        self.check_interval = check_interval
+        self.snapshot = None
+        self.version = None
+        self._checked_at = 0.0
+
+    def get(self):
+        now = time.monotonic()
+        if self.snapshot is not None and now - self._checked_at < self.check_interval:
+            return self.snapshot
+        self._checked_at = now
+
+        try:
+            version = os.stat(self.path).st_mtime_ns
+        except OSError:
+            return self.snapshot
+        if version != self.version:
+            try:
+                self.snapshot = RecommendationSnapshot(self.path)
+                self.version = version
+            except Exception as e:
+                print(f"Recommendation snapshot reload failed, keeping previous one: {e}")
+        return self.snapshot
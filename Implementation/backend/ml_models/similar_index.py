@@ -0,0 +1,277 @@
+import os
+import time
+import joblib
+import numpy as np
+import scipy.sparse as sp
+
+from ml_models.artifacts import dump_atomic, POSTING_DELTA_PATH, POSTING_INDEX_PATH
+
+
+class PostingIndex:
+    """
+    Approximate nearest-neighbour index over job postings (inverted file).
+
+    TF-IDF vectors are reduced with a Gaussian random projection, which
+    roughly preserves cosine similarity, and clustered with spherical
+    k-means into about sqrt(n) lists. A query scores the centroids, opens
+    the `probes` closest lists and ranks only their postings, by exact
+    cosine on the stored TF-IDF rows. That is about probes * sqrt(n)
+    postings instead of n.
+
+    Postings added later go to a PostingDelta, assigned to their nearest
+    existing centroid, and queries search it alongside the lists; training
+    rebuilds and re-clusters the index over every posting. The index keeps
+    its own copy of the vectorizer, so later postings are embedded exactly
+    like the original ones.
+    """
+
+    # Indexes pickled before deltas existed load without these
+    build_id = None
+    delta = None
+
+    def __init__(self, tfidf, dimensions=256, probes=12, seed=42):
+        self.tfidf = tfidf
+        self.probes = probes
+        self.seed = seed
+        rng = np.random.RandomState(seed)
+        n_features = len(tfidf.vocabulary_)
+        self.projection = (rng.standard_normal((n_features, dimensions)) / np.sqrt(dimensions)).astype(np.float32)
+        self.centroids = None
+        self.ids = np.empty(0, dtype=np.int64)
+        self.assignments = np.empty(0, dtype=np.int64)
+        self.matrix = None
+        # Highest jobs.id indexed; incremental updates continue from here
+        self.last_job_id = 0
+        # Ties a delta file to the index it was assigned against
+        self.build_id = str(time.time_ns())
+        self._lists = None
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        # Rebuilt from the assignments on first query after loading
+        state["_lists"] = None
+        # Attached by PostingIndexStore; lives in its own file
+        state.pop("delta", None)
+        return state
+
+    def __len__(self):
+        return len(self.ids)
+
+    def _reduce(self, X):
+        vectors = np.asarray(X @ self.projection, dtype=np.float32)
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        return vectors / norms
+
+    def _cluster(self, vectors, iterations=10):
+        """Spherical k-means; returns centroids and each row's list"""
+        rng = np.random.RandomState(self.seed)
+        n_lists = max(1, int(round(np.sqrt(len(vectors)))))
+        centroids = vectors[rng.choice(len(vectors), n_lists, replace=False)]
+        for _ in range(iterations):
+            assignments = np.argmax(vectors @ centroids.T, axis=1)
+            sums = np.zeros_like(centroids)
+            np.add.at(sums, assignments, vectors)
+            norms = np.linalg.norm(sums, axis=1, keepdims=True)
+            empty = norms[:, 0] == 0
+            # Reseed empty lists with random postings
+            sums[empty] = vectors[rng.choice(len(vectors), int(empty.sum()))]
+            norms[empty] = 1.0
+            centroids = sums / norms
+        return centroids, np.argmax(vectors @ centroids.T, axis=1)
+
+    def assign(self, X):
+        """float32 CSR rows and each row's nearest list"""
+        X = sp.csr_matrix(X, dtype=np.float32)
+        return X, np.argmax(self._reduce(X) @ self.centroids.T, axis=1)
+
+    def add_matrix(self, job_ids, X):
+        """Add postings from an already vectorized TF-IDF matrix"""
+        if X.shape[0] == 0:
+            return 0
+        if self.centroids is None:
+            X = sp.csr_matrix(X, dtype=np.float32)
+            self.centroids, assignments = self._cluster(self._reduce(X))
+        else:
+            X, assignments = self.assign(X)
+
+        self.ids = np.concatenate([self.ids, np.asarray(job_ids, dtype=np.int64)])
+        self.assignments = np.concatenate([self.assignments, assignments])
+        self.matrix = X if self.matrix is None else sp.vstack([self.matrix, X], format="csr")
+        self.last_job_id = max(self.last_job_id, int(np.max(job_ids)))
+        self._lists = None
+        return X.shape[0]
+
+    def add(self, job_ids, texts):
+        return self.add_matrix(job_ids, self.tfidf.transform(texts))
+
+    def _build_lists(self):
+        order = np.argsort(self.assignments, kind="stable")
+        bounds = np.searchsorted(self.assignments[order], np.arange(len(self.centroids) + 1))
+        self._lists = [order[bounds[i]:bounds[i + 1]] for i in range(len(self.centroids))]
+
+    def query(self, text, k=10):
+        """[(job_id, cosine similarity), ...] best first"""
+        if len(self.ids) == 0:
+            return []
+        if self._lists is None:
+            self._build_lists()
+
+        X_query = self.tfidf.transform([text])
+        centroid_scores = self.centroids @ self._reduce(X_query)[0]
+        probes = min(self.probes, len(self.centroids))
+        opened = np.argpartition(-centroid_scores, probes - 1)[:probes]
+        candidates = np.concatenate([self._lists[i] for i in opened])
+        delta = self.delta
+        extra = np.flatnonzero(np.isin(delta.assignments, opened)) if delta is not None else np.empty(0, dtype=np.int64)
+        if len(candidates) + len(extra) < k:
+            # Too few postings in the nearest lists (tiny index): rank everything
+            candidates = np.arange(len(self.ids))
+            extra = np.arange(len(delta)) if delta is not None else extra
+
+        ids = self.ids[candidates]
+        scores = (self.matrix[candidates] @ X_query.T).toarray().ravel()
+        if len(extra):
+            ids = np.concatenate([ids, delta.ids[extra]])
+            scores = np.concatenate([scores, (delta.matrix[extra] @ X_query.T).toarray().ravel()])
+        if len(scores) > k:
+            top = np.argpartition(-scores, k - 1)[:k]
+        else:
+            top = np.arange(len(scores))
+        top = top[np.argsort(-scores[top], kind="stable")]
+        return [(int(ids[i]), float(scores[i])) for i in top]
+
+
+class PostingDelta:
+    """
+    Postings scraped after an index was built, in a file of their own so
+    the hourly update rewrites only what is new, not the whole index.
+    """
+
+    def __init__(self, build_id):
+        self.build_id = build_id
+        self.ids = np.empty(0, dtype=np.int64)
+        self.assignments = np.empty(0, dtype=np.int64)
+        self.matrix = None
+        self.last_job_id = 0
+
+    def __len__(self):
+        return len(self.ids)
+
+    def add(self, index, job_ids, texts):
+        X, assignments = index.assign(index.tfidf.transform(texts))
+        self.ids = np.concatenate([self.ids, np.asarray(job_ids, dtype=np.int64)])
+        self.assignments = np.concatenate([self.assignments, assignments])
+        self.matrix = X if self.matrix is None else sp.vstack([self.matrix, X], format="csr")
+        self.last_job_id = max(self.last_job_id, int(np.max(job_ids)))
+        return X.shape[0]
+
+
+def load_delta(index, path=POSTING_DELTA_PATH):
+    """The delta written against this index, or None"""
+    try:
+        delta = joblib.load(path)
+    except FileNotFoundError:
+        return None
+    if delta.build_id != index.build_id:
+        # Written against the index before the last training run
+        return None
+    return delta
+
+
+def build_posting_index(tfidf, job_ids, X, more_postings=()):
+    """
+    Called by training with the matrix it already vectorized; the lists are
+    clustered on those rows. more_postings yields further [(id, description)]
+    chunks (the postings training didn't sample), which are vectorized and
+    added chunk by chunk so the index still covers every posting, including
+    those the delta held; the delta is dropped.
+    """
+    index = PostingIndex(tfidf)
+    index.add_matrix(job_ids, X)
+    indexed = set(int(job_id) for job_id in job_ids)
+    for rows in more_postings:
+        rows = [row for row in rows if row[0] not in indexed]
+        if rows:
+            index.add([row[0] for row in rows], [row[1] for row in rows])
+    # Any delta written from here on is against the old index and ignored
+    if os.path.exists(POSTING_DELTA_PATH):
+        os.remove(POSTING_DELTA_PATH)
+    dump_atomic(index, POSTING_INDEX_PATH)
+    print(f"Posting index built with {len(index)} postings")
+    return index
+
+
+def update_posting_index(connection, path=POSTING_INDEX_PATH, delta_path=POSTING_DELTA_PATH):
+    """Add postings scraped since the index was built to its delta; returns how many"""
+    if not os.path.exists(path):
+        print("No posting index yet; it is built by the next training run")
+        return 0
+
+    loaded_version = os.stat(path).st_mtime_ns
+    # Postings stay memory-mapped; only the vectorizer and centroids are read
+    index = joblib.load(path, mmap_mode="r")
+    delta = load_delta(index, delta_path)
+    if delta is None:
+        delta = PostingDelta(index.build_id)
+    rows = connection.execute("""
+        SELECT id, description FROM jobs
+        WHERE id > ? AND description IS NOT NULL AND job_title IS NOT NULL
+        ORDER BY id
+    """, (max(index.last_job_id, delta.last_job_id),)).fetchall()
+    if not rows:
+        return 0
+
+    delta.add(index, [row[0] for row in rows], [row[1] for row in rows])
+    # A training run may have rebuilt the index (with a new vectorizer) meanwhile
+    if os.stat(path).st_mtime_ns != loaded_version:
+        print("Posting index was rebuilt during the update, keeping the rebuilt one")
+        return 0
+    dump_atomic(delta, delta_path)
+    print(f"Added {len(rows)} postings to the posting index ({len(delta)} since training, {len(index)} in the index)")
+    return len(rows)
+
+
+class PostingIndexStore:
+    """Loads the index on first use and reloads it, or just its delta, when the files change"""
+
+    def __init__(self, path=POSTING_INDEX_PATH, delta_path=POSTING_DELTA_PATH, check_interval=30.0):
+        self.path = path
+        self.delta_path = delta_path
+        self.check_interval = check_interval
+        self.index = None
+        self.version = None
+        self.delta_version = None
+        self._checked_at = 0.0
+
+    def get(self):
+        now = time.monotonic()
+        if self.index is not None and now - self._checked_at < self.check_interval:
+            return self.index
+        self._checked_at = now
+
+        try:
+            version = os.stat(self.path).st_mtime_ns
+        except OSError:
+            return self.index
+        if version != self.version:
+            try:
+                self.index = joblib.load(self.path)
+                self.version = version
+                self.delta_version = None
+            except Exception as e:
+                print(f"Posting index reload failed, keeping previous index: {e}")
+        if self.index is None:
+            return None
+
+        try:
+            delta_version = os.stat(self.delta_path).st_mtime_ns
+        except OSError:
+            delta_version = None
+        if delta_version != self.delta_version:
+            try:
+                self.index.delta = load_delta(self.index, self.delta_path)
+                self.delta_version = delta_version
+            except Exception as e:
+                print(f"Posting index delta reload failed, keeping previous delta: {e}")
+        return self.index
@@ -0,0 +1,67 @@
+import numpy as np
+import scipy.sparse as sp
+
+
+class TopKScorer:
+    """
+    Top-k job categories straight from the logistic regression weights.
+
+    predict_proba computes and normalizes every class and /predict then
+    sorts all of them to keep five. Here the coefficients are stored
+    feature-major in float32 (one contiguous row of class weights per
+    feature), so a sparse profile only gathers the rows of its nonzero
+    features. The top k logits are picked with a partial sort, and only
+    those k are turned into probabilities; the softmax denominator is a
+    single logsumexp over the logits.
+    """
+
+    def __init__(self, coef, intercept, labels, ovr=False):
+        coef = np.asarray(coef, dtype=np.float32)
+        intercept = np.asarray(intercept, dtype=np.float32)
+        if coef.shape[0] == 1:
+            # Binary model: softmax over (-z/2, z/2) is exactly sigmoid(z)
+            coef = np.vstack([-coef / 2, coef / 2])
+            intercept = np.array([-intercept[0] / 2, intercept[0] / 2], dtype=np.float32)
+            ovr = False
+        # (n_features, n_classes), C-contiguous: column-major by feature of coef_
+        self.weights = np.ascontiguousarray(coef.T)
+        self.intercept = intercept
+        self.labels = np.asarray(labels)
+        self.ovr = ovr
+
+    @classmethod
+    def from_model(cls, model, label_encoder):
+        # model.classes_ are encoded labels and may miss classes absent from the training split
+        labels = label_encoder.inverse_transform(model.classes_)
+        ovr = getattr(model, "multi_class", None) == "ovr" or (
+            getattr(model, "solver", None) == "liblinear" and len(model.classes_) > 2)
+        return cls(model.coef_, model.intercept_, labels, ovr=ovr)
+
+    def logits(self, X):
+        """(n_rows, n_classes) float32 scores for a sparse TF-IDF batch"""
+        X = sp.csr_matrix(X, dtype=np.float32)
+        if X.shape[0] == 1:
+            # One profile: gather the weight rows of its nonzero features
+            return (X.data @ self.weights[X.indices] + self.intercept)[None, :]
+        return np.asarray(X @ self.weights) + self.intercept
+
+    def top_k(self, logits, k):
+        """(labels, probabilities), each (n_rows, k), best first"""
+        k = min(k, logits.shape[1])
+        rows = np.arange(logits.shape[0])[:, None]
+        if k < logits.shape[1]:
+            top = np.argpartition(-logits, k - 1, axis=1)[:, :k]
+        else:
+            top = np.broadcast_to(np.arange(k), logits.shape).copy()
+        top = np.take_along_axis(top, np.argsort(-logits[rows, top], axis=1, kind="stable"), axis=1)
+        top_logits = logits[rows, top].astype(np.float64)
+
+        if self.ovr:
+            # predict_proba for one-vs-rest: sigmoids normalized by their sum
+            scores = 1.0 / (1.0 + np.exp(-logits.astype(np.float64)))
+            probabilities = scores[rows, top] / scores.sum(axis=1, keepdims=True)
+        else:
+            peak = logits.max(axis=1, keepdims=True).astype(np.float64)
+            log_norm = peak + np.log(np.exp(logits - peak).sum(axis=1, keepdims=True, dtype=np.float64))
+            probabilities = np.exp(top_logits - log_norm)
+        return self.labels[top], probabilities
@@ -0,0 +1,212 @@
+# profiling.py
+"""
+Opt-in per-request profiling for the API.
+
+Turned on with environment variables:
+
+    PATHFINDER_PROFILE_HEADER=1          honour the X-Profile request header
+    PATHFINDER_PROFILE_SAMPLE_RATE=0.01  profile a random share of requests
+    PATHFINDER_PROFILE_DIR=./profiles    where captured profiles are written
+    PATHFINDER_PROFILE_MIN_MS=0          only keep profiles of slower requests
+
+"X-Profile: timing" adds a Server-Timing header with per-stage durations.
+"X-Profile: profile", and every sampled request, also captures a profile
+of the handler: a sampling profile with pyinstrument when it is installed,
+a cProfile dump otherwise.
+
+With both switches off the middleware is not installed, and stage() costs
+one context variable lookup on top of the metric it already records.
+"""
+import contextvars
+import cProfile
+import functools
+import inspect
+import os
+import random
+import threading
+import time
+from contextlib import contextmanager
+
+try:
+    from pyinstrument import Profiler
+except ImportError:
+    Profiler = None
+
+HEADER_ENABLED = os.getenv("PATHFINDER_PROFILE_HEADER") == "1"
+SAMPLE_RATE = float(os.getenv("PATHFINDER_PROFILE_SAMPLE_RATE", "0"))
+PROFILE_DIR = os.getenv("PATHFINDER_PROFILE_DIR", "./profiles")
+MIN_PROFILE_MS = float(os.getenv("PATHFINDER_PROFILE_MIN_MS", "0"))
+ENABLED = HEADER_ENABLED or SAMPLE_RATE > 0
+
+_current = contextvars.ContextVar("pathfinder_request_profile", default=None)
+_counter_lock = threading.Lock()
+_counter = 0
+
+
+class RequestProfile:
+    """Stage durations (and optionally a profile) of one request"""
+
+    def __init__(self, capture):
+        self.capture = capture
+        self.started = time.perf_counter()
+        # name -> [total seconds, calls]
+        self.stages = {}
+        self.profile_file = None
+
+    def add(self, name, seconds):
+        entry = self.stages.get(name)
+        if entry is None:
+            self.stages[name] = [seconds, 1]
+        else:
+            entry[0] += seconds
+            entry[1] += 1
+
+    def server_timing(self):
+        parts = []
+        for name, (seconds, calls) in self.stages.items():
+            part = f"{name};dur={seconds * 1000:.2f}"
+            if calls > 1:
+                part += f';desc="{calls} calls"'
+            parts.append(part)
+        parts.append(f"total;dur={(time.perf_counter() - self.started) * 1000:.2f}")
+        return ", ".join(parts)
+
+
+@contextmanager
+def stage(name, histogram=None, **labels):
+    """Time a block into `histogram` and, when profiling, into Server-Timing"""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        seconds = time.perf_counter() - started
+        if histogram is not None:
+            histogram.observe(seconds, **labels)
+        current = _current.get()
+        if current is not None:
+            current.add(name, seconds)
+
+
+def record(name, seconds):
+    """Add a duration measured elsewhere (e.g. in a worker process) to Server-Timing"""
+    current = _current.get()
+    if current is not None:
+        current.add(name, seconds)
+
+
+def _next_profile_path(name, extension):
+    global _counter
+    with _counter_lock:
+        _counter += 1
+        number = _counter
+    os.makedirs(PROFILE_DIR, exist_ok=True)
+    filename = f"{time.strftime('%Y%m%d-%H%M%S')}-{os.getpid()}-{number}-{name}.{extension}"
+    return os.path.join(PROFILE_DIR, filename)
+
+
+@contextmanager
+def _capture(current, name):
+    # Started in the handler's own thread; both profilers only see the calling thread
+    if Profiler is not None:
+        profiler = Profiler(interval=0.001, async_mode="disabled")
+        profiler.start()
+    else:
+        profiler = cProfile.Profile()
+        profiler.enable()
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        if Profiler is not None:
+            profiler.stop()
+        else:
+            profiler.disable()
+
+        if elapsed_ms >= MIN_PROFILE_MS:
+            try:
+                if Profiler is not None:
+                    path = _next_profile_path(name, "html")
+                    with open(path, "w") as f:
+                        f.write(profiler.output_html())
+                else:
+                    path = _next_profile_path(name, "prof")
+                    profiler.dump_stats(path)
+                current.profile_file = os.path.basename(path)
+            except OSError as e:
+                print(f"Could not write profile: {e}")
+
+
+def profiled(name, histogram=None, **labels):
+    """
+    Endpoint decorator: times the handler and captures a profile when requested.
+
+    Coroutines are only timed; profile the sync helpers they hand to the
+    thread pool instead, since a capture only sees its own thread.
+    """
+    def decorator(func):
+        if inspect.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                with stage(name, histogram, **labels):
+                    return await func(*args, **kwargs)
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            current = _current.get()
+            if current is None or not current.capture:
+                with stage(name, histogram, **labels):
+                    return func(*args, **kwargs)
+            with stage(name, histogram, **labels), _capture(current, name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+class ProfilingMiddleware:
+    """Plain ASGI middleware; untouched requests go straight through"""
+
+    def __init__(self, app, header_enabled=HEADER_ENABLED, sample_rate=SAMPLE_RATE):
+        self.app = app
+        self.header_enabled = header_enabled
+        self.sample_rate = sample_rate
+
+    def _mode(self, scope):
+        if self.header_enabled:
+            for key, value in scope["headers"]:
+                if key == b"x-profile":
+                    mode = value.decode("latin-1").strip().lower()
+                    if mode in ("timing", "profile"):
+                        return mode
+                    break
+        if self.sample_rate > 0 and random.random() < self.sample_rate:
+            return "profile"
+        return None
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        mode = self._mode(scope)
+        if mode is None:
+            await self.app(scope, receive, send)
+            return
+
+        current = RequestProfile(capture=mode == "profile")
+
+        async def send_with_timing(message):
+            if message["type"] == "http.response.start":
+                headers = list(message.get("headers", []))
+                headers.append((b"server-timing", current.server_timing().encode("latin-1")))
+                headers.append((b"timing-allow-origin", b"*"))
+                if current.profile_file:
+                    headers.append((b"x-profile-file", current.profile_file.encode("latin-1")))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        token = _current.set(current)
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            _current.reset(token)
@@ -0,0 +1,322 @@
+# scheduler.py
+"""
+Out-of-process job scheduler for scraping and training.
+
+Run it next to the API, from Implementation/backend:
+
+    python scheduler.py
+
+Each job gets a long-lived worker process, so the scraper's browser pool
+survives between runs. Runs are started on a fixed cadence, are killed
+when they exceed the job's timeout, and hold a per-job lock in SQLite so
+two schedulers never run the same job at once. Every run is recorded in
+the job_runs table.
+
+Any number of schedulers may be started (standalone, or embedded in every
+uvicorn worker with PATHFINDER_EMBEDDED_SCHEDULER=1): they elect a single
+leader through a lease in SQLite and only the leader runs jobs. The others
+stand by and take over once the leader's lease expires.
+"""
+import importlib
+import json
+import multiprocessing
+import os
+import signal
+import socket
+import sqlite3
+import sys
+import threading
+import time
+from leader import LeaderLease
+
+DB_PATH = "./database/pathfinder_db.sqlite"
+
+# name -> target function, cadence and timeout (seconds)
+JOBS = {
+    "hourly_scraper": {
+        "target": "tasks.run_hourly_scraper",
+        "interval": 60 * 60,
+        "timeout": 50 * 60,
+    },
+    "monthly_training": {
+        "target": "tasks.run_monthly_training",
+        "interval": 30 * 24 * 60 * 60,
+        "timeout": 3 * 60 * 60,
+    },
+}
+
+LEASE_NAME = "scheduler"
+LEASE_TTL = 30
+HEARTBEAT_INTERVAL = 10
+
+
+def _worker_main(target, conn):
+    """Worker process: import the job once, then run it on every request"""
+    # SIGTERM -> SystemExit so atexit handlers (e.g. DriverPool.close) still run
+    signal.signal(signal.SIGTERM, lambda *_: sys.exit(1))
+
+    module_name, func_name = target.rsplit(".", 1)
+    job = getattr(importlib.import_module(module_name), func_name)
+
+    while True:
+        try:
+            message = conn.recv()
+        except EOFError:
+            return
+        if message == "stop":
+            return
+        try:
+            result = job()
+            conn.send(("succeeded", json.dumps(result, default=str)))
+        except Exception as e:
+            conn.send(("failed", f"{type(e).__name__}: {e}"))
+
+
+class JobWorker:
+    """A persistent worker process for one job, restarted after a timeout or crash"""
+
+    def __init__(self, name, target):
+        self.name = name
+        self.target = target
+        self.process = None
+        self.conn = None
+        self._context = multiprocessing.get_context("spawn")
+
+    def _ensure_started(self):
+        if self.process is not None and self.process.is_alive():
+            return
+        parent_conn, child_conn = self._context.Pipe()
+        self.process = self._context.Process(
+            target=_worker_main, args=(self.target, child_conn),
+            name=f"job-{self.name}", daemon=True
+        )
+        self.process.start()
+        child_conn.close()
+        self.conn = parent_conn
+
+    def run(self, timeout):
+        """Run the job once; returns (status, detail)"""
+        self._ensure_started()
+        process = self.process
+        self.conn.send("run")
+        try:
+            if self.conn.poll(timeout):
+                return self.conn.recv()
+        except (EOFError, OSError):
+            self.kill()
+            return "crashed", f"worker exited with code {process.exitcode}"
+
+        self.kill()
+        return "timeout", f"killed after {timeout}s"
+
+    def kill(self):
+        # May be called from the leadership thread while run() is waiting
+        process, self.process = self.process, None
+        if process is None:
+            return
+        if process.is_alive():
+            process.terminate()
+            process.join(10)
+        if process.is_alive():
+            process.kill()
+            process.join()
+
+    def stop(self):
+        process = self.process
+        if process is not None and process.is_alive():
+            try:
+                self.conn.send("stop")
+                process.join(10)
+            except OSError:
+                pass
+        self.kill()
+
+
+class RunHistory:
+    """job_runs history, fixed-cadence anchors and per-job locks in SQLite"""
+
+    def __init__(self, db_path=DB_PATH):
+        self.connection = sqlite3.connect(db_path, timeout=30)
+        cursor = self.connection.cursor()
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS job_runs (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                job TEXT NOT NULL,
+                scheduled_for REAL,
+                started_at REAL,
+                finished_at REAL,
+                duration_seconds REAL,
+                status TEXT,
+                detail TEXT
+            );
+        """)
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_job_runs_job ON job_runs(job, started_at)")
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS job_schedule (
+                job TEXT PRIMARY KEY,
+                anchor REAL NOT NULL,
+                last_slot REAL
+            );
+        """)
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS job_locks (
+                job TEXT PRIMARY KEY,
+                owner TEXT NOT NULL,
+                expires_at REAL NOT NULL
+            );
+        """)
+        self.connection.commit()
+        cursor.close()
+
+    def schedule_for(self, job, now):
+        """(anchor, last_slot); the anchor is fixed the first time a job is seen"""
+        self.connection.execute(
+            "INSERT OR IGNORE INTO job_schedule (job, anchor) VALUES (?, ?)", (job, now)
+        )
+        self.connection.commit()
+        return self.connection.execute(
+            "SELECT anchor, last_slot FROM job_schedule WHERE job = ?", (job,)
+        ).fetchone()
+
+    def mark_slot(self, job, slot):
+        self.connection.execute("UPDATE job_schedule SET last_slot = ? WHERE job = ?", (slot, job))
+        self.connection.commit()
+
+    def try_lock(self, job, owner, ttl):
+        """Take the job lock unless another live owner holds it"""
+        now = time.time()
+        cursor = self.connection.execute("""
+            INSERT INTO job_locks (job, owner, expires_at) VALUES (?, ?, ?)
+            ON CONFLICT(job) DO UPDATE SET owner = excluded.owner, expires_at = excluded.expires_at
+            WHERE job_locks.expires_at < ? OR job_locks.owner = excluded.owner
+        """, (job, owner, now + ttl, now))
+        self.connection.commit()
+        return cursor.rowcount == 1
+
+    def unlock(self, job, owner):
+        self.connection.execute("DELETE FROM job_locks WHERE job = ? AND owner = ?", (job, owner))
+        self.connection.commit()
+
+    def start(self, job, scheduled_for):
+        cursor = self.connection.execute(
+            "INSERT INTO job_runs (job, scheduled_for, started_at, status) VALUES (?, ?, ?, 'running')",
+            (job, scheduled_for, time.time())
+        )
+        self.connection.commit()
+        return cursor.lastrowid
+
+    def finish(self, run_id, status, detail):
+        now = time.time()
+        self.connection.execute("""
+            UPDATE job_runs
+            SET finished_at = ?, duration_seconds = ? - started_at, status = ?, detail = ?
+            WHERE id = ?
+        """, (now, now, status, detail, run_id))
+        self.connection.commit()
+
+
+class Scheduler:
+    def __init__(self, jobs=JOBS, db_path=DB_PATH, lease_ttl=LEASE_TTL, heartbeat=HEARTBEAT_INTERVAL):
+        self.jobs = jobs
+        self.db_path = db_path
+        self.owner = f"{socket.gethostname()}:{os.getpid()}:{id(self):x}"
+        self.heartbeat = heartbeat
+        self.lease = LeaderLease(LEASE_NAME, db_path, owner=self.owner, ttl=lease_ttl)
+        self.is_leader = False
+        self._stop = threading.Event()
+        # Set when we stop or lose the lease; ends the current term's job loops
+        self._term_over = threading.Event()
+        self._workers = {}
+
+    def _job_loop(self, name, config, term_over):
+        history = RunHistory(self.db_path)
+        worker = JobWorker(name, config["target"])
+        self._workers[name] = worker
+        interval = config["interval"]
+
+        try:
+            while not term_over.is_set():
+                now = time.time()
+                anchor, last_slot = history.schedule_for(name, now)
+                # Slots sit at anchor + k * interval, independent of how long runs take;
+                # missed slots collapse into a single run.
+                slot = anchor + ((now - anchor) // interval) * interval
+                if last_slot is None or slot > last_slot:
+                    history.mark_slot(name, slot)
+                    self._run_once(name, config, slot, history, worker)
+                    continue
+
+                next_slot = slot + interval
+                term_over.wait(max(0.0, next_slot - time.time()))
+        finally:
+            self._workers.pop(name, None)
+            worker.stop()
+
+    def _run_once(self, name, config, slot, history, worker):
+        # Lock outlives the timeout a little so a killed run can't overlap the next
+        if not history.try_lock(name, self.owner, config["timeout"] + 60):
+            print(f"[{name}] already running elsewhere, skipping this slot")
+            return
+
+        run_id = history.start(name, slot)
+        print(f"[{name}] run {run_id} started")
+        try:
+            status, detail = worker.run(config["timeout"])
+        except Exception as e:
+            worker.kill()
+            status, detail = "failed", f"{type(e).__name__}: {e}"
+        finally:
+            history.unlock(name, self.owner)
+
+        if self._term_over.is_set() and status != "succeeded":
+            status, detail = "aborted", f"leadership ended: {detail}"
+        history.finish(run_id, status, detail)
+        print(f"[{name}] run {run_id} {status}")
+
+    def _lead(self):
+        """Run every job loop until we stop or fail to renew the lease"""
+        self._term_over = threading.Event()
+        threads = [
+            threading.Thread(target=self._job_loop, args=(name, config, self._term_over), name=name, daemon=True)
+            for name, config in self.jobs.items()
+        ]
+        for thread in threads:
+            thread.start()
+        print(f"Scheduler {self.owner} is leader: {', '.join(self.jobs)}")
+
+        while not self._stop.wait(self.heartbeat):
+            if not self.lease.renew():
+                print(f"Scheduler {self.owner} lost the lease, stopping jobs")
+                break
+
+        self._term_over.set()
+        # A run in progress must not outlive our leadership
+        for worker in list(self._workers.values()):
+            worker.kill()
+        for thread in threads:
+            thread.join()
+        self.is_leader = False
+
+    def run_forever(self):
+        print(f"Scheduler {self.owner} started, waiting for leadership")
+        try:
+            while not self._stop.is_set():
+                if self.lease.acquire():
+                    self.is_leader = True
+                    self._lead()
+                else:
+                    self._stop.wait(self.heartbeat)
+        except KeyboardInterrupt:
+            print("Stopping scheduler...")
+            self.stop()
+            self._term_over.set()
+        finally:
+            self.lease.release()
+
+    def stop(self):
+        self._stop.set()
+        self._term_over.set()
+
+
+if __name__ == "__main__":
+    Scheduler().run_forever()
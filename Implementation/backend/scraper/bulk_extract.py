@@ -0,0 +1,77 @@
+import json
+
+# Runs inside the page and collects every card's fields in one WebDriver call.
+#
+# arguments[0]: CSS selector for the cards
+# arguments[1]: field spec, {name: {"selectors": [...], "mode": ..., "attr": ...}}
+#   mode "first": value of the first selector that yields a non-empty value
+#                 (same fallback order as the Python _safe_extract chains)
+#   mode "each":  first-match value for every selector, null where missing
+#   mode "all":   values of every element matched by each selector, in order
+#   attr "text" reads innerText (what Selenium's .text returns), anything
+#   else is read with getAttribute.
+# Every card also carries "card_text", the innerText of the whole card.
+CARD_EXTRACTION_JS = """
+const cardSelector = arguments[0];
+const spec = arguments[1];
+
+function read(el, attr) {
+    if (attr === 'text') {
+        return (el.innerText || el.textContent || '').trim();
+    }
+    return el.getAttribute(attr);
+}
+
+function query(card, selector) {
+    try { return card.querySelector(selector); } catch (e) { return null; }
+}
+
+function queryAll(card, selector) {
+    try { return Array.from(card.querySelectorAll(selector)); } catch (e) { return []; }
+}
+
+function extract(card, field) {
+    const attr = field.attr || 'text';
+    if (field.mode === 'all') {
+        const out = [];
+        for (const s of field.selectors) {
+            for (const el of queryAll(card, s)) { out.push(read(el, attr)); }
+        }
+        return out;
+    }
+    if (field.mode === 'each') {
+        return field.selectors.map(s => {
+            const el = query(card, s);
+            return el ? read(el, attr) : null;
+        });
+    }
+    for (const s of field.selectors) {
+        const el = query(card, s);
+        if (!el) continue;
+        const value = read(el, attr);
+        if (value) return value;
+    }
+    return null;
+}
+
+return JSON.stringify(Array.from(document.querySelectorAll(cardSelector)).map(card => {
+    const row = {card_text: card.innerText || ''};
+    for (const name of Object.keys(spec)) { row[name] = extract(card, spec[name]); }
+    return row;
+}));
+"""
+
+
+def extract_cards(driver, card_selector, spec):
+    """
+    Collect all cards' raw fields with a single execute_script round trip.
+
+    Returns a list of dicts (one per card), or None if the script failed so
+    callers can fall back to per-element extraction.
+    """
+    try:
+        payload = driver.execute_script(CARD_EXTRACTION_JS, card_selector, spec)
+        return json.loads(payload) if payload else []
+    except Exception as e:
+        print(f"Bulk extraction failed, falling back to element mode: {e}")
+        return None
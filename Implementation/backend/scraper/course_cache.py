@@ -0,0 +1,88 @@
+import json
+import re
+import sqlite3
+import threading
+import time
+
+DEFAULT_TTL_HOURS = 24 * 14
+
+
+def normalize_query(query):
+    """'  Data  Scientist!' -> 'data scientist'"""
+    return re.sub(r'\s+', ' ', re.sub(r'[^\w\s]', ' ', query.lower())).strip()
+
+
+class CourseQueryCache:
+    """
+    TTL cache of Coursera search results keyed by normalized query.
+
+    A query inside its TTL is a hit and needs no browser at all. After
+    expiry the query is scraped again; store() takes everything the result
+    pages listed (before any seen-set filtering, so a rescrape with nothing
+    new still refreshes the entry) and returns only the courses that were
+    not in the cached result. A search always lists courses, so an empty
+    result is a failed scrape: the entry is left as it was and the query
+    is retried on the next run. Safe to share between scraper threads.
+    """
+
+    def __init__(self, db_path, ttl_hours=DEFAULT_TTL_HOURS):
+        self.ttl_seconds = ttl_hours * 3600
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS course_query_cache (
+                query_key TEXT PRIMARY KEY,
+                query TEXT,
+                fetched_at REAL,
+                course_urls TEXT
+            );
+        """)
+        self._conn.commit()
+        self.hits = 0
+        self.misses = 0
+
+    def _entry(self, key):
+        return self._conn.execute(
+            "SELECT fetched_at, course_urls FROM course_query_cache WHERE query_key = ?", (key,)
+        ).fetchone()
+
+    def is_fresh(self, query):
+        """True (and counted as a hit) when the query was scraped within the TTL"""
+        with self._lock:
+            entry = self._entry(normalize_query(query))
+            fresh = entry is not None and time.time() - entry[0] < self.ttl_seconds
+            if fresh:
+                self.hits += 1
+            else:
+                self.misses += 1
+            return fresh
+
+    def store(self, query, courses):
+        """Cache a fresh result and return only the courses new since the last one"""
+        key = normalize_query(query)
+        urls = [course["url"] for course in courses if course.get("url")]
+        if not urls:
+            print(f"Coursera scrape for {query} came back empty, keeping the cached result")
+            return []
+
+        with self._lock:
+            entry = self._entry(key)
+            previous = set(json.loads(entry[1])) if entry else set()
+            self._conn.execute("""
+                INSERT INTO course_query_cache (query_key, query, fetched_at, course_urls)
+                VALUES (?, ?, ?, ?)
+                ON CONFLICT(query_key) DO UPDATE SET
+                    query = excluded.query,
+                    fetched_at = excluded.fetched_at,
+                    course_urls = excluded.course_urls
+            """, (key, query, time.time(), json.dumps(sorted(set(urls)))))
+            self._conn.commit()
+
+        return [course for course in courses if course.get("url") not in previous]
+
+    def report(self):
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses}
+
+    def close(self):
+        self._conn.close()
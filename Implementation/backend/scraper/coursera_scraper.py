@@ -1,67 +1,171 @@
-import random
-import time
 from datetime import datetime
-from selenium import webdriver
 from selenium.webdriver.common.by import By
-from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from webdriver_manager.chrome import ChromeDriverManager
+from scraper.driver_pool import DriverPool
+from scraper.bulk_extract import extract_cards
+from scraper.pacing import Pacer
+from scraper.html_backend import fetch_html, parse_document, parse_cards, is_block_page
+
+COURSERA_BASE_URL = "https://www.coursera.org"
+
+COURSE_CARD_SELECTOR = 'div[data-testid="product-card-cds"]'
+TITLE_SELECTOR = ".cds-CommonCard-title"
+ORGANIZATION_SELECTOR = ".cds-CommonCard-subtitle"
+LINK_SELECTOR = "a[href]"
+SKILLS_SELECTOR = ".css-vac8rf"
+RATING_SELECTOR = ".cds-RatingStat-meter span"
+ENROLLED_SELECTOR = ".css-1xrh3fl"
+
+# Field spec for the one-round-trip bulk extraction script
+COURSE_CARD_SPEC = {
+    "title": {"selectors": [TITLE_SELECTOR], "mode": "first"},
+    "organization": {"selectors": [ORGANIZATION_SELECTOR], "mode": "first"},
+    "href": {"selectors": [LINK_SELECTOR], "mode": "first", "attr": "href"},
+    "skills": {"selectors": [SKILLS_SELECTOR], "mode": "first"},
+    "rating": {"selectors": [RATING_SELECTOR], "mode": "first"},
+    "enrolled": {"selectors": [ENROLLED_SELECTOR], "mode": "first"},
+}
 
 class CourseraScraper:
-    def __init__(self, headless=True):
-        self.options = Options()
-        self.options.add_argument('--no-sandbox')
-        self.options.add_argument('--disable-dev-shm-usage')
-        self.options.add_argument('--window-size=1920,1080')
-        self.options.add_argument('--disable-gpu')
-        self.options.add_argument('--disable-blink-features=AutomationControlled')
-        self.options.add_argument('--disable-extensions')
-
-        self.options.add_argument(
-            'user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-        )
-
-        if headless:
-            self.options.add_argument('--headless')
-
-        self.driver = webdriver.Chrome(
-            service=Service(ChromeDriverManager().install()),
-            options=self.options
-        )
+    def __init__(self, headless=True, pool=None, rate_limiter=None, base_url=COURSERA_BASE_URL,
+                 extraction_mode="bulk", pacer=None, backend="selenium"):
+        # Borrow browsers from a shared pool; fall back to a private one-driver pool
+        self.pool = pool or DriverPool(size=1, headless=headless)
+        self._owns_pool = pool is None
+        self.driver = None
+        self.rate_limiter = rate_limiter
+        self.base_url = base_url.rstrip('/')
+        # "bulk": one in-page script per page; "element": one WebDriver call per field
+        self.extraction_mode = extraction_mode
+        # Event-driven waits and adaptive request spacing
+        self.pacer = pacer or Pacer()
+        # "html": plain HTTP fetch + lxml parse, Selenium only when no cards come back
+        self.backend = backend
 
         self.courses = []
+        # Every course the crawled pages listed, before seen-set filtering
+        self.listed_courses = []
 
-    def scrape_courses(self, query):
-        """Scrape Coursera search results - PAGE 1 ONLY"""
-        self.courses = []
+    def scrape_courses(self, query, max_pages=1, seen=None, stop_ratio=0.8):
+        """
+        Scrape Coursera search result pages for one query.
 
-        url = f"https://www.coursera.org/search?query={query.replace(' ', '%20')}"
+        With a `seen` set of known course URLs, only new courses are returned
+        and the crawl stops at the first page that is mostly already known.
+        """
+        self.courses = []
+        self.listed_courses = []
         print(f"\nScraping Coursera for: {query}")
-        print("URL:", url)
 
-        self.driver.get(url)
-        time.sleep(random.uniform(3, 6))
+        for page in range(max_pages):
+            url = f"{self.base_url}/search?query={query.replace(' ', '%20')}"
+            if page > 0:
+                url += f"&page={page + 1}"
+            print("URL:", url)
 
-        # Wait until product cards load
-        try:
-            WebDriverWait(self.driver, 10).until(
-                EC.presence_of_element_located((By.CSS_SELECTOR, 'div[data-testid="product-card-cds"]'))
-            )
-        except:
-            print("No course cards found.")
-            return []
+            page_courses = self._scrape_page(url)
+            if not page_courses:
+                break
+            self.listed_courses.extend(page_courses)
+
+            if seen is None:
+                self.courses.extend(page_courses)
+                continue
+
+            new_courses = [c for c in page_courses if c["url"] not in seen]
+            for course in new_courses:
+                seen.add(course["url"])
+            self.courses.extend(new_courses)
+
+            known_ratio = 1 - len(new_courses) / len(page_courses)
+            if known_ratio >= stop_ratio:
+                print(f"Page {page + 1} is {known_ratio:.0%} already seen, stopping crawl")
+                break
+
+        return self.courses
+
+    def _scrape_page(self, url):
+        """Scrape one search page, trying the browserless path first in html mode"""
+        if self.backend == "html":
+            page_courses = self._scrape_html(url)
+            if page_courses is None:
+                # The pacer has backed off; a browser sent to the same site now would be blocked too
+                return []
+            if page_courses:
+                return page_courses
+            print("No course cards in served HTML, falling back to Selenium")
+
+        with self.pool.driver() as driver:
+            self.driver = driver
+            try:
+                if self.rate_limiter:
+                    self.pacer.add_wait(self.rate_limiter.acquire(url))
+                # Wait until product cards load
+                ready = self.pacer.load(self.driver, url, COURSE_CARD_SELECTOR)
+                self.pool.page_loaded(self.driver)
+
+                if not ready:
+                    print("No course cards found.")
+                    return []
+
+                with self.pacer.working():
+                    return self._extract_page_courses()
+            finally:
+                self.driver = None
+
+    def _scrape_html(self, url):
+        """Browserless path: one HTTP request and an lxml parse; None when a block page is served"""
+        if self.rate_limiter:
+            self.pacer.add_wait(self.rate_limiter.acquire(url))
+        self.pacer.before_request()
+        html, seconds = fetch_html(url)
+        with self.pacer.working():
+            doc = parse_document(html)
+            blocked = is_block_page(doc)
+        self.pacer.record_load(seconds, blocked)
+        if blocked:
+            print("Block page served, backing off")
+            return None
+
+        with self.pacer.working():
+            return self._parse_document(doc)
 
-        cards = self.driver.find_elements(By.CSS_SELECTOR, 'div[data-testid="product-card-cds"]')
+    def parse_html(self, html):
+        """Parse a saved or fetched search page into course records (no browser needed)"""
+        return self._parse_document(parse_document(html))
+
+    def _parse_document(self, doc):
+        courses = []
+        for raw in parse_cards(doc, COURSE_CARD_SELECTOR, COURSE_CARD_SPEC):
+            course = self._build_course_info(raw)
+            if course:
+                courses.append(course)
+        return courses
+
+    def close(self):
+        """Quit the browser if this scraper owns its pool"""
+        if self._owns_pool:
+            self.pool.close()
+
+    def _extract_page_courses(self):
+        page_courses = []
+        if self.extraction_mode == "bulk":
+            raw_cards = extract_cards(self.driver, COURSE_CARD_SELECTOR, COURSE_CARD_SPEC)
+            if raw_cards is not None:
+                print(f"Found {len(raw_cards)} course cards")
+                for raw in raw_cards:
+                    course = self._build_course_info(raw)
+                    if course:
+                        page_courses.append(course)
+                return page_courses
+
+        cards = self.driver.find_elements(By.CSS_SELECTOR, COURSE_CARD_SELECTOR)
         print(f"Found {len(cards)} course cards")
 
         for card in cards:
             course = self._extract_course_info(card)
             if course:
-                self.courses.append(course)
-
-        return self.courses
+                page_courses.append(course)
+        return page_courses
 
     def _safe_extract(self, parent, selector, attr='text'):
         """Safe element extraction"""
@@ -74,46 +178,52 @@ class CourseraScraper:
             return None
 
     def _extract_course_info(self, card):
+        """Element mode: one WebDriver call per field"""
+        # Title
+        title = self._safe_extract(card, TITLE_SELECTOR)
+        if not title:
+            return None
+
+        raw = {
+            "title": title,
+            # Organization / Partner (e.g., IBM, Google, Meta)
+            "organization": self._safe_extract(card, ORGANIZATION_SELECTOR),
+            "href": self._safe_extract(card, LINK_SELECTOR, "href"),
+            "skills": self._safe_extract(card, SKILLS_SELECTOR),
+            "rating": self._safe_extract(card, RATING_SELECTOR),
+            "enrolled": self._safe_extract(card, ENROLLED_SELECTOR),
+        }
+        return self._build_course_info(raw)
+
+    def _build_course_info(self, raw):
+        """Turn raw card fields (bulk payload or element mode) into a course record"""
         try:
-            # Title
-            title = self._safe_extract(card, ".cds-CommonCard-title")
+            title = raw.get("title")
             if not title:
                 return None
 
-            # Organization / Partner (e.g., IBM, Google, Meta)
-            organization = self._safe_extract(card, ".cds-CommonCard-subtitle")
-
             # Course URL
-            link_el = card.find_element(By.CSS_SELECTOR, "a[href]")
-            url = "https://www.coursera.org" + link_el.get_attribute("href")
+            href = raw.get("href")
+            if not href:
+                raise ValueError("course link not found")
+            url = self.base_url + href if href.startswith("/") else href
 
             # Skills
-            skills = None
-            try:
-                skill_block = card.find_element(By.CSS_SELECTOR, ".css-vac8rf")
-                skills = skill_block.text.replace("Skills you'll gain:", "").strip()
-            except:
-                pass
+            skills = raw.get("skills")
+            if skills:
+                skills = skills.replace("Skills you'll gain:", "").strip()
 
             # Rating
-            rating = None
-            try:
-                rating_el = card.find_element(By.CSS_SELECTOR, ".cds-RatingStat-meter span")
-                rating = rating_el.text.strip()
-            except:
-                rating = None
+            rating = raw.get("rating")
 
             # Students enrolled (Coursera shows "123k already enrolled")
-            students = None
-            try:
-                enroll_el = card.find_element(By.CSS_SELECTOR, ".css-1xrh3fl")
-                students = enroll_el.text.replace("already enrolled", "").strip()
-            except:
-                students = None
+            students = raw.get("enrolled")
+            if students:
+                students = students.replace("already enrolled", "").strip()
 
             return {
                 "course_title": title,
-                "organization": organization,
+                "organization": raw.get("organization"),
                 "skills": skills,
                 "rating": float(rating) if rating else None,
                 "course_students_enrolled": students,
@@ -0,0 +1,197 @@
+import atexit
+import json
+import os
+import queue
+import threading
+from contextlib import contextmanager
+from selenium import webdriver
+from selenium.webdriver.chrome.service import Service
+from selenium.webdriver.chrome.options import Options
+
+# Resolved chromedriver binary path, so later runs never ask webdriver_manager
+# to look up the latest driver version over the network.
+DRIVER_CACHE_FILE = "./scraper/.chromedriver_path.json"
+
+
+def build_chrome_options(headless=True):
+    """Chrome options shared by every scraper browser"""
+    options = Options()
+    options.add_argument('--no-sandbox')
+    options.add_argument('--disable-dev-shm-usage')
+    options.add_argument('--window-size=1920,1080')
+    options.add_argument('--disable-blink-features=AutomationControlled')
+    options.add_argument('--disable-gpu')
+    options.add_argument('--disable-extensions')
+
+    options.add_argument(
+        'user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
+    )
+    if headless:
+        options.add_argument('--headless')
+    return options
+
+
+def cached_driver_path(cache_file=DRIVER_CACHE_FILE):
+    """The chromedriver path cached by a previous run, if it still exists"""
+    try:
+        with open(cache_file) as f:
+            cached = json.load(f).get("path")
+        if cached and os.path.exists(cached):
+            return cached
+    except (OSError, ValueError):
+        pass
+    return None
+
+
+def forget_driver_path(cache_file=DRIVER_CACHE_FILE):
+    try:
+        os.remove(cache_file)
+    except FileNotFoundError:
+        pass
+    except OSError as e:
+        print(f"Could not remove cached chromedriver path: {e}")
+
+
+def resolve_driver_path(cache_file=DRIVER_CACHE_FILE):
+    """
+    Return a local chromedriver path.
+
+    Order: CHROMEDRIVER_PATH env var, then the cached path from a previous
+    run, and only then webdriver_manager (which needs the network once).
+    """
+    env_path = os.environ.get("CHROMEDRIVER_PATH")
+    if env_path and os.path.exists(env_path):
+        return env_path
+
+    cached = cached_driver_path(cache_file)
+    if cached:
+        return cached
+
+    from webdriver_manager.chrome import ChromeDriverManager
+    path = ChromeDriverManager().install()
+
+    try:
+        with open(cache_file, "w") as f:
+            json.dump({"path": path}, f)
+    except OSError as e:
+        print(f"Could not cache chromedriver path: {e}")
+    return path
+
+
+class DriverPool:
+    """
+    Pool of long-lived headless Chrome drivers shared across scrape runs.
+
+    Drivers are started lazily, health-checked when checked out, recycled
+    after `max_pages` page loads and always quit if the caller raised.
+    """
+
+    def __init__(self, size=1, headless=True, max_pages=50):
+        self.size = size
+        self.headless = headless
+        self.max_pages = max_pages
+
+        self._idle = queue.LifoQueue()
+        self._pages = {}          # id(driver) -> pages loaded
+        self._drivers = {}        # id(driver) -> driver, every live driver
+        self._slots = threading.BoundedSemaphore(size)
+        self._lock = threading.Lock()
+        self._driver_path = None
+        self._closed = False
+
+        atexit.register(self.close)
+
+    def _new_driver(self):
+        return webdriver.Chrome(
+            service=Service(self._driver_path),
+            options=build_chrome_options(self.headless)
+        )
+
+    def _start_driver(self):
+        if self._driver_path is None:
+            self._driver_path = resolve_driver_path()
+
+        try:
+            driver = self._new_driver()
+        except Exception as e:
+            # The cached driver may no longer match the installed Chrome (Chrome
+            # auto-updated): drop the cache and resolve once more
+            if self._driver_path != cached_driver_path():
+                raise
+            print(f"Chrome failed to start with cached chromedriver {self._driver_path}: {e}")
+            forget_driver_path()
+            self._driver_path = resolve_driver_path()
+            driver = self._new_driver()
+        with self._lock:
+            self._drivers[id(driver)] = driver
+            self._pages[id(driver)] = 0
+        print(f"Started Chrome driver ({len(self._drivers)}/{self.size})")
+        return driver
+
+    def _quit_driver(self, driver):
+        with self._lock:
+            self._drivers.pop(id(driver), None)
+            self._pages.pop(id(driver), None)
+        try:
+            driver.quit()
+        except Exception as e:
+            print(f"Error quitting driver: {e}")
+
+    def _is_healthy(self, driver):
+        try:
+            return driver.execute_script("return 1") == 1
+        except Exception:
+            return False
+
+    def _checkout(self):
+        while True:
+            try:
+                driver = self._idle.get_nowait()
+            except queue.Empty:
+                return self._start_driver()
+
+            if self._is_healthy(driver):
+                return driver
+
+            print("Recycling unhealthy driver")
+            self._quit_driver(driver)
+
+    def _checkin(self, driver, failed=False):
+        with self._lock:
+            pages = self._pages.get(id(driver), 0)
+
+        if failed or self._closed or pages >= self.max_pages:
+            self._quit_driver(driver)
+        else:
+            self._idle.put(driver)
+
+    @contextmanager
+    def driver(self):
+        """Borrow a driver; it is quit instead of returned if the block raises"""
+        if self._closed:
+            raise RuntimeError("Driver pool is closed")
+
+        self._slots.acquire()
+        driver = None
+        failed = True
+        try:
+            driver = self._checkout()
+            yield driver
+            failed = False
+        finally:
+            if driver is not None:
+                self._checkin(driver, failed=failed)
+            self._slots.release()
+
+    def page_loaded(self, driver):
+        """Count a page load against the driver's recycle budget"""
+        with self._lock:
+            if id(driver) in self._pages:
+                self._pages[id(driver)] += 1
+
+    def close(self):
+        self._closed = True
+        with self._lock:
+            drivers = list(self._drivers.values())
+        for driver in drivers:
+            self._quit_driver(driver)
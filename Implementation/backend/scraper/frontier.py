@@ -0,0 +1,126 @@
+import time
+
+# A title this many hours stale (or never scraped) gets the full staleness score
+MAX_STALENESS_HOURS = 24 * 7
+# Training rows per title at which it no longer counts as under-represented
+TARGET_ROWS_PER_TITLE = 100
+# Smoothing for the per-title yield and error-rate averages
+EWMA_ALPHA = 0.3
+
+
+class CrawlFrontier:
+    """
+    Persistent, priority-driven schedule of job titles to scrape.
+
+    Per title it stores when it was last scraped, an average of new rows per
+    run and an error rate. next_titles() ranks titles by
+
+        staleness * (0.5 * need + 0.4 * yield + 0.1) * (1 - 0.8 * error_rate)
+
+    where staleness grows with hours since the last scrape, need is high for
+    titles with few training rows, and yield is the title's recent new-row
+    rate relative to the best title. Never-scraped titles come first.
+    """
+
+    def __init__(self, connection):
+        self.connection = connection
+        self._create_table()
+
+    def _create_table(self):
+        cursor = self.connection.cursor()
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS crawl_frontier (
+                title TEXT PRIMARY KEY,
+                last_scraped_at REAL,
+                runs INTEGER DEFAULT 0,
+                total_new_rows INTEGER DEFAULT 0,
+                avg_yield REAL DEFAULT 0,
+                error_rate REAL DEFAULT 0
+            );
+        """)
+        self.connection.commit()
+        cursor.close()
+
+    def sync(self, titles):
+        """Make sure every title in the taxonomy has a frontier row"""
+        self.connection.executemany(
+            "INSERT OR IGNORE INTO crawl_frontier (title) VALUES (?)",
+            [(title,) for title in titles]
+        )
+        self.connection.commit()
+
+    def _training_rows(self, titles):
+        """Scraped job rows per taxonomy title (training label = canonical_title)"""
+        counts = dict(self.connection.execute(
+            "SELECT canonical_title, COUNT(*) FROM jobs GROUP BY canonical_title"
+        ).fetchall())
+        return {title: counts.get(title, 0) for title in titles}
+
+    def priorities(self, now=None):
+        """Return [(priority, title)] for every title, highest first"""
+        now = now or time.time()
+        frontier = self.connection.execute(
+            "SELECT title, last_scraped_at, avg_yield, error_rate FROM crawl_frontier ORDER BY rowid"
+        ).fetchall()
+        if not frontier:
+            return []
+
+        training_rows = self._training_rows([row[0] for row in frontier])
+        best_yield = max(row[2] or 0 for row in frontier) or 1.0
+
+        ranked = []
+        for title, last_scraped_at, avg_yield, error_rate in frontier:
+            if last_scraped_at is None:
+                staleness = 2.0    # never scraped beats anything stale
+            else:
+                hours = (now - last_scraped_at) / 3600
+                staleness = min(hours, MAX_STALENESS_HOURS) / MAX_STALENESS_HOURS
+
+            need = 1.0 - min(training_rows[title], TARGET_ROWS_PER_TITLE) / TARGET_ROWS_PER_TITLE
+            yield_score = (avg_yield or 0) / best_yield
+            priority = staleness * (0.5 * need + 0.4 * yield_score + 0.1) * (1 - 0.8 * (error_rate or 0))
+            ranked.append((priority, title))
+
+        # Stable sort: ties keep taxonomy order
+        ranked.sort(key=lambda item: -item[0])
+        return ranked
+
+    def next_titles(self, n):
+        return [title for _, title in self.priorities()[:n]]
+
+    def mark_attempted(self, titles):
+        """
+        Stamp titles as scraped now, before the run starts; if the run dies
+        before record(), they are not picked again at the top of the next one
+        """
+        self.connection.executemany(
+            "UPDATE crawl_frontier SET last_scraped_at = ? WHERE title = ?",
+            [(time.time(), title) for title in titles]
+        )
+        self.connection.commit()
+
+    def record(self, title, new_rows, failed=False):
+        """Update a title's stats after a scrape run"""
+        row = self.connection.execute(
+            "SELECT runs, avg_yield, error_rate FROM crawl_frontier WHERE title = ?", (title,)
+        ).fetchone()
+        runs, avg_yield, error_rate = row if row else (0, 0.0, 0.0)
+
+        if runs:
+            avg_yield += EWMA_ALPHA * (new_rows - avg_yield)
+            error_rate += EWMA_ALPHA * ((1.0 if failed else 0.0) - error_rate)
+        else:
+            avg_yield = float(new_rows)
+            error_rate = 1.0 if failed else 0.0
+
+        self.connection.execute("""
+            INSERT INTO crawl_frontier (title, last_scraped_at, runs, total_new_rows, avg_yield, error_rate)
+            VALUES (?, ?, 1, ?, ?, ?)
+            ON CONFLICT(title) DO UPDATE SET
+                last_scraped_at = excluded.last_scraped_at,
+                runs = runs + 1,
+                total_new_rows = total_new_rows + excluded.total_new_rows,
+                avg_yield = excluded.avg_yield,
+                error_rate = excluded.error_rate
+        """, (title, time.time(), new_rows, avg_yield, error_rate))
+        self.connection.commit()
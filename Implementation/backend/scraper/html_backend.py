@@ -0,0 +1,114 @@
+import time
+import urllib.request
+from urllib.error import URLError
+import lxml.html
+from lxml.cssselect import CSSSelector
+from cssselect import SelectorError
+from scraper.pacing import BLOCK_SELECTORS, BLOCK_TITLE_WORDS
+
+USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
+
+# Compiled selectors are reused across pages
+_selector_cache = {}
+
+
+def _compile(selector):
+    compiled = _selector_cache.get(selector)
+    if compiled is None:
+        try:
+            compiled = CSSSelector(selector)
+        except SelectorError:
+            compiled = False
+        _selector_cache[selector] = compiled
+    return compiled
+
+
+def _select(node, selector):
+    compiled = _compile(selector)
+    return compiled(node) if compiled else []
+
+
+def _lines(el):
+    return [t.strip() for t in el.itertext() if t and t.strip()]
+
+
+def _read(el, attr):
+    if attr == 'text':
+        return ' '.join(' '.join(_lines(el)).split())
+    return el.get(attr)
+
+
+def _extract(card, field):
+    """Same semantics as the modes of the bulk extraction script"""
+    attr = field.get('attr', 'text')
+    mode = field.get('mode', 'first')
+
+    if mode == 'all':
+        return [_read(el, attr) for s in field['selectors'] for el in _select(card, s)]
+
+    if mode == 'each':
+        values = []
+        for s in field['selectors']:
+            found = _select(card, s)
+            values.append(_read(found[0], attr) if found else None)
+        return values
+
+    for s in field['selectors']:
+        found = _select(card, s)
+        if not found:
+            continue
+        value = _read(found[0], attr)
+        if value:
+            return value
+    return None
+
+
+def parse_document(html):
+    """lxml tree of served HTML without scripts and styles; None for a failed fetch"""
+    if not html:
+        return None
+    doc = lxml.html.fromstring(html)
+    for bad in doc.xpath('//script|//style|//noscript'):
+        bad.drop_tree()
+    return doc
+
+
+def parse_cards(doc, card_selector, spec):
+    """Raw card payloads of a parsed page, the same ones the bulk script returns"""
+    if doc is None:
+        return []
+
+    cards = []
+    for card in _select(doc, card_selector):
+        row = {'card_text': '\n'.join(_lines(card))}
+        for name, field in spec.items():
+            row[name] = _extract(card, field)
+        cards.append(row)
+    return cards
+
+
+def is_block_page(doc):
+    if doc is None:
+        return False
+    title = (doc.findtext('.//title') or '').lower()
+    if any(word in title for word in BLOCK_TITLE_WORDS):
+        return True
+    return any(_select(doc, s) for s in BLOCK_SELECTORS)
+
+
+def fetch_html(url, timeout=15):
+    """Plain HTTP GET; returns (html, seconds) with html None on failure"""
+    started = time.monotonic()
+    request = urllib.request.Request(url, headers={
+        'User-Agent': USER_AGENT,
+        'Accept': 'text/html,application/xhtml+xml',
+        'Accept-Language': 'en-CA,en;q=0.9',
+    })
+    try:
+        with urllib.request.urlopen(request, timeout=timeout) as response:
+            charset = response.headers.get_content_charset() or 'utf-8'
+            html = response.read().decode(charset, errors='replace')
+    except (URLError, OSError, ValueError) as e:
+        print(f"HTML fetch failed for {url}: {e}")
+        html = None
+    return html, time.monotonic() - started
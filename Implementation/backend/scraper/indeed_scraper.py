@@ -1,85 +1,177 @@
-import random
 from datetime import datetime
-from selenium import webdriver
 from selenium.webdriver.common.by import By
-from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from webdriver_manager.chrome import ChromeDriverManager
-import time
+from scraper.driver_pool import DriverPool
+from scraper.bulk_extract import extract_cards
+from scraper.pacing import Pacer
+from scraper.html_backend import fetch_html, parse_document, parse_cards, is_block_page
 import re
+from urllib.parse import urlparse, parse_qs
+
+INDEED_BASE_URL = "https://ca.indeed.com"
+RESULTS_PER_PAGE = 10
+
+# Card selectors, in fallback order
+JOB_CARD_SELECTOR = 'div.job_seen_beacon'
+TITLE_SELECTORS = ['h2.jobTitle a', 'h2 a']
+COMPANY_SELECTORS = ['[data-testid="company-name"]', '.companyName', '[class*="companyName"]']
+LOCATION_SELECTORS = ['[data-testid="text-location"]', '.companyLocation', '[class*="companyLocation"]']
+SALARY_SELECTORS = [
+    '[data-testid="attribute_snippet_testid"]',
+    '.salary-snippet-container',
+    '.metadata salary-snippet-container'
+]
+DESCRIPTION_SELECTORS = [
+    'div.job-snippet',
+    'div[class*="job-snippet"]',
+    'div[class*="snippet"]:not([class*="salary"])',  # not salary-snippet-container
+    'div[class*="summary"]',
+    'ul[style*="list-style-type:circle"]',
+    '.css-e9ucx3',  # From the HTML structure
+    '[data-testid="belowJobSnippet"]'
+]
+METADATA_SELECTORS = [
+    '[data-testid="attribute_snippet_testid"]',
+    '.metadata',
+    '.css-5ooe72'
+]
+
+# Field spec for the one-round-trip bulk extraction script
+JOB_CARD_SPEC = {
+    'title': {'selectors': TITLE_SELECTORS, 'mode': 'first'},
+    'company': {'selectors': COMPANY_SELECTORS, 'mode': 'first'},
+    'location': {'selectors': LOCATION_SELECTORS, 'mode': 'first'},
+    'link': {'selectors': TITLE_SELECTORS, 'mode': 'first', 'attr': 'href'},
+    'salary_texts': {'selectors': SALARY_SELECTORS, 'mode': 'each'},
+    'description_texts': {'selectors': DESCRIPTION_SELECTORS, 'mode': 'each'},
+    'metadata_texts': {'selectors': METADATA_SELECTORS, 'mode': 'all'},
+}
 
 class IndeedScraper:
-    def __init__(self, headless=True):
-        self.options = Options()
-        self.options.add_argument('--no-sandbox')
-        self.options.add_argument('--disable-dev-shm-usage')
-        self.options.add_argument('--window-size=1920,1080')
-        self.options.add_argument('--disable-blink-features=AutomationControlled')
-        self.options.add_argument('--disable-gpu')
-        self.options.add_argument('--disable-extensions')
-
-        self.options.add_argument(
-            'user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-        )
-        if headless:
-            self.options.add_argument('--headless')
-
-        self.driver = webdriver.Chrome(
-            service=Service(ChromeDriverManager().install()),
-            options=self.options
-        )
+    def __init__(self, headless=True, pool=None, rate_limiter=None, base_url=INDEED_BASE_URL,
+                 extraction_mode="bulk", pacer=None, backend="selenium"):
+        # Borrow browsers from a shared pool; fall back to a private one-driver pool
+        self.pool = pool or DriverPool(size=1, headless=headless)
+        self._owns_pool = pool is None
+        self.driver = None
+        self.rate_limiter = rate_limiter
+        self.base_url = base_url.rstrip('/')
+        # "bulk": one in-page script per page; "element": one WebDriver call per field
+        self.extraction_mode = extraction_mode
+        # Event-driven waits and adaptive request spacing
+        self.pacer = pacer or Pacer()
+        # "html": plain HTTP fetch + lxml parse, Selenium only when no cards come back
+        self.backend = backend
 
         self.jobs_data = []
 
-    def scrape_jobs(self, job_title, location="Canada"):
-        """Scrape ONLY PAGE 1 for one job title."""
-        self.jobs_data = []  # reset list
+    def scrape_jobs(self, job_title, location="Canada", max_pages=1, seen=None, stop_ratio=0.8):
+        """
+        Scrape result pages for one job title.
 
-        url = f"https://ca.indeed.com/jobs?q={job_title.replace(' ', '+')}&l={location}"
+        With a `seen` set of known links, only new postings are returned and
+        the crawl stops at the first page where at least `stop_ratio` of the
+        cards are already known.
+        """
+        self.jobs_data = []  # reset list
         print(f"\nScraping: {job_title}")
-        print(f"URL: {url}")
 
-        self.driver.get(url)
-        time.sleep(random.uniform(3, 5))
+        for page in range(max_pages):
+            url = f"{self.base_url}/jobs?q={job_title.replace(' ', '+')}&l={location}"
+            if page > 0:
+                url += f"&start={page * RESULTS_PER_PAGE}"
+            print(f"URL: {url}")
 
-        try:
-            WebDriverWait(self.driver, 10).until(
-                EC.presence_of_element_located((By.CSS_SELECTOR, "div.job_seen_beacon"))
-            )
-        except:
-            print("No job cards found.")
-            return []
+            page_jobs = self._scrape_page(url)
+            if not page_jobs:
+                break
 
-        self._handle_cookie_consent()
-        self._extract_page_jobs_improved()
+            if seen is None:
+                self.jobs_data.extend(page_jobs)
+                continue
+
+            new_jobs = [job for job in page_jobs if not self._is_known(job['link'], seen)]
+            for job in new_jobs:
+                if job['link'].startswith('http'):
+                    seen.add(job['link'])
+            self.jobs_data.extend(new_jobs)
+
+            known_ratio = 1 - len(new_jobs) / len(page_jobs)
+            if known_ratio >= stop_ratio:
+                print(f"Page {page + 1} is {known_ratio:.0%} already seen, stopping crawl")
+                break
 
         return self.jobs_data
 
+    def _is_known(self, link, seen):
+        # Postings without a link can't be matched, so treat them as new
+        return link.startswith('http') and link in seen
+
+    def _scrape_page(self, url):
+        """Scrape one results page, trying the browserless path first in html mode"""
+        if self.backend == "html":
+            page_jobs = self._scrape_html(url)
+            if page_jobs is None:
+                # The pacer has backed off; a browser sent to the same site now would be blocked too
+                return []
+            if page_jobs:
+                return page_jobs
+            print("No job cards in served HTML, falling back to Selenium")
+
+        with self.pool.driver() as driver:
+            self.driver = driver
+            try:
+                if self.rate_limiter:
+                    self.pacer.add_wait(self.rate_limiter.acquire(url))
+                ready = self.pacer.load(self.driver, url, JOB_CARD_SELECTOR)
+                self.pool.page_loaded(self.driver)
+
+                if not ready:
+                    print("No job cards found.")
+                    return []
+
+                self._handle_cookie_consent()
+                with self.pacer.working():
+                    return self._extract_page_jobs_improved()
+            finally:
+                self.driver = None
+
+    def _scrape_html(self, url):
+        """Browserless path: one HTTP request and an lxml parse; None when a block page is served"""
+        if self.rate_limiter:
+            self.pacer.add_wait(self.rate_limiter.acquire(url))
+        self.pacer.before_request()
+        html, seconds = fetch_html(url)
+        with self.pacer.working():
+            doc = parse_document(html)
+            blocked = is_block_page(doc)
+        self.pacer.record_load(seconds, blocked)
+        if blocked:
+            print("Block page served, backing off")
+            return None
+
+        with self.pacer.working():
+            return self._parse_document(doc)
+
+    def parse_html(self, html):
+        """Parse a saved or fetched results page into job records (no browser needed)"""
+        return self._parse_document(parse_document(html))
+
+    def _parse_document(self, doc):
+        jobs = []
+        for raw in parse_cards(doc, JOB_CARD_SELECTOR, JOB_CARD_SPEC):
+            job_info = self._build_job_info(raw)
+            if job_info:
+                jobs.append(job_info)
+        return jobs
+
+    def close(self):
+        """Quit the browser if this scraper owns its pool"""
+        if self._owns_pool:
+            self.pool.close()
+
     def _handle_cookie_consent(self):
         """Handle cookie consent popup if it appears"""
-        try:
-            cookie_selectors = [
-                'button[aria-label="reject"]',
-                'button[aria-label="Reject All"]',
-                'button#onetrust-reject-all-handler',
-                'button[data-testid="reject-button"]'
-            ]
-            
-            for selector in cookie_selectors:
-                try:
-                    reject_button = WebDriverWait(self.driver, 2).until(
-                        EC.element_to_be_clickable((By.CSS_SELECTOR, selector))
-                    )
-                    reject_button.click()
-                    print("Cookie consent handled")
-                    time.sleep(1)
-                    break
-                except:
-                    continue
-        except:
-            pass
+        self.pacer.dismiss_cookie_banner(self.driver)
 
     def _safe_extract(self, parent, selector, attribute='text'):
         try:
@@ -92,70 +184,114 @@ class IndeedScraper:
             return None
 
     def _extract_page_jobs_improved(self):
+        page_jobs = []
+        if self.extraction_mode == "bulk":
+            raw_cards = extract_cards(self.driver, JOB_CARD_SELECTOR, JOB_CARD_SPEC)
+            if raw_cards is not None:
+                print(f"Found {len(raw_cards)} job cards")
+                for raw in raw_cards:
+                    job_info = self._build_job_info(raw)
+                    if job_info:
+                        page_jobs.append(job_info)
+                return page_jobs
+
         try:
-            job_cards = self.driver.find_elements(By.CSS_SELECTOR, 'div.job_seen_beacon')
+            job_cards = self.driver.find_elements(By.CSS_SELECTOR, JOB_CARD_SELECTOR)
             print(f"Found {len(job_cards)} job cards")
             
-            for i, card in enumerate(job_cards):
-                # Add delay to avoid being blocked
-                if i > 0 and i % 3 == 0:
-                    time.sleep(random.uniform(1, 2))
-                
+            for card in job_cards:
                 job_info = self._extract_job_info_improved(card)
                 if job_info:
-                    self.jobs_data.append(job_info)
+                    page_jobs.append(job_info)
                     
         except Exception as e:
             print(f"Error extracting jobs: {e}")
 
+        return page_jobs
+
+    def _first_text(self, card, selectors, attribute='text'):
+        """Value of the first selector that yields something, like the JS 'first' mode"""
+        for selector in selectors:
+            value = self._safe_extract(card, selector, attribute)
+            if value:
+                return value
+        return None
+
     def _extract_job_info_improved(self, card):
+        """Element mode: one WebDriver call per field/selector, read lazily"""
+        try:
+            card_text = None
+
+            def get_card_text():
+                nonlocal card_text
+                if card_text is None:
+                    card_text = card.text
+                return card_text
+
+            def metadata_texts():
+                for selector in METADATA_SELECTORS:
+                    try:
+                        for element in card.find_elements(By.CSS_SELECTOR, selector):
+                            yield element.text
+                    except:
+                        continue
+
+            raw = {
+                'title': self._first_text(card, TITLE_SELECTORS),
+                'company': self._first_text(card, COMPANY_SELECTORS),
+                'location': self._first_text(card, LOCATION_SELECTORS),
+                'link': self._first_text(card, TITLE_SELECTORS, 'href'),
+                'salary_texts': (self._safe_extract(card, s) for s in SALARY_SELECTORS),
+                'description_texts': (self._safe_extract(card, s) for s in DESCRIPTION_SELECTORS),
+                'metadata_texts': metadata_texts(),
+                'card_text': get_card_text,
+            }
+            return self._build_job_info(raw)
+
+        except Exception as e:
+            print(f"Error extracting job info: {e}")
+
+        return None
+
+    def _build_job_info(self, raw):
+        """
+        Turn raw card fields into a job record.
+
+        `raw` comes either from the bulk script payload or from element mode;
+        card_text may be a string or a zero-argument callable.
+        """
         try:
-            # Extract basic info first
-            title = self._safe_extract(card, 'h2.jobTitle a', 'text')
-            if not title:
-                title = self._safe_extract(card, 'h2 a', 'text')
+            card_text = raw.get('card_text') or ''
+            get_card_text = card_text if callable(card_text) else (lambda: card_text)
+
+            title = raw.get('title')
             if title:
                 title = re.sub(r'^New\s*', '', title).strip()
-            
-            company = self._safe_extract(card, '[data-testid="company-name"]', 'text')
-            if not company:
-                company = self._safe_extract(card, '.companyName', 'text')
-            if not company:
-                company = self._safe_extract(card, '[class*="companyName"]', 'text')
-            
-            location = self._safe_extract(card, '[data-testid="text-location"]', 'text')
-            if not location:
-                location = self._safe_extract(card, '.companyLocation', 'text')
-            if not location:
-                location = self._safe_extract(card, '[class*="companyLocation"]', 'text')
-            
+
+            company = raw.get('company')
+            location = raw.get('location')
+
             # Now extract description using the basic info we have
-            description = self._extract_job_description_improved(card, title, company, location)
-            
+            description = self._extract_job_description_improved(
+                raw.get('description_texts') or [], get_card_text, title, company, location
+            )
+
             # Salary - Improved extraction
             salary = "Salary not specified"
-            salary_selectors = [
-                '[data-testid="attribute_snippet_testid"]',
-                '.salary-snippet-container',
-                '.metadata salary-snippet-container'
-            ]
-            
-            for selector in salary_selectors:
-                salary_text = self._safe_extract(card, selector, 'text')
+            for salary_text in raw.get('salary_texts') or []:
                 if salary_text and ('$' in salary_text or 'hour' in salary_text.lower() or 'year' in salary_text.lower()):
                     salary = salary_text
                     break
-            
+
             # Link
-            link = self._safe_extract(card, 'h2.jobTitle a', 'href')
-            if not link:
-                link = self._safe_extract(card, 'h2 a', 'href')
+            link = raw.get('link')
             if link and link.startswith('/'):
-                link = 'https://ca.indeed.com' + link
-            
+                link = self.base_url + link
+            link = self._canonical_link(link)
+
             # Job Type - Improved extraction
-            job_type = self._extract_job_type_improved(card)
-            
+            job_type = self._extract_job_type_improved(raw.get('metadata_texts') or [], get_card_text)
+
             if title:
                 return {
                     'title': title,
@@ -167,35 +303,33 @@ class IndeedScraper:
                     'description': description or "Description not available",
                     'scraped_date': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
                 }
-                
+
         except Exception as e:
             print(f"Error extracting job info: {e}")
-        
+
         return None
 
-    def _extract_job_description_improved(self, card, title, company, location):
+    def _canonical_link(self, link):
+        """Reduce tracking links to the stable job key so re-scrapes match"""
+        if not link:
+            return link
+        job_key = parse_qs(urlparse(link).query).get('jk')
+        if job_key:
+            return f"{self.base_url}/viewjob?jk={job_key[0]}"
+        return link
+
+    def _extract_job_description_improved(self, description_texts, get_card_text, title, company, location):
         """Improved job description extraction with proper parameters"""
         try:
             # Try the job snippet/summary section first
-            description_selectors = [
-                'div.job-snippet',
-                'div[class*="job-snippet"]',
-                'div[class*="snippet"]',
-                'div[class*="summary"]',
-                'ul[style*="list-style-type:circle"]',
-                '.css-e9ucx3',  # From the HTML structure
-                '[data-testid="belowJobSnippet"]'
-            ]
-            
-            for selector in description_selectors:
-                description = self._safe_extract(card, selector, 'text')
+            for description in description_texts:
                 if description and len(description.strip()) > 20:
                     description = description.strip()
                     description = re.sub(r'\s+', ' ', description)
                     return description[:1000]  # Limit to 1000 characters
             
             # Try to extract from the entire card text with better filtering
-            card_text = card.text
+            card_text = get_card_text()
             if card_text:
                 lines = [line.strip() for line in card_text.split('\n') if line.strip()]
                 
@@ -239,37 +373,26 @@ class IndeedScraper:
             print(f"Error extracting description: {e}")
             return "Error extracting description"
 
-    def _extract_job_type_improved(self, card):
+    def _extract_job_type_improved(self, metadata_texts, get_card_text):
         """Improved job type extraction"""
         try:
-            card_text = card.text.lower()
+            card_text = get_card_text().lower()
             
             # Check for job type in metadata
-            metadata_selectors = [
-                '[data-testid="attribute_snippet_testid"]',
-                '.metadata',
-                '.css-5ooe72'
-            ]
-            
-            for selector in metadata_selectors:
-                try:
-                    elements = card.find_elements(By.CSS_SELECTOR, selector)
-                    for element in elements:
-                        text = element.text.lower()
-                        if 'full-time' in text:
-                            return 'Full-time'
-                        elif 'part-time' in text:
-                            return 'Part-time'
-                        elif 'contract' in text:
-                            return 'Contract'
-                        elif 'temporary' in text:
-                            return 'Temporary'
-                        elif 'permanent' in text:
-                            return 'Permanent'
-                        elif 'remote' in text:
-                            return 'Remote'
-                except:
-                    continue
+            for text in metadata_texts:
+                text = (text or '').lower()
+                if 'full-time' in text:
+                    return 'Full-time'
+                elif 'part-time' in text:
+                    return 'Part-time'
+                elif 'contract' in text:
+                    return 'Contract'
+                elif 'temporary' in text:
+                    return 'Temporary'
+                elif 'permanent' in text:
+                    return 'Permanent'
+                elif 'remote' in text:
+                    return 'Remote'
             
             # Fallback to text analysis
             if 'full-time' in card_text:
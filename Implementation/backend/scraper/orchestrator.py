@@ -0,0 +1,128 @@
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from scraper.indeed_scraper import IndeedScraper, INDEED_BASE_URL
+from scraper.coursera_scraper import CourseraScraper, COURSERA_BASE_URL
+from scraper.rate_limit import DomainRateLimiter
+from scraper.pacing import Pacer
+
+
+class ScrapeOrchestrator:
+    """
+    Scrape several job titles concurrently on a bounded worker pool.
+
+    Each title becomes two independent tasks (Indeed and Coursera) so both
+    sites are worked in parallel, while the shared DomainRateLimiter keeps
+    every site within its politeness limit. Results are handed to
+    `on_result` on the calling thread, so database writes stay serial;
+    with a `pipeline`, workers instead push records into the ingest queue
+    and are slowed down by its backpressure.
+    """
+
+    def __init__(self, pool, rate_limiter=None, max_workers=2, location="Canada", backend="html",
+                 max_pages=1, seen_jobs=None, seen_courses=None, pipeline=None, course_cache=None,
+                 indeed_base_url=INDEED_BASE_URL, coursera_base_url=COURSERA_BASE_URL):
+        self.pool = pool
+        self.rate_limiter = rate_limiter or DomainRateLimiter()
+        self.max_workers = max_workers
+        self.location = location
+        self.backend = backend
+        # Incremental crawl: follow up to max_pages, stop once pages are mostly seen
+        self.max_pages = max_pages
+        self.seen_jobs = seen_jobs
+        self.seen_courses = seen_courses
+        # Optional IngestPipeline; workers push results straight into it
+        self.pipeline = pipeline
+        # Optional CourseQueryCache; fresh queries skip Coursera entirely
+        self.course_cache = course_cache
+        self.indeed_base_url = indeed_base_url
+        self.coursera_base_url = coursera_base_url
+        # One pacer per site so delays adapt to that site's own response times
+        self.pacers = {"indeed": Pacer(), "coursera": Pacer()}
+
+    def _scrape_indeed(self, title):
+        scraper = IndeedScraper(pool=self.pool, rate_limiter=self.rate_limiter,
+                                base_url=self.indeed_base_url, pacer=self.pacers["indeed"],
+                                backend=self.backend)
+        jobs = scraper.scrape_jobs(job_title=title, location=self.location,
+                                   max_pages=self.max_pages, seen=self.seen_jobs)
+        if self.pipeline is not None:
+            self.pipeline.put_many("jobs", title, jobs)
+        return jobs
+
+    def _scrape_coursera(self, title):
+        if self.course_cache is not None and self.course_cache.is_fresh(title):
+            print(f"Coursera results for {title} are cached, skipping")
+            return []
+
+        scraper = CourseraScraper(pool=self.pool, rate_limiter=self.rate_limiter,
+                                  base_url=self.coursera_base_url, pacer=self.pacers["coursera"],
+                                  backend=self.backend)
+        courses = scraper.scrape_courses(query=title, max_pages=self.max_pages,
+                                         seen=self.seen_courses)
+        if self.course_cache is not None:
+            # Cache what the pages listed, not what the seen-set let through
+            new_courses = self.course_cache.store(title, scraper.listed_courses)
+            if self.seen_courses is None:
+                courses = new_courses
+        if self.pipeline is not None:
+            self.pipeline.put_many("courses", title, courses)
+        return courses
+
+    def run(self, titles, on_result=None):
+        """
+        Scrape all titles and return a run report.
+
+        on_result(source, title, records) is called for every finished task,
+        where source is "indeed" or "coursera".
+        """
+        started = time.monotonic()
+        for pacer in self.pacers.values():
+            pacer.reset_stats()
+        tasks = {"indeed": self._scrape_indeed, "coursera": self._scrape_coursera}
+        records = {"indeed": 0, "coursera": 0}
+        failures = []
+        failed_titles = set()
+
+        with ThreadPoolExecutor(max_workers=self.max_workers,
+                                thread_name_prefix="scrape") as executor:
+            futures = {
+                executor.submit(fn, title): (source, title)
+                for title in titles
+                for source, fn in tasks.items()
+            }
+
+            for future in as_completed(futures):
+                source, title = futures[future]
+                try:
+                    result = future.result() or []
+                except Exception as e:
+                    print(f"{source} scrape failed for {title}: {e}")
+                    failures.append({"source": source, "title": title, "error": str(e)})
+                    failed_titles.add(title)
+                    continue
+
+                records[source] += len(result)
+                if on_result is not None:
+                    on_result(source, title, result)
+
+        elapsed = time.monotonic() - started
+        completed = len(titles) - len(failed_titles)
+        report = {
+            "titles": len(titles),
+            "completed_titles": completed,
+            "failures": failures,
+            "jobs": records["indeed"],
+            "courses": records["coursera"],
+            "elapsed_seconds": round(elapsed, 2),
+            "titles_per_hour": round(completed * 3600 / elapsed, 2) if elapsed > 0 else 0.0,
+            # Time spent waiting on pages/politeness vs. extracting, per site
+            "pacing": {source: pacer.report() for source, pacer in self.pacers.items()},
+        }
+        if self.course_cache is not None:
+            report["course_cache"] = self.course_cache.report()
+        print(f"Scrape run: {completed}/{len(titles)} titles in {report['elapsed_seconds']}s "
+              f"({report['titles_per_hour']} titles/hour, {len(failures)} failures)")
+        for source, stats in report["pacing"].items():
+            print(f"  {source}: {stats['waiting_seconds']}s waiting, {stats['working_seconds']}s working, "
+                  f"{stats['pages']} pages, {stats['blocks']} blocks")
+        return report
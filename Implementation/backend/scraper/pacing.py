@@ -0,0 +1,158 @@
+import threading
+import time
+from contextlib import contextmanager
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support.ui import WebDriverWait
+from selenium.webdriver.support import expected_conditions as EC
+
+COOKIE_BANNER_SELECTORS = [
+    'button[aria-label="reject"]',
+    'button[aria-label="Reject All"]',
+    'button#onetrust-reject-all-handler',
+    'button[data-testid="reject-button"]'
+]
+
+# Markers of a captcha / bot-check page instead of real results
+BLOCK_SELECTORS = [
+    'iframe[src*="captcha"]',
+    'iframe[title*="challenge"]',
+    '#challenge-form',
+    '#px-captcha',
+    'div.g-recaptcha'
+]
+BLOCK_TITLE_WORDS = ['captcha', 'just a moment', 'verify you are human', 'access denied', 'blocked']
+
+
+class Pacer:
+    """
+    Event-driven waits and adaptive politeness delays for one site.
+
+    Instead of fixed random sleeps, the pacer waits for the page condition
+    the scraper actually needs, spaces requests by a delay derived from the
+    observed load times, and backs off exponentially when a block page is
+    seen. It also tracks time spent waiting vs. working per run.
+    """
+
+    def __init__(self, min_delay=0.5, max_delay=30.0, delay_factor=0.5, smoothing=0.3):
+        self.min_delay = min_delay
+        self.max_delay = max_delay
+        self.delay_factor = delay_factor
+        self.smoothing = smoothing
+
+        self._lock = threading.Lock()
+        self._avg_load = None
+        self._backoff = 1.0
+        self._next_request_at = 0.0
+        self.reset_stats()
+
+    def reset_stats(self):
+        with self._lock:
+            self.stats = {"pages": 0, "blocks": 0, "waiting_seconds": 0.0, "working_seconds": 0.0}
+
+    def add_wait(self, seconds):
+        with self._lock:
+            self.stats["waiting_seconds"] += seconds
+
+    @contextmanager
+    def working(self):
+        """Count the enclosed block as working time"""
+        started = time.monotonic()
+        try:
+            yield
+        finally:
+            with self._lock:
+                self.stats["working_seconds"] += time.monotonic() - started
+
+    def current_delay(self):
+        with self._lock:
+            base = self.min_delay if self._avg_load is None else self._avg_load * self.delay_factor
+            return min(self.max_delay, max(self.min_delay, base * self._backoff))
+
+    def before_request(self):
+        """Sleep only as long as needed to keep the adaptive spacing between requests"""
+        delay = self.current_delay()
+        with self._lock:
+            now = time.monotonic()
+            wait = max(0.0, self._next_request_at - now)
+            self._next_request_at = max(now, self._next_request_at) + delay
+        if wait > 0:
+            time.sleep(wait)
+            self.add_wait(wait)
+
+    def record_load(self, seconds, blocked=False):
+        """Feed one page load time into the adaptive delay"""
+        with self._lock:
+            self.stats["pages"] += 1
+            self.stats["waiting_seconds"] += seconds
+            if blocked:
+                self.stats["blocks"] += 1
+                self._backoff = min(self._backoff * 2, 64.0)
+            else:
+                self._backoff = max(1.0, self._backoff * 0.75)
+                if self._avg_load is None:
+                    self._avg_load = seconds
+                else:
+                    self._avg_load += self.smoothing * (seconds - self._avg_load)
+
+    def is_blocked(self, driver):
+        try:
+            title = (driver.title or "").lower()
+            if any(word in title for word in BLOCK_TITLE_WORDS):
+                return True
+            return bool(driver.find_elements(By.CSS_SELECTOR, ", ".join(BLOCK_SELECTORS)))
+        except Exception:
+            return False
+
+    def load(self, driver, url, ready_selector, timeout=10):
+        """
+        Open url and wait until ready_selector or a block page shows up.
+
+        Returns True when the ready condition was met.
+        """
+        self.before_request()
+        started = time.monotonic()
+        watched = ", ".join([ready_selector] + BLOCK_SELECTORS)
+
+        ready = False
+        blocked = False
+        try:
+            driver.get(url)
+            WebDriverWait(driver, timeout).until(
+                lambda d: d.find_elements(By.CSS_SELECTOR, watched)
+            )
+            blocked = self.is_blocked(driver)
+            ready = not blocked
+        except Exception:
+            blocked = self.is_blocked(driver)
+
+        self.record_load(time.monotonic() - started, blocked)
+        if blocked:
+            print(f"Block page detected, backing off to {self.current_delay():.1f}s between requests")
+        return ready
+
+    def dismiss_cookie_banner(self, driver, selectors=COOKIE_BANNER_SELECTORS):
+        """Check all banner buttons with one query and click the first visible one"""
+        started = time.monotonic()
+        try:
+            for button in driver.find_elements(By.CSS_SELECTOR, ", ".join(selectors)):
+                if button.is_displayed() and button.is_enabled():
+                    button.click()
+                    try:
+                        WebDriverWait(driver, 2).until(EC.staleness_of(button))
+                    except Exception:
+                        pass
+                    print("Cookie consent handled")
+                    return True
+        except Exception:
+            pass
+        finally:
+            self.add_wait(time.monotonic() - started)
+        return False
+
+    def report(self):
+        with self._lock:
+            stats = dict(self.stats)
+        stats["waiting_seconds"] = round(stats["waiting_seconds"], 2)
+        stats["working_seconds"] = round(stats["working_seconds"], 2)
+        stats["current_delay"] = round(self.current_delay(), 2)
+        return stats
@@ -0,0 +1,250 @@
+import queue
+import re
+import threading
+import time
+from database.database import PathfinderDatabase
+from database.title_canonicalizer import TitleCanonicalizer
+
+_STOP = object()
+
+
+class _StageTimer:
+    """Count / total / max latency of one pipeline stage"""
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def observe(self, seconds):
+        self.count += 1
+        self.total += seconds
+        self.max = max(self.max, seconds)
+
+    def summary(self):
+        return {
+            "count": self.count,
+            "avg_ms": round(self.total / self.count * 1000, 2) if self.count else 0.0,
+            "max_ms": round(self.max * 1000, 2),
+        }
+
+
+class IngestPipeline:
+    """
+    Producer/consumer ingest: scrape -> normalize/dedupe -> batched DB writer.
+
+    Scraper threads put() raw records into a bounded queue; put() blocks when
+    the queue is full, so scrapers slow down when the writer falls behind.
+    A single writer thread owns the SQLite connection and commits once per
+    batch (batch_size records or flush_interval seconds, whichever first),
+    so more scraper concurrency never means more writers on the file.
+
+    on_saved(kind, title, added) is called from the writer thread after each
+    commit, kind being "jobs" or "courses".
+
+    If the writer can't go on (the database won't open), it keeps draining
+    and dropping records so close() still returns, and put() raises from
+    then on so scrapers stop instead of scraping into nothing.
+    """
+
+    def __init__(self, db_path="pathfinder_db.sqlite", queue_size=500, batch_size=200,
+                 flush_interval=2.0, on_saved=None, canonicalizer=None):
+        self.db_path = db_path
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.on_saved = on_saved
+        # Raw titles are mapped onto the taxonomy here, off the writer thread
+        self.canonicalizer = canonicalizer or TitleCanonicalizer()
+
+        self._raw = queue.Queue(maxsize=queue_size)
+        self._normalized = queue.Queue(maxsize=queue_size)
+        self._seen = {"jobs": set(), "courses": set()}
+        self._lock = threading.Lock()
+        self._threads = []
+        self._writer_error = None
+        self._stopped = False
+
+        self.counters = {"received": 0, "duplicates": 0, "invalid": 0, "written": 0, "batches": 0, "dropped": 0}
+        self.timers = {"enqueue_wait": _StageTimer(), "normalize": _StageTimer(), "write_batch": _StageTimer()}
+
+    # Producer side
+
+    def start(self):
+        self._threads = [
+            threading.Thread(target=self._normalize_loop, name="ingest-normalize", daemon=True),
+            threading.Thread(target=self._writer_loop, name="ingest-writer", daemon=True),
+        ]
+        for thread in self._threads:
+            thread.start()
+        return self
+
+    def put(self, kind, title, record):
+        """Queue one raw record; blocks while the pipeline is full (backpressure)"""
+        if self._writer_error is not None:
+            raise RuntimeError(f"Ingest writer failed: {self._writer_error}")
+        started = time.monotonic()
+        self._raw.put((kind, title, record))
+        with self._lock:
+            self.counters["received"] += 1
+            self.timers["enqueue_wait"].observe(time.monotonic() - started)
+
+    def put_many(self, kind, title, records):
+        for record in records:
+            self.put(kind, title, record)
+
+    def close(self):
+        """Flush everything still queued and stop the stage threads"""
+        self._raw.put(_STOP)
+        for thread in self._threads:
+            thread.join()
+        self._threads = []
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.close()
+
+    # Normalize / dedupe stage
+
+    def _clean(self, value):
+        if isinstance(value, str):
+            value = re.sub(r'\s+', ' ', value).strip()
+            return value or None
+        return value
+
+    def _normalize(self, kind, record):
+        record = {key: self._clean(value) for key, value in record.items()}
+        if kind == "jobs":
+            if not record.get("title"):
+                return None, None
+            link = record.get("link")
+            if not link or not link.startswith("http"):
+                record["link"] = None
+            key = record["link"] or (record["title"], record.get("company"), record.get("description"))
+            record["canonical_title"] = self.canonicalizer.canonical(record["title"])
+        else:
+            if not record.get("course_title"):
+                return None, None
+            key = record.get("url") or (record["course_title"], record.get("organization"))
+        return record, key
+
+    def _normalize_loop(self):
+        while True:
+            item = self._raw.get()
+            if item is _STOP:
+                self._normalized.put(_STOP)
+                return
+
+            started = time.monotonic()
+            kind, title, raw = item
+            kind = "jobs" if kind in ("jobs", "indeed") else "courses"
+            record, key = self._normalize(kind, raw)
+
+            with self._lock:
+                if record is None:
+                    self.counters["invalid"] += 1
+                elif key in self._seen[kind]:
+                    self.counters["duplicates"] += 1
+                    record = None
+                else:
+                    self._seen[kind].add(key)
+                self.timers["normalize"].observe(time.monotonic() - started)
+
+            if record is not None:
+                self._normalized.put((kind, title, record))
+
+    # Batched writer stage
+
+    def _flush(self, db, batch):
+        if not batch:
+            return
+        started = time.monotonic()
+
+        # Group per (kind, title) so callers get per-title counts, one commit overall
+        groups = {}
+        for kind, title, record in batch:
+            groups.setdefault((kind, title), []).append(record)
+
+        saved = []
+        try:
+            for (kind, title), records in groups.items():
+                if kind == "jobs":
+                    added = db.save_jobs(records, commit=False)
+                else:
+                    added = db.save_courses(records, commit=False)
+                saved.append((kind, title, added))
+            db.connection.commit()
+        except Exception as e:
+            # Drop the batch rather than killing the writer and blocking every scraper
+            print(f"Batch write failed, dropping {len(batch)} records: {e}")
+            try:
+                db.connection.rollback()
+            except Exception as rollback_error:
+                print(f"Rollback failed: {rollback_error}")
+            saved = []
+        batch.clear()
+
+        with self._lock:
+            self.counters["written"] += sum(added for _, _, added in saved)
+            self.counters["batches"] += 1
+            self.timers["write_batch"].observe(time.monotonic() - started)
+
+        if self.on_saved is not None:
+            for kind, title, added in saved:
+                self.on_saved(kind, title, added)
+
+    def _write(self, db):
+        """Batch and commit normalized records until _STOP"""
+        batch = []
+        deadline = time.monotonic() + self.flush_interval
+        while True:
+            timeout = max(0.0, deadline - time.monotonic())
+            try:
+                item = self._normalized.get(timeout=timeout)
+            except queue.Empty:
+                item = None
+
+            if item is _STOP:
+                self._stopped = True
+                self._flush(db, batch)
+                return
+            if item is not None:
+                batch.append(item)
+
+            if len(batch) >= self.batch_size or time.monotonic() >= deadline:
+                self._flush(db, batch)
+                deadline = time.monotonic() + self.flush_interval
+
+    def _writer_loop(self):
+        # The connection is created here so it belongs to the writer thread
+        db = PathfinderDatabase(self.db_path)
+        try:
+            if not db.connect():
+                raise RuntimeError(f"could not open {db.db_path}")
+            self._write(db)
+        except Exception as e:
+            print(f"Ingest writer stopped, dropping queued records: {e}")
+            self._writer_error = e
+            # Keep the normalize stage (and through it the scrapers) from blocking on a full queue
+            while not self._stopped:
+                item = self._normalized.get()
+                if item is _STOP:
+                    self._stopped = True
+                else:
+                    with self._lock:
+                        self.counters["dropped"] += 1
+        finally:
+            if db.connection is not None:
+                db.connection.close()
+
+    def stats(self):
+        """Queue depths, counters and per-stage latencies"""
+        with self._lock:
+            return {
+                "raw_queue_depth": self._raw.qsize(),
+                "write_queue_depth": self._normalized.qsize(),
+                "writer_error": None if self._writer_error is None else str(self._writer_error),
+                **self.counters,
+                "stages": {name: timer.summary() for name, timer in self.timers.items()},
+            }
@@ -0,0 +1,63 @@
+import threading
+import time
+from urllib.parse import urlparse
+
+# Politeness limits per site: (requests per second, burst)
+DEFAULT_DOMAIN_LIMITS = {
+    "ca.indeed.com": (0.2, 2),
+    "www.coursera.org": (0.5, 2),
+}
+DEFAULT_LIMIT = (0.5, 1)
+
+
+class TokenBucket:
+    """Thread-safe token bucket; acquire() blocks until a token is available"""
+
+    def __init__(self, rate, capacity):
+        self.rate = float(rate)
+        self.capacity = float(capacity)
+        self._tokens = float(capacity)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self, now):
+        elapsed = now - self._updated
+        self._tokens = min(self.capacity, self._tokens + elapsed * self.rate)
+        self._updated = now
+
+    def acquire(self, tokens=1):
+        """Take tokens, sleeping as needed. Returns seconds spent waiting."""
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._refill(now)
+                if self._tokens >= tokens:
+                    self._tokens -= tokens
+                    return waited
+                delay = (tokens - self._tokens) / self.rate
+            time.sleep(delay)
+            waited += delay
+
+
+class DomainRateLimiter:
+    """One token bucket per domain, created on first use"""
+
+    def __init__(self, limits=None, default=DEFAULT_LIMIT):
+        self.limits = dict(DEFAULT_DOMAIN_LIMITS if limits is None else limits)
+        self.default = default
+        self._buckets = {}
+        self._lock = threading.Lock()
+
+    def bucket_for(self, domain):
+        with self._lock:
+            bucket = self._buckets.get(domain)
+            if bucket is None:
+                rate, burst = self.limits.get(domain, self.default)
+                bucket = TokenBucket(rate, burst)
+                self._buckets[domain] = bucket
+            return bucket
+
+    def acquire(self, url):
+        """Block until a request to the URL's domain is allowed"""
+        return self.bucket_for(urlparse(url).netloc).acquire()
@@ -0,0 +1,86 @@
+# tasks.py
+# Background jobs; run by scheduler.py in its worker processes, never by the API
+from database.database import PathfinderDatabase
+from scraper.driver_pool import DriverPool
+from scraper.orchestrator import ScrapeOrchestrator
+from scraper.rate_limit import DomainRateLimiter
+from scraper.frontier import CrawlFrontier
+from scraper.pipeline import IngestPipeline
+from scraper.course_cache import CourseQueryCache
+from database.job_titles import COMMON_JOB_TITLES
+from ml_models.job_model import train_model
+from ml_models.similar_index import update_posting_index
+from ml_models.recommend_snapshot import publish_snapshot
+
+# Titles scraped per hourly run and how many scrape tasks run at once
+TITLES_PER_RUN = 4
+SCRAPE_WORKERS = 2
+# Result pages followed per title; the crawl stops early at already-seen pages
+MAX_PAGES_PER_TITLE = 5
+# Coursera catalogs change slowly; a query is re-scraped only after this
+COURSE_CACHE_TTL_HOURS = 24 * 14
+
+# Browsers are started once per worker process and reused by every hourly run
+driver_pool = DriverPool(size=SCRAPE_WORKERS, headless=True, max_pages=50)
+rate_limiter = DomainRateLimiter()
+
+# Main hourly scraping job
+def run_hourly_scraper():
+    db = PathfinderDatabase("pathfinder_db.sqlite")
+    db.connect()
+
+    # Pick the stalest / most needed titles instead of cycling from the top
+    frontier = CrawlFrontier(db.connection)
+    frontier.sync(COMMON_JOB_TITLES)
+    titles = frontier.next_titles(TITLES_PER_RUN)
+    frontier.mark_attempted(titles)
+    print(f"Running scraper for: {', '.join(titles)}")
+
+    new_jobs = {title: 0 for title in titles}
+    inserted = {"jobs": 0, "courses": 0}
+
+    def record_saved(kind, job_title, added):
+        # Called from the pipeline's writer thread after each batch commit
+        inserted[kind] += added
+        if kind == "jobs":
+            new_jobs[job_title] += added
+        print(f"Added {added} new {kind} for {job_title} to database.")
+
+    seen_jobs = db.seen_set("jobs", "link")
+    seen_courses = db.seen_set("courses", "url")
+    course_cache = CourseQueryCache(db.db_path, ttl_hours=COURSE_CACHE_TTL_HOURS)
+    pipeline = IngestPipeline(on_saved=record_saved)
+    orchestrator = ScrapeOrchestrator(driver_pool, rate_limiter=rate_limiter,
+                                      max_workers=SCRAPE_WORKERS, max_pages=MAX_PAGES_PER_TITLE,
+                                      seen_jobs=seen_jobs, seen_courses=seen_courses,
+                                      pipeline=pipeline, course_cache=course_cache)
+    try:
+        with pipeline:
+            report = orchestrator.run(titles)
+    finally:
+        seen_jobs.close()
+        seen_courses.close()
+        course_cache.close()
+
+    # Record the scrape before the index and snapshot steps, which can fail on their own
+    failed_titles = {failure["title"] for failure in report["failures"]}
+    for title in titles:
+        frontier.record(title, new_jobs[title], failed=title in failed_titles)
+
+    report["ingest"] = pipeline.stats()
+    # Per-table insert counts; exported by the API's /metrics from job_runs
+    report["inserted"] = inserted
+    print(f"Ingest: {report['ingest']}")
+
+    # New postings become searchable through /similar without waiting for retraining
+    report["indexed_postings"] = update_posting_index(db.connection)
+    # API workers map the new snapshot on their next check; nothing restarts
+    report["recommendation_snapshot"] = publish_snapshot(db.connection)
+    return report
+
+
+def run_monthly_training():
+    print("Starting monthly model training...")
+    summary = train_model()
+    print("model training completed successfully.")
+    return summary
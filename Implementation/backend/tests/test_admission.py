@@ -0,0 +1,34 @@
+"""AdaptiveLimit probes at a fraction of its limit, never below min_limit"""
+import time
+
+from admission import AdaptiveLimit
+
+
+def _finish_probe(limit, seconds=0.05):
+    admitted_at = time.monotonic()
+    for _ in range(limit.probe_window):
+        limit.observe(seconds, admitted_at, limit.current())
+
+
+def test_probe_keeps_a_fraction_of_the_limit():
+    limit = AdaptiveLimit(initial=32, min_limit=8, probe_fraction=0.5)
+    # Starts with a probe
+    assert limit.current() == 16
+    _finish_probe(limit)
+    assert limit.current() == 32
+    assert abs(limit.baseline - 0.05) < 1e-9
+
+
+def test_probe_never_goes_below_min_limit():
+    limit = AdaptiveLimit(initial=32, min_limit=24, probe_fraction=0.25)
+    assert limit.current() == 24
+
+
+def test_slow_windows_shrink_the_limit_down_to_min_limit():
+    limit = AdaptiveLimit(initial=64, min_limit=32, probe_interval=3600)
+    _finish_probe(limit)
+    for _ in range(20):
+        admitted_at = time.monotonic()
+        for _ in range(int(limit.limit)):
+            limit.observe(0.5, admitted_at, int(limit.limit))
+    assert limit.current() == 32
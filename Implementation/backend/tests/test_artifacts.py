@@ -0,0 +1,62 @@
+"""Model, vectorizer and encoder go live together through the release manifest"""
+import os
+
+import joblib
+import numpy as np
+import pytest
+from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.linear_model import LogisticRegression
+from sklearn.preprocessing import LabelEncoder
+
+from ml_models import artifacts
+
+
+@pytest.fixture
+def workspace(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "ml_models").mkdir()
+    return tmp_path
+
+
+def _training(labels):
+    texts = [f"{label} work {i}" for i in range(4) for label in labels]
+    tfidf = TfidfVectorizer().fit(texts)
+    le = LabelEncoder().fit(labels)
+    y = le.transform([label for _ in range(4) for label in labels])
+    model = LogisticRegression().fit(tfidf.transform(texts), y)
+    return model, tfidf, le
+
+
+def test_loose_pickles_until_the_first_release(workspace):
+    model, tfidf, le = _training(["cook", "nurse"])
+    for obj, path in ((model, artifacts.MODEL_PATH), (tfidf, artifacts.TFIDF_PATH), (le, artifacts.LABEL_ENCODER_PATH)):
+        joblib.dump(obj, path)
+
+    store = artifacts.ArtifactStore()
+    store.load()
+    assert list(store.label_encoder.classes_) == ["cook", "nurse"]
+    assert isinstance(store.version, tuple)
+
+
+def test_release_replaces_all_three_at_once(workspace):
+    store = artifacts.ArtifactStore(check_interval=0)
+    first = artifacts.publish_artifacts(*_training(["cook", "nurse"]))
+    store.load()
+    assert store.version == first
+
+    second = artifacts.publish_artifacts(*_training(["cook", "nurse", "welder"]))
+    assert second != first
+    assert store.reload_if_changed()
+    assert store.version == second
+    # Vocabulary, encoder and model are the second training's
+    assert list(store.label_encoder.classes_) == ["cook", "nurse", "welder"]
+    assert "welder" in store.tfidf.vocabulary_
+    labels, _ = store.scorer.top_k(store.scorer.logits(store.vectorizer.transform([("welder", (), ())])), 3)
+    assert sorted(labels[0]) == ["cook", "nurse", "welder"]
+    assert not store.reload_if_changed()
+
+
+def test_old_releases_are_pruned(workspace):
+    releases = [artifacts.publish_artifacts(*_training(["cook", "nurse"])) for _ in range(4)]
+    assert sorted(os.listdir(artifacts.RELEASES_DIR)) == releases[-2:]
+    assert artifacts.artifact_paths()[0] == releases[-1]
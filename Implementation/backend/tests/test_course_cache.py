@@ -0,0 +1,72 @@
+"""Coursera query cache: all-known rescrapes refresh it, failed ones don't"""
+import json
+import os
+
+import pytest
+
+from scraper.course_cache import CourseQueryCache
+from scraper.coursera_scraper import CourseraScraper
+from scraper.orchestrator import ScrapeOrchestrator
+
+FIXTURES = os.path.join(os.path.dirname(__file__), "fixtures")
+
+
+@pytest.fixture
+def served(monkeypatch):
+    """CourseraScraper pages come from the saved search page, or nothing"""
+    with open(os.path.join(FIXTURES, "coursera_search.html"), encoding="utf-8") as f:
+        html = f.read()
+    page = {"html": html}
+    monkeypatch.setattr(CourseraScraper, "_scrape_page", lambda self, url: self.parse_html(page["html"]))
+    return page
+
+
+def _entry(cache, query):
+    fetched_at, urls = cache._entry(query.lower())
+    return fetched_at, json.loads(urls)
+
+
+def test_all_known_rescrape_refreshes_the_entry(tmp_path, served):
+    cache = CourseQueryCache(str(tmp_path / "cache.sqlite"), ttl_hours=0)
+    seen = set()
+    orchestrator = ScrapeOrchestrator(pool=object(), seen_courses=seen, course_cache=cache)
+
+    first = orchestrator._scrape_coursera("Data Scientist")
+    assert len(first) == 2
+    fetched_at, urls = _entry(cache, "Data Scientist")
+
+    # Every course is stored by now: the crawl returns nothing new
+    assert orchestrator._scrape_coursera("Data Scientist") == []
+    refreshed_at, refreshed_urls = _entry(cache, "Data Scientist")
+    assert refreshed_at > fetched_at
+    # The full result, not the (empty) seen-filtered one
+    assert refreshed_urls == urls and len(urls) == 2
+    cache.close()
+
+
+def test_without_seen_set_only_courses_new_since_last_scrape_are_returned(tmp_path, served):
+    cache = CourseQueryCache(str(tmp_path / "cache.sqlite"), ttl_hours=0)
+    orchestrator = ScrapeOrchestrator(pool=object(), course_cache=cache)
+
+    assert len(orchestrator._scrape_coursera("Data Scientist")) == 2
+    assert orchestrator._scrape_coursera("Data Scientist") == []
+    cache.close()
+
+
+def test_failed_scrape_keeps_the_old_entry_stale(tmp_path, served):
+    cache = CourseQueryCache(str(tmp_path / "cache.sqlite"), ttl_hours=1)
+    orchestrator = ScrapeOrchestrator(pool=object(), course_cache=cache)
+    orchestrator._scrape_coursera("Data Scientist")
+    fetched_at, urls = _entry(cache, "Data Scientist")
+
+    served["html"] = None
+    cache.ttl_seconds = 0
+    assert orchestrator._scrape_coursera("Data Scientist") == []
+    assert _entry(cache, "Data Scientist") == (fetched_at, urls)
+    # Still stale, so the next run tries again
+    assert not cache.is_fresh("Data Scientist")
+
+    # A query whose first scrape fails gets no entry at all
+    orchestrator._scrape_coursera("Welder")
+    assert cache._entry("welder") is None
+    cache.close()
@@ -0,0 +1,69 @@
+"""A stale cached chromedriver path is dropped and resolved again"""
+import json
+
+import pytest
+
+from scraper import driver_pool
+
+
+@pytest.fixture
+def cache(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "scraper").mkdir()
+    monkeypatch.delenv("CHROMEDRIVER_PATH", raising=False)
+    stale, fresh = tmp_path / "chromedriver-old", tmp_path / "chromedriver-new"
+    stale.touch()
+    fresh.touch()
+    with open(driver_pool.DRIVER_CACHE_FILE, "w") as f:
+        json.dump({"path": str(stale)}, f)
+
+    class Manager:
+        installs = 0
+
+        def install(self):
+            Manager.installs += 1
+            return str(fresh)
+
+    import webdriver_manager.chrome
+    monkeypatch.setattr(webdriver_manager.chrome, "ChromeDriverManager", Manager)
+    return stale, fresh, Manager
+
+
+class Driver:
+    def quit(self):
+        pass
+
+
+def _pool(monkeypatch, works_with):
+    started = []
+
+    def chrome(service, options):
+        if service.path not in works_with:
+            raise RuntimeError("session not created: This version of ChromeDriver only supports Chrome 120")
+        started.append(service.path)
+        return Driver()
+
+    monkeypatch.setattr(driver_pool.webdriver, "Chrome", chrome)
+    return driver_pool.DriverPool(), started
+
+
+def test_stale_cached_driver_is_resolved_again(cache, monkeypatch):
+    stale, fresh, manager = cache
+    pool, started = _pool(monkeypatch, works_with={str(fresh)})
+
+    pool._start_driver()
+
+    assert started == [str(fresh)]
+    assert manager.installs == 1
+    with open(driver_pool.DRIVER_CACHE_FILE) as f:
+        assert json.load(f)["path"] == str(fresh)
+
+
+def test_failure_with_a_fresh_driver_is_raised(cache, monkeypatch):
+    stale, fresh, manager = cache
+    pool, _ = _pool(monkeypatch, works_with=set())
+
+    with pytest.raises(RuntimeError):
+        pool._start_driver()
+    # One retry only
+    assert manager.installs == 1
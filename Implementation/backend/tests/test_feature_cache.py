@@ -0,0 +1,49 @@
+"""ProfileVectorizer matches tfidf.transform(profile_text(...)) exactly"""
+import pytest
+from sklearn.feature_extraction.text import TfidfVectorizer
+
+from benchmarks.feature_cache import boundary_profiles, check_parity
+
+DESCRIPTIONS = [
+    "We need a data scientist with machine learning, Python and SQL; experience with the cloud is a plus.",
+    "Senior software engineer (C++/Java) to build and maintain back-end services for our clients.",
+    "Registered nurse for the emergency department: patient care, charting and medication administration.",
+    "Data analyst - Excel, Tableau & Power BI dashboards for the sales and marketing teams.",
+    "Machine learning engineer deploying deep-learning models on AWS and Kubernetes.",
+    "Customer service representative answering calls, e-mails and chats in English and French.",
+]
+
+PROFILES = [
+    # Stop words inside and around the terms
+    ("Bachelor of Science", ["the cloud", "and"], ["machine learning", "a", "of the"]),
+    ("Master", ["data and the"], ["the", "sql"]),
+    # Punctuation and odd casing
+    ("Bachelor's (B.Sc.)", ["C++/Java", "back-end!"], ["Power BI,", "Tableau & Excel", "E-MAILS"]),
+    ("PhD.", ["deep-learning"], ["AWS;", "Kubernetes...", "node.js"]),
+    # Empty fields and empty terms
+    ("", [], []),
+    ("", ["machine"], []),
+    ("Diploma", [""], ["", "python", ""]),
+    ("High School", [], ["   "]),
+    # N-grams that only exist across field boundaries
+    ("machine", ["learning engineer"], ["deploying deep"]),
+    ("data", [], ["scientist with machine", "learning"]),
+]
+
+
+@pytest.fixture(scope="module")
+def tfidf():
+    # As trained in job_model, on a tiny corpus
+    return TfidfVectorizer(max_features=10000, ngram_range=(1, 200), stop_words="english").fit(DESCRIPTIONS)
+
+
+def test_parity_on_awkward_profiles(tfidf):
+    result = check_parity(tfidf, PROFILES)
+    assert result["failures"] == 0
+    assert result["nonzeros"] > 0
+
+
+def test_parity_on_profiles_cut_inside_ngrams(tfidf):
+    result = check_parity(tfidf, boundary_profiles(tfidf, 200))
+    assert result["failures"] == 0
+    assert result["nonzeros"] > 0
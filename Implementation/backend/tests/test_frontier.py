@@ -0,0 +1,20 @@
+"""Titles chosen for a run that dies are not chosen again next hour"""
+import sqlite3
+
+from scraper.frontier import CrawlFrontier
+
+
+def test_attempted_titles_drop_to_the_back():
+    connection = sqlite3.connect(":memory:")
+    connection.execute("CREATE TABLE jobs (id INTEGER PRIMARY KEY, canonical_title TEXT)")
+    frontier = CrawlFrontier(connection)
+    frontier.sync(["Cook", "Nurse", "Truck Driver", "Cashier"])
+
+    first = frontier.next_titles(2)
+    frontier.mark_attempted(first)
+    # No record(): the run crashed
+    second = frontier.next_titles(2)
+
+    assert not set(first) & set(second)
+    runs = dict(connection.execute("SELECT title, runs FROM crawl_frontier").fetchall())
+    assert runs[first[0]] == 0
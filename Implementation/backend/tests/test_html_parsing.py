@@ -0,0 +1,156 @@
+"""parse_html on saved Indeed and Coursera pages, and block-page detection and back-off"""
+import os
+
+import pytest
+
+from scraper.coursera_scraper import CourseraScraper
+from scraper import html_backend
+from scraper.html_backend import is_block_page, parse_document
+from scraper.indeed_scraper import IndeedScraper
+
+FIXTURES = os.path.join(os.path.dirname(__file__), "fixtures")
+
+
+def _page(name):
+    with open(os.path.join(FIXTURES, name), encoding="utf-8") as f:
+        return f.read()
+
+
+def _parsed(scraper, name):
+    records = scraper.parse_html(_page(name))
+    for record in records:
+        assert record.pop("scraped_date")
+    return records
+
+
+@pytest.fixture
+def indeed():
+    # No browser is started until a Selenium page is scraped
+    return IndeedScraper(pool=object())
+
+
+@pytest.fixture
+def coursera():
+    return CourseraScraper(pool=object())
+
+
+def test_indeed_results_page(indeed):
+    assert _parsed(indeed, "indeed_results.html") == [
+        {
+            "title": "Senior Data Scientist",
+            "company": "Northwind Analytics",
+            "location": "Toronto, ON",
+            "salary": "$95,000–$120,000 a year",
+            "job_type": "Full-time",
+            # Relative tracking link reduced to the job key
+            "link": "https://ca.indeed.com/viewjob?jk=9f2c4e1a7b3d5e60",
+            # The snippet list, not the salary-snippet-container
+            "description": "Build and validate machine learning models for demand forecasting across our "
+                           "retail clients. Work with python, sql and cloud data platforms.",
+        },
+        {
+            # "New" badge dropped
+            "title": "Data Analyst",
+            "company": "Maple Retail Group",
+            "location": "Remote in Vancouver, BC",
+            "salary": "Salary not specified",
+            "job_type": "Contract",
+            # Absolute sponsored link reduced to the job key
+            "link": "https://ca.indeed.com/viewjob?jk=41d7aa90c2e38b15",
+            # No snippet: the longest card line that isn't title, company, location or a button
+            "description": "Turn point of sale data into weekly dashboards for store operations.",
+        },
+        {
+            "title": "Clinical Data Coordinator",
+            "company": "Lakeshore Health",
+            "location": "Hamilton, ON",
+            "salary": "Salary not specified",
+            "job_type": "Not specified",
+            # No jk parameter: kept as written, made absolute
+            "link": "https://ca.indeed.com/company/Lakeshore-Health/jobs/"
+                    "Clinical-Data-Coordinator-0b88c1f2d4a6e913?fccid=77aa&vjs=3",
+            "description": "Description snippet not available",
+        },
+    ]
+
+
+def test_indeed_links_follow_base_url():
+    scraper = IndeedScraper(pool=object(), base_url="http://127.0.0.1:8765/")
+    links = [job["link"] for job in scraper.parse_html(_page("indeed_results.html"))]
+    assert links[0] == "http://127.0.0.1:8765/viewjob?jk=9f2c4e1a7b3d5e60"
+    assert links[2].startswith("http://127.0.0.1:8765/company/Lakeshore-Health/")
+
+
+def test_coursera_search_page(coursera):
+    # The card still loading (no title) is skipped
+    assert _parsed(coursera, "coursera_search.html") == [
+        {
+            "course_title": "Google Data Analytics",
+            "organization": "Google",
+            "skills": "Data Analysis, Spreadsheet, SQL, Tableau Software, R Programming",
+            "rating": 4.8,
+            "course_students_enrolled": "2.9M",
+            # Relative link made absolute
+            "url": "https://www.coursera.org/professional-certificates/google-data-analytics",
+        },
+        {
+            "course_title": "Machine Learning with Python",
+            "organization": "IBM",
+            "skills": None,
+            "rating": None,
+            "course_students_enrolled": None,
+            "url": "https://www.coursera.org/learn/machine-learning-with-python?specialization=ibm-data-science",
+        },
+    ]
+
+
+def test_empty_or_failed_fetch_parses_to_nothing(indeed, coursera):
+    assert indeed.parse_html(None) == []
+    assert coursera.parse_html("") == []
+
+
+def test_block_pages():
+    assert is_block_page(parse_document(_page("indeed_block.html")))
+    assert is_block_page(parse_document(
+        '<html><head><title>Jobs</title></head><body><div id="px-captcha"></div></body></html>'))
+    assert not is_block_page(parse_document(_page("indeed_results.html")))
+    assert not is_block_page(parse_document(_page("coursera_search.html")))
+    assert not is_block_page(parse_document(None))
+    # A blocked fetch has no cards
+    assert IndeedScraper(pool=object()).parse_html(_page("indeed_block.html")) == []
+
+
+
+class NoBrowserPool:
+    def driver(self):
+        raise AssertionError("Selenium must not be used here")
+
+
+def _serve(monkeypatch, scraper_class, name):
+    """Fetches return the saved page; returns a list that grows by one per lxml parse"""
+    monkeypatch.setattr(scraper_class.__module__ + ".fetch_html", lambda url: (_page(name), 0.2))
+    parses = []
+    fromstring = html_backend.lxml.html.fromstring
+    monkeypatch.setattr(html_backend.lxml.html, "fromstring", lambda html: parses.append(1) or fromstring(html))
+    return parses
+
+
+@pytest.mark.parametrize("scraper_class, name", [(IndeedScraper, "indeed_results.html"),
+                                                 (CourseraScraper, "coursera_search.html")])
+def test_served_page_is_parsed_once(scraper_class, name, monkeypatch):
+    parses = _serve(monkeypatch, scraper_class, name)
+    scraper = scraper_class(pool=NoBrowserPool(), backend="html")
+
+    assert scraper._scrape_page("https://example.com/search")
+    assert len(parses) == 1
+
+
+@pytest.mark.parametrize("scraper_class", [IndeedScraper, CourseraScraper])
+def test_block_page_backs_off_without_selenium(scraper_class, monkeypatch):
+    _serve(monkeypatch, scraper_class, "indeed_block.html")
+    scraper = scraper_class(pool=NoBrowserPool(), backend="html")
+    delay = scraper.pacer.current_delay()
+
+    assert scraper._scrape_page("https://example.com/search") == []
+    assert scraper.pacer.stats["blocks"] == 1
+    assert scraper.pacer.current_delay() > delay
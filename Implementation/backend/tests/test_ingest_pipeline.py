@@ -0,0 +1,30 @@
+"""The ingest pipeline survives a writer that can't open the database"""
+import pytest
+
+from scraper.pipeline import IngestPipeline
+
+
+def _job(i):
+    return {"title": "Cook", "description": "cook food", "link": f"https://ca.indeed.com/viewjob?jk={i}"}
+
+
+def test_writes_batches(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "database").mkdir()
+    saved = []
+    with IngestPipeline(batch_size=2, on_saved=lambda *args: saved.append(args)) as pipeline:
+        pipeline.put_many("jobs", "Cook", [_job(i) for i in range(3)] + [_job(0)])
+    assert pipeline.counters["written"] == 3
+    assert pipeline.counters["duplicates"] == 1
+    assert sum(added for _, _, added in saved) == 3
+
+
+def test_failed_connect_fails_put_and_close_returns(tmp_path, monkeypatch):
+    # No database/ directory: sqlite3.connect fails
+    monkeypatch.chdir(tmp_path)
+    pipeline = IngestPipeline(queue_size=2).start()
+    with pytest.raises(RuntimeError):
+        for i in range(1000):
+            pipeline.put("jobs", "Cook", _job(i))
+    pipeline.close()
+    assert pipeline.stats()["writer_error"]
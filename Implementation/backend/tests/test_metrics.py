@@ -0,0 +1,53 @@
+"""JobRunCollector folds each finished run once and only reads new rows"""
+import json
+
+import metrics
+from scheduler import RunHistory
+
+
+def _scrape(history, jobs, inserted):
+    run_id = history.start("hourly_scraper", 0)
+    history.finish(run_id, "succeeded", json.dumps({
+        "jobs": jobs, "courses": 0, "inserted": {"jobs": inserted}, "elapsed_seconds": 10,
+    }))
+    return run_id
+
+
+def test_runs_are_counted_once_across_renders(tmp_path):
+    db_path = str(tmp_path / "runs.sqlite")
+    history = RunHistory(db_path)
+    collector = metrics.JobRunCollector(db_path, registry=None)
+
+    _scrape(history, 40, 20)
+    collector.render()
+    _scrape(history, 60, 30)
+    text = collector.render()
+
+    assert 'pathfinder_job_runs_total{job="hourly_scraper",status="succeeded"} 2' in text
+    assert 'pathfinder_db_rows_inserted_total{table="jobs"} 50' in text
+    assert "pathfinder_db_insert_rows_per_second 3.0" in text
+
+
+def test_cursor_waits_for_a_run_in_progress(tmp_path):
+    db_path = str(tmp_path / "runs.sqlite")
+    history = RunHistory(db_path)
+    collector = metrics.JobRunCollector(db_path, registry=None)
+
+    training = history.start("monthly_training", 0)
+    done = _scrape(history, 10, 5)
+    collector.render()
+    # The finished scrape is folded but the cursor stays before the training run
+    assert collector._cursor == training - 1
+    assert collector._folded == {done}
+
+    history.finish(training, "succeeded", json.dumps({"test_accuracy": 0.8}))
+    text = collector.render()
+    assert collector._cursor == done
+    assert collector._folded == set()
+    assert 'pathfinder_job_runs_total{job="hourly_scraper",status="succeeded"} 1' in text
+    assert "pathfinder_training_test_accuracy 0.8" in text
+
+
+def test_missing_table_renders_empty(tmp_path):
+    collector = metrics.JobRunCollector(str(tmp_path / "empty.sqlite"), registry=None)
+    assert "pathfinder_job_runs_total" in collector.render()
@@ -0,0 +1,91 @@
+"""ScrapeOrchestrator with the html backend against a local server replaying the fixtures"""
+import os
+import threading
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+
+from scraper.coursera_scraper import CourseraScraper
+from scraper.indeed_scraper import IndeedScraper
+from scraper.orchestrator import ScrapeOrchestrator
+from scraper.pacing import Pacer
+from scraper.rate_limit import DomainRateLimiter
+
+FIXTURES = os.path.join(os.path.dirname(__file__), "fixtures")
+# Only this title has pages; every other query gets a 404
+SERVED_TITLE = "Data Scientist"
+
+
+def _page(name):
+    with open(os.path.join(FIXTURES, name), encoding="utf-8") as f:
+        return f.read()
+
+
+class FixtureHandler(BaseHTTPRequestHandler):
+    pages = {
+        ("/jobs", "q"): _page("indeed_results.html"),
+        ("/search", "query"): _page("coursera_search.html"),
+    }
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        query = parse_qs(url.query)
+        body = None
+        for (path, param), page in self.pages.items():
+            if url.path == path and query.get(param) == [SERVED_TITLE]:
+                body = page.encode("utf-8")
+        if body is None:
+            self.send_error(404)
+            return
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), FixtureHandler)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{httpd.server_address[1]}"
+    httpd.shutdown()
+    httpd.server_close()
+
+
+class NoBrowserPool:
+    """Pages without cards fall back to Selenium, which has no browser here"""
+
+    @contextmanager
+    def driver(self):
+        raise RuntimeError("no browser in tests")
+        yield
+
+
+def test_html_run_counts_records_and_failures(server):
+    orchestrator = ScrapeOrchestrator(NoBrowserPool(), rate_limiter=DomainRateLimiter(default=(100, 100)),
+                                      indeed_base_url=server, coursera_base_url=server)
+    orchestrator.pacers = {"indeed": Pacer(min_delay=0), "coursera": Pacer(min_delay=0)}
+    results = []
+
+    report = orchestrator.run([SERVED_TITLE, "Astronaut"],
+                              on_result=lambda source, title, records: results.append((source, title, len(records))))
+
+    jobs = len(IndeedScraper(pool=object()).parse_html(_page("indeed_results.html")))
+    courses = len(CourseraScraper(pool=object()).parse_html(_page("coursera_search.html")))
+    assert jobs and courses
+    assert report["jobs"] == jobs
+    assert report["courses"] == courses
+    assert sorted(results) == [("coursera", SERVED_TITLE, courses), ("indeed", SERVED_TITLE, jobs)]
+
+    assert report["titles"] == 2 and report["completed_titles"] == 1
+    assert sorted((f["source"], f["title"]) for f in report["failures"]) == [
+        ("coursera", "Astronaut"), ("indeed", "Astronaut")]
+    assert all("no browser" in f["error"] for f in report["failures"])
+    assert report["pacing"]["indeed"]["pages"] >= 2
@@ -0,0 +1,27 @@
+"""The skill x course matrix wraps the snapshot's mapped arrays"""
+import numpy as np
+import pandas as pd
+
+from ml_models.recommend_snapshot import RecommendationSnapshot, compile_snapshot, write_snapshot
+
+
+def test_skill_course_matrix_is_the_mapped_transpose(tmp_path):
+    jobs = pd.DataFrame({"canonical_title": ["Data Analyst"], "description": ["sql and excel"]})
+    courses = pd.DataFrame({
+        "course_title": ["A", "B", "C"], "organization": ["x", None, "y"],
+        "skills": ["sql, python", "excel", "python, excel, sql"],
+        "url": ["u1", "u2", "u3"], "rating": [4.5, None, 4.0],
+    })
+    path = str(tmp_path / "recommendations.snapshot")
+    write_snapshot(compile_snapshot(jobs, courses), path)
+    snapshot = RecommendationSnapshot(path)
+
+    matrix = snapshot.skill_course_matrix()
+    for array in (matrix.data, matrix.indices, matrix.indptr):
+        assert np.shares_memory(array, snapshot._map)
+
+    course_skills = np.zeros((snapshot.course_count, snapshot.skill_count), dtype=np.int32)
+    for course in range(snapshot.course_count):
+        start, end = snapshot.course_skill_indptr[course], snapshot.course_skill_indptr[course + 1]
+        course_skills[course, snapshot.course_skill_ids[start:end]] = 1
+    assert (matrix.toarray() == course_skills.T).all()
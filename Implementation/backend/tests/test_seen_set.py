@@ -0,0 +1,116 @@
+"""Bloom filter, database-backed SeenSet and the incremental crawl cutoff"""
+import pytest
+
+from database.database import PathfinderDatabase
+from database.seen_set import BloomFilter, SeenSet
+from scraper.coursera_scraper import CourseraScraper
+from scraper.indeed_scraper import IndeedScraper
+
+
+def test_bloom_filter_has_no_false_negatives_and_few_false_positives():
+    bloom = BloomFilter(capacity=2000, error_rate=0.01)
+    added = [f"https://ca.indeed.com/viewjob?jk={i:016x}" for i in range(2000)]
+    for value in added:
+        bloom.add(value)
+
+    assert all(value in bloom for value in added)
+    false_positives = sum(f"https://www.coursera.org/learn/course-{i}" in bloom for i in range(20000))
+    assert false_positives / 20000 < 0.02
+
+
+@pytest.fixture
+def db(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "database").mkdir()
+    db = PathfinderDatabase()
+    db.connect()
+    yield db
+    db.connection.close()
+
+
+def _jobs(keys):
+    return [{"title": "Data Analyst", "description": "sql", "link": f"https://ca.indeed.com/viewjob?jk={key}"}
+            for key in keys]
+
+
+def test_seen_set_loads_stored_values_and_tracks_this_run(db):
+    db.save_jobs(_jobs(["a", "b"]))
+    seen = db.seen_set("jobs", "link")
+    try:
+        assert "https://ca.indeed.com/viewjob?jk=a" in seen
+        assert "https://ca.indeed.com/viewjob?jk=c" not in seen
+        assert "" not in seen and None not in seen
+
+        # Added during the run, before the pipeline stores it
+        seen.add("https://ca.indeed.com/viewjob?jk=c")
+        assert "https://ca.indeed.com/viewjob?jk=c" in seen
+    finally:
+        seen.close()
+
+    # A new run only knows what was stored
+    seen = db.seen_set("jobs", "link")
+    try:
+        assert "https://ca.indeed.com/viewjob?jk=b" in seen
+        assert "https://ca.indeed.com/viewjob?jk=c" not in seen
+    finally:
+        seen.close()
+
+
+class AlwaysPositive:
+    def __contains__(self, value):
+        return True
+
+
+def test_bloom_positives_are_confirmed_against_the_database(db):
+    db.save_jobs(_jobs(["a"]))
+    seen = SeenSet(db.db_path, "jobs", "link")
+    try:
+        # Every lookup passes the filter; only the database can say no
+        seen._bloom = AlwaysPositive()
+        assert "https://ca.indeed.com/viewjob?jk=a" in seen
+        assert "https://ca.indeed.com/viewjob?jk=z" not in seen
+    finally:
+        seen.close()
+
+
+def _pages(scraper, pages):
+    """_scrape_page serving the given pages in order; returns the URLs asked for"""
+    requested = []
+
+    def scrape_page(url):
+        requested.append(url)
+        return pages[len(requested) - 1] if len(requested) <= len(pages) else []
+
+    scraper._scrape_page = scrape_page
+    return requested
+
+
+def test_crawl_stops_at_a_mostly_seen_page():
+    links = [f"https://ca.indeed.com/viewjob?jk={i}" for i in range(15)]
+    pages = [[{"link": link} for link in links[i:i + 5]] for i in range(0, 15, 5)]
+    # Page 2 is 4/5 known, so page 3 is never requested
+    seen = set(links[5:9])
+    scraper = IndeedScraper(pool=object())
+    requested = _pages(scraper, pages)
+
+    jobs = scraper.scrape_jobs("Data Analyst", max_pages=3, seen=seen)
+
+    assert len(requested) == 2
+    assert [job["link"] for job in jobs] == links[:5] + links[9:10]
+    assert set(links[:10]) <= seen
+
+
+def test_crawl_continues_below_the_stop_ratio():
+    urls = [f"https://www.coursera.org/learn/c{i}" for i in range(15)]
+    pages = [[{"url": url} for url in urls[i:i + 5]] for i in range(0, 15, 5)]
+    # 3/5 known on every page: below the cutoff, so all pages are read
+    seen = {url for i, url in enumerate(urls) if i % 5 < 3}
+    scraper = CourseraScraper(pool=object())
+    requested = _pages(scraper, pages)
+
+    courses = scraper.scrape_courses("Data Analyst", max_pages=3, seen=seen, stop_ratio=0.8)
+
+    assert len(requested) == 3
+    assert [course["url"] for course in courses] == [url for i, url in enumerate(urls) if i % 5 >= 3]
+    # Everything listed is kept for the course cache, seen or not
+    assert len(scraper.listed_courses) == 15
@@ -0,0 +1,90 @@
+"""Hourly posting updates go to a delta file that queries search and training folds in"""
+import os
+import random
+import sqlite3
+
+import pytest
+from sklearn.feature_extraction.text import TfidfVectorizer
+
+from ml_models import similar_index
+
+WORDS = [f"word{i}" for i in range(300)]
+
+
+def _text(rng):
+    return " ".join(rng.sample(WORDS, 12))
+
+
+@pytest.fixture
+def setup(tmp_path, monkeypatch):
+    index_path, delta_path = str(tmp_path / "posting_index.pkl"), str(tmp_path / "posting_index.delta.pkl")
+    monkeypatch.setattr(similar_index, "POSTING_INDEX_PATH", index_path)
+    monkeypatch.setattr(similar_index, "POSTING_DELTA_PATH", delta_path)
+
+    rng = random.Random(0)
+    connection = sqlite3.connect(":memory:")
+    connection.execute("CREATE TABLE jobs (id INTEGER PRIMARY KEY, job_title TEXT, description TEXT)")
+    texts = [_text(rng) for _ in range(60)]
+    connection.executemany("INSERT INTO jobs (id, job_title, description) VALUES (?, 'Analyst', ?)",
+                           enumerate(texts, start=1))
+    tfidf = TfidfVectorizer().fit(texts)
+
+    def build():
+        rows = connection.execute("SELECT id, description FROM jobs ORDER BY id").fetchall()
+        return similar_index.build_posting_index(tfidf, [row[0] for row in rows],
+                                                 tfidf.transform([row[1] for row in rows]))
+
+    def scrape(count):
+        start = connection.execute("SELECT MAX(id) FROM jobs").fetchone()[0] + 1
+        new = [(start + i, _text(rng)) for i in range(count)]
+        connection.executemany("INSERT INTO jobs (id, job_title, description) VALUES (?, 'Analyst', ?)", new)
+        return new
+
+    return connection, build, scrape, index_path, delta_path
+
+
+def test_updates_write_only_the_delta(setup):
+    connection, build, scrape, index_path, delta_path = setup
+    build()
+    index_version = os.stat(index_path).st_mtime_ns
+    store = similar_index.PostingIndexStore(index_path, delta_path, check_interval=0)
+
+    first = scrape(5)
+    assert similar_index.update_posting_index(connection, index_path, delta_path) == 5
+    second = scrape(3)
+    assert similar_index.update_posting_index(connection, index_path, delta_path) == 3
+    assert similar_index.update_posting_index(connection, index_path, delta_path) == 0
+
+    assert os.stat(index_path).st_mtime_ns == index_version
+    index = store.get()
+    assert len(index) == 60 and len(index.delta) == 8
+    for job_id, text in first + second:
+        assert index.query(text, k=3)[0][0] == job_id
+
+
+def test_training_folds_the_delta_in(setup):
+    connection, build, scrape, index_path, delta_path = setup
+    build()
+    store = similar_index.PostingIndexStore(index_path, delta_path, check_interval=0)
+    new = scrape(4)
+    similar_index.update_posting_index(connection, index_path, delta_path)
+    assert len(store.get().delta) == 4
+
+    build()
+    assert not os.path.exists(delta_path)
+    index = store.get()
+    assert len(index) == 64 and index.delta is None
+    for job_id, text in new:
+        assert index.query(text, k=3)[0][0] == job_id
+
+
+def test_delta_from_an_older_index_is_ignored(setup):
+    connection, build, scrape, index_path, delta_path = setup
+    old = build()
+    scrape(2)
+    similar_index.update_posting_index(connection, index_path, delta_path)
+    stale = similar_index.load_delta(old, delta_path)
+
+    new = build()
+    similar_index.dump_atomic(stale, delta_path)
+    assert similar_index.load_delta(new, delta_path) is None
@@ -0,0 +1,102 @@
+"""Job-title canonicalization and the OTHER_TITLE bucket"""
+import pytest
+
+from database.database import PathfinderDatabase
+from ml_models.recommend_snapshot import RecommendationSnapshot, publish_snapshot
+from database.title_canonicalizer import OTHER_TITLE, TitleCanonicalizer, backfill_canonical_titles
+
+
+@pytest.fixture(scope="module")
+def canonicalizer():
+    return TitleCanonicalizer()
+
+
+@pytest.mark.parametrize("raw, expected", [
+    # Seniority, level and location qualifiers
+    ("Senior Software Engineer II – Remote", "Software Engineer"),
+    ("Sr. Data Scientist, ML Platform", "Data Scientist"),
+    ("Store Manager - Brampton", "Store Manager"),
+    ("Line Cook - Part Time", "Cook"),
+    # A dash with space on one side only still separates
+    ("Senior Java Software Engineer- Canada", "Software Engineer"),
+    # Qualifier after the job word
+    ("Truck Driver AZ", "Truck Driver"),
+    ("Forklift Operator (Night Shift)", "Forklift Operator"),
+    # Bare job words
+    ("Nurse", "Registered Nurse"),
+    ("Infirmière", "Registered Nurse"),
+    # French word order
+    ("Développeur Full Stack", "Full Stack Developer"),
+    ("Développeur back end", "Backend Developer"),
+    ("Full Stack Developer / Développeur Full Stack", "Full Stack Developer"),
+    # Spellings and synonyms
+    ("Full-Stack Developer", "Full Stack Developer"),
+    ("Back-End Developer (Node.js)", "Backend Developer"),
+    ("RN - Emergency Department", "Registered Nurse"),
+    ("UX/UI Designer", "UI UX Designer"),
+    # Languages stand for software, related IT roles merge
+    ("Sr. Java Developer - Remote", "Software Engineer"),
+    ("SQL Server Developer", "Software Engineer"),
+    ("Java Full Stack Developer", "Full Stack Developer"),
+    ("Network Engineer", "Network Administrator"),
+    ("Software Architect", "Software Engineer"),
+])
+def test_maps_onto_taxonomy(canonicalizer, raw, expected):
+    assert canonicalizer.canonical(raw) == expected
+
+
+@pytest.mark.parametrize("raw", [
+    # The job word alone isn't the job
+    "Mechanical Engineer", "Sales Manager", "Analyst - AI Trainer",
+    # Department names
+    "Marketing & Communications", "Partnerships", "Finance",
+    "", None,
+])
+def test_unmatched_titles_go_to_other(canonicalizer, raw):
+    assert canonicalizer.canonical(raw) == OTHER_TITLE
+
+
+@pytest.fixture
+def db(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "database").mkdir()
+    (tmp_path / "ml_models").mkdir()
+    db = PathfinderDatabase()
+    db.connect()
+    yield db
+    db.connection.close()
+
+
+def _jobs(titles):
+    return [{"title": title, "description": f"{title} work with python and sql",
+             "link": f"https://ca.indeed.com/viewjob?jk={i}"} for i, title in enumerate(titles)]
+
+
+def test_saved_jobs_are_canonicalized_and_other_is_not_trained_or_recommended(db):
+    db.save_jobs(_jobs(["Senior Software Engineer", "Développeur Java", "Nurse",
+                        "Marketing & Communications", "Partnerships"]))
+    db.save_courses([{"course_title": "SQL Basics", "skills": "sql, python", "url": "https://c/1", "rating": 4.5}])
+
+    stored = dict(db.connection.execute("SELECT job_title, canonical_title FROM jobs").fetchall())
+    assert stored["Développeur Java"] == "Software Engineer"
+    assert stored["Partnerships"] == OTHER_TITLE
+
+    sample = db.fetch_training_sample(per_class=10)
+    assert set(sample["canonical_title"]) == {"Software Engineer", "Registered Nurse"}
+
+    publish_snapshot(db.connection, "./ml_models/recommendations.snapshot")
+    snapshot = RecommendationSnapshot("./ml_models/recommendations.snapshot")
+    assert snapshot.category_index("Software Engineer") is not None
+    assert snapshot.category_index(OTHER_TITLE) is None
+
+
+def test_recompute_rewrites_only_changed_rows(db):
+    db.save_jobs(_jobs(["Nurse", "Cook", "Cook"]))
+    # As stored by an older matcher
+    db.connection.execute("UPDATE jobs SET canonical_title = ? WHERE job_title = 'Nurse'", (OTHER_TITLE,))
+    db.connection.commit()
+
+    assert backfill_canonical_titles(db.connection, recompute=True) == 1
+    assert db.connection.execute(
+        "SELECT canonical_title FROM jobs WHERE job_title = 'Nurse'").fetchone()[0] == "Registered Nurse"
+    assert backfill_canonical_titles(db.connection, recompute=True) == 0
@@ -0,0 +1,87 @@
+"""TopKScorer against sklearn's predict_proba (the path it replaced)"""
+import numpy as np
+import scipy.sparse as sp
+from sklearn.linear_model import LogisticRegression
+from sklearn.multiclass import OneVsRestClassifier
+from sklearn.preprocessing import LabelEncoder
+
+from ml_models.topk_kernel import TopKScorer
+
+K = 5
+
+
+def _data(n_classes, rows=300, features=80, seed=0):
+    rng = np.random.RandomState(seed)
+    X = sp.random(rows, features, density=0.08, random_state=seed, format="csr", dtype=np.float64)
+    # Labels that depend on the features, so the weights aren't all near zero
+    y = np.asarray(X @ rng.standard_normal((features, n_classes))).argmax(axis=1)
+    return X, y
+
+
+def _reference(probs, labels, k):
+    top = np.argsort(-probs, axis=1, kind="stable")[:, :k]
+    return labels[top], np.take_along_axis(probs, top, axis=1)
+
+
+def _assert_parity(scorer, probs, labels, X):
+    k = min(K, probs.shape[1])
+    column = {label: i for i, label in enumerate(labels)}
+    # Single rows take the gather path, batches the sparse product
+    for start, stop in ((0, 1), (1, 2), (0, 64)):
+        top_labels, top_probs = scorer.top_k(scorer.logits(X[start:stop]), k)
+        expected_labels, expected_probs = _reference(probs[start:stop], labels, k)
+        np.testing.assert_allclose(top_probs, expected_probs, rtol=1e-4, atol=1e-6)
+        for row in range(stop - start):
+            # Returned probabilities belong to the returned labels
+            np.testing.assert_allclose(
+                top_probs[row], [probs[start + row, column[label]] for label in top_labels[row]],
+                rtol=1e-4, atol=1e-6)
+            # Same order as argsort unless neighbours tie within float32 noise
+            if np.all(np.abs(np.diff(expected_probs[row])) > 1e-6):
+                assert list(top_labels[row]) == list(expected_labels[row])
+
+
+def test_multinomial_matches_predict_proba():
+    X, y = _data(12)
+    le = LabelEncoder().fit([f"title {i}" for i in y])
+    y_enc = le.transform([f"title {i}" for i in y])
+    model = LogisticRegression(max_iter=2000).fit(X, y_enc)
+
+    scorer = TopKScorer.from_model(model, le)
+    assert not scorer.ovr
+    _assert_parity(scorer, model.predict_proba(X), le.inverse_transform(model.classes_), X)
+
+
+def test_binary_matches_predict_proba():
+    X, y = _data(2)
+    le = LabelEncoder().fit(np.where(y == 1, "Nurse", "Cook"))
+    model = LogisticRegression(max_iter=2000).fit(X, le.transform(np.where(y == 1, "Nurse", "Cook")))
+
+    scorer = TopKScorer.from_model(model, le)
+    labels, probs = scorer.top_k(scorer.logits(X), K)
+    # k is capped at the two classes
+    assert labels.shape == (X.shape[0], 2)
+    _assert_parity(scorer, model.predict_proba(X), le.inverse_transform(model.classes_), X)
+
+
+def test_one_vs_rest_matches_predict_proba():
+    X, y = _data(8)
+    model = OneVsRestClassifier(LogisticRegression(max_iter=2000)).fit(X, y)
+    coef = np.vstack([estimator.coef_ for estimator in model.estimators_])
+    intercept = np.concatenate([estimator.intercept_ for estimator in model.estimators_])
+
+    scorer = TopKScorer(coef, intercept, model.classes_, ovr=True)
+    _assert_parity(scorer, model.predict_proba(X), model.classes_, X)
+
+
+def test_labels_follow_model_classes_when_a_label_is_missing_from_training():
+    X, y = _data(6)
+    # The encoder knows a label the training split never saw
+    le = LabelEncoder().fit([f"title {i}" for i in range(7)])
+    model = LogisticRegression(max_iter=2000).fit(X, le.transform([f"title {i}" for i in y + 1]))
+    assert len(model.classes_) < len(le.classes_)
+
+    scorer = TopKScorer.from_model(model, le)
+    labels, _ = scorer.top_k(scorer.logits(X), K)
+    assert "title 0" not in set(labels.ravel())
+    _assert_parity(scorer, model.predict_proba(X), le.inverse_transform(model.classes_), X)